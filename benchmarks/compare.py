@@ -0,0 +1,75 @@
+"""
+Compares two results files of run_benchmarks and fails on regressions.
+
+    python -m benchmarks.compare baseline.json current.json --threshold 0.1
+
+A case regresses when its best time or its traced memory peak grew by more than
+``threshold`` (a fraction) over the baseline. Exits with status 1 if any did.
+"""
+
+import argparse
+import json
+import sys
+
+METRICS = (("best_seconds", "time"), ("peak_traced_bytes", "memory"))
+
+
+def load_results(file_path: str) -> dict[tuple[str, int], dict]:
+    with open(file_path) as file_obj:
+        content = json.load(file_obj)
+    return {
+        (result["benchmark"], result["n_rows"]): result
+        for result in content["results"]
+        if "skipped" not in result
+    }
+
+
+def compare_results(
+    baseline: dict[tuple[str, int], dict],
+    current: dict[tuple[str, int], dict],
+    threshold: float,
+) -> list[str]:
+    """
+    Prints the current/baseline ratio of every shared case and returns the
+    regressions found.
+    """
+    regressions = []
+    print(f"{'benchmark':>20} {'rows':>10} {'time':>8} {'memory':>8}")
+    for key in sorted(baseline.keys() & current.keys()):
+        ratios = []
+        for metric, description in METRICS:
+            before, after = baseline[key].get(metric), current[key].get(metric)
+            if not before or after is None:
+                ratios.append("n/a")
+                continue
+            ratio = after / before
+            ratios.append(f"{ratio:.2f}x")
+            if ratio > 1 + threshold:
+                regressions.append(
+                    f"{key[0]} at {key[1]} rows: {description} {before:.4g} -> "
+                    f"{after:.4g} ({ratio:.2f}x)"
+                )
+        print(f"{key[0]:>20} {key[1]:>10} {ratios[0]:>8} {ratios[1]:>8}")
+    for key in sorted(baseline.keys() ^ current.keys()):
+        print(f"{key[0]:>20} {key[1]:>10} only in one of the results")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    arguments = parser.parse_args(argv)
+    regressions = compare_results(
+        load_results(arguments.baseline),
+        load_results(arguments.current),
+        arguments.threshold,
+    )
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
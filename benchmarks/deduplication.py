@@ -0,0 +1,108 @@
+"""
+Checks that fitting the imputer on deduplicated, count weighted training rows
+gives the values of the fit on every row.
+
+    python -m benchmarks.deduplication --nan-rate 0.05 --max-differing-cells 0
+
+The training rows (features and target, as DATA_TRANSFORMATION_DEDUPLICATE
+collapses them) are fitted once as they are and once deduplicated with their
+counts as sample weights. Both fits then impute the training features with
+``nan-rate`` of the values removed, and the cells where they differ are
+reported, as are the cells where the full-row fit differs from sklearn's
+KNNImputer. Exits with status 1 when more than ``max-differing-cells`` cells
+differ between the two fits.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from benchmarks.run_benchmarks import REPO_ROOT
+
+DATA_FILE_PATH = os.path.join(REPO_ROOT, "network_data", "phisingData.csv")
+
+
+def compare_cells(expected, actual) -> dict:
+    import numpy as np
+
+    difference = np.abs(expected - actual)
+    return {
+        "differing_cells": int((difference > 1e-9).sum()),
+        "max_difference": float(difference.max()) if difference.size else 0.0,
+    }
+
+
+def check_deduplication(data_file_path: str, nan_rate: float, seed: int) -> dict:
+    """
+    Fits the configured imputer on the full and on the deduplicated rows and
+    compares what they impute.
+    """
+    import numpy as np
+    import pandas as pd
+    from sklearn.impute import KNNImputer
+    from sklearn.pipeline import Pipeline
+
+    from networksecurity.components.data_transformation import DataTransformation
+    from networksecurity.constants.training_pipeline import (
+        DATA_TRANSFORMATION_IMPUTER_PARAMS,
+        TARGET_COLUMN,
+    )
+    from networksecurity.utils.main_utils.packed_rows import deduplicate_rows
+    from networksecurity.utils.ml_utils.imputer import TernaryKNNImputer
+
+    dataframe = pd.read_csv(data_file_path)
+    first, _, counts = deduplicate_rows(dataframe)
+    features = dataframe.drop(columns=[TARGET_COLUMN])
+    unique_features = features.iloc[first].reset_index(drop=True)
+
+    queries = features.to_numpy(dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    queries[rng.random(queries.shape) < nan_rate] = np.nan
+    queries = pd.DataFrame(queries, columns=features.columns)
+
+    def fit(imputer, rows, sample_weight=None):
+        preprocessor = Pipeline([("imputer", imputer)])
+        return DataTransformation.fit_preprocessor(preprocessor, rows, sample_weight)
+
+    full = fit(TernaryKNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS), features)
+    weighted = fit(
+        TernaryKNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS),
+        unique_features,
+        counts,
+    )
+    knn = fit(KNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS), features)
+    full_values = full.transform(queries)
+    return {
+        "training_rows": len(dataframe),
+        "deduplicated_rows": len(first),
+        "missing_cells": int(queries.isna().to_numpy().sum()),
+        "weighted_vs_full": compare_cells(full_values, weighted.transform(queries)),
+        "full_vs_knn_imputer": compare_cells(knn.transform(queries), full_values),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--data-file-path", default=DATA_FILE_PATH)
+    parser.add_argument("--nan-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-differing-cells", type=int, default=0)
+    arguments = parser.parse_args(argv)
+
+    result = check_deduplication(
+        arguments.data_file_path, arguments.nan_rate, arguments.seed
+    )
+    print(json.dumps(result, indent=2))
+    differing_cells = result["weighted_vs_full"]["differing_cells"]
+    if differing_cells > arguments.max_differing_cells:
+        print(
+            f"The deduplicated fit differs from the full-row fit in "
+            f"{differing_cells} cells"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
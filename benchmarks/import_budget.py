@@ -0,0 +1,162 @@
+"""
+Checks the import time of the package's entry modules against a budget.
+
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --scale 2 --output import_times.json
+
+Every module is imported in a fresh interpreter under ``python -X importtime``,
+``--repeat`` times, and the fastest run counts. Its import time is the
+cumulative time of the top level imports that a bare interpreter does not
+already make at startup. A module also fails when it loads one of its
+forbidden dependencies: those are imported on first use, so that the CLI,
+the scoring service and spawned workers start without them. Exits with status 1
+if any module is over its budget or loads a forbidden dependency.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+from benchmarks.run_benchmarks import REPO_ROOT
+
+## Fitting, drift statistics and MongoDB access load these when first used
+HEAVY_DEPENDENCIES = ("sklearn", "scipy", "pymongo")
+## Configuration and logging are imported by everything, including workers
+DATA_DEPENDENCIES = ("numpy", "pandas", "pyarrow")
+
+## Module: (budget in milliseconds, dependencies it must not import)
+IMPORT_BUDGETS = {
+    "networksecurity.constants.training_pipeline": (
+        20,
+        HEAVY_DEPENDENCIES + DATA_DEPENDENCIES,
+    ),
+    "networksecurity.entity.config": (30, HEAVY_DEPENDENCIES + DATA_DEPENDENCIES),
+    "networksecurity.entity.artifact": (50, HEAVY_DEPENDENCIES + DATA_DEPENDENCIES),
+    "networksecurity.logging.logger": (60, HEAVY_DEPENDENCIES + DATA_DEPENDENCIES),
+    "networksecurity.exception.exception": (
+        60,
+        HEAVY_DEPENDENCIES + DATA_DEPENDENCIES,
+    ),
+    "networksecurity.logging.metrics": (60, HEAVY_DEPENDENCIES + DATA_DEPENDENCIES),
+    "networksecurity.utils.main_utils.utils": (900, HEAVY_DEPENDENCIES),
+    "networksecurity.components.data_ingestion": (1000, HEAVY_DEPENDENCIES),
+    "networksecurity.components.data_validation": (1000, HEAVY_DEPENDENCIES),
+    "networksecurity.components.data_transformation": (1000, HEAVY_DEPENDENCIES),
+    "networksecurity.components.feature_extraction": (1000, HEAVY_DEPENDENCIES),
+    "networksecurity.pipeline.training_pipeline": (1200, HEAVY_DEPENDENCIES),
+    "networksecurity.pipeline.batch_prediction": (1000, HEAVY_DEPENDENCIES),
+    "networksecurity.pipeline.scoring_service": (1000, HEAVY_DEPENDENCIES),
+}
+
+## Prints the modules the import added to sys.modules on stdout; importtime
+## writes to stderr
+IMPORT_SCRIPT = (
+    "import json, sys; before = set(sys.modules); import {module}; "
+    "print(json.dumps(sorted(set(sys.modules) - before)))"
+)
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """
+    Returns the cumulative microseconds of every top level import in the output
+    of ``-X importtime``.
+    """
+    top_level = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        ## Nested imports are indented by two more spaces per level
+        if len(name) - len(name.lstrip()) == 1:
+            top_level[name.strip()] = int(cumulative)
+    return top_level
+
+
+def run_import(module: str | None) -> tuple[dict[str, int], list[str]]:
+    script = IMPORT_SCRIPT.format(module=module) if module else "print('[]')"
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(completed.stderr), json.loads(completed.stdout)
+
+
+def measure_module(module: str, startup_imports: set, repeat: int) -> dict:
+    """
+    Imports ``module`` ``repeat`` times and returns its fastest import time and
+    the modules it loaded.
+    """
+    timings = []
+    loaded: list[str] = []
+    for _ in range(repeat):
+        top_level, loaded = run_import(module)
+        timings.append(
+            sum(
+                cumulative
+                for name, cumulative in top_level.items()
+                if name not in startup_imports
+            )
+        )
+    return {
+        "module": module,
+        "milliseconds": min(timings) / 1000.0,
+        "loaded_packages": sorted({name.split(".")[0] for name in loaded}),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="multiplies every budget, for machines slower than the reference",
+    )
+    parser.add_argument("--modules", nargs="*", default=list(IMPORT_BUDGETS))
+    parser.add_argument("--output", default=None, help="also write the report here")
+    arguments = parser.parse_args(argv)
+
+    startup_imports = set(run_import(None)[0])
+    failures = []
+    results = []
+    print(f"{'module':>48} {'ms':>8} {'budget':>8}")
+    for module in arguments.modules:
+        budget_ms, forbidden = IMPORT_BUDGETS[module]
+        budget_ms *= arguments.scale
+        result = measure_module(module, startup_imports, arguments.repeat)
+        result["budget_milliseconds"] = budget_ms
+        result["forbidden_loaded"] = sorted(
+            set(forbidden) & set(result["loaded_packages"])
+        )
+        results.append(result)
+        print(f"{module:>48} {result['milliseconds']:8.1f} {budget_ms:8.0f}")
+        if result["milliseconds"] > budget_ms:
+            failures.append(
+                f"{module}: {result['milliseconds']:.1f} ms over the budget "
+                f"of {budget_ms:.0f} ms"
+            )
+        if result["forbidden_loaded"]:
+            failures.append(
+                f"{module}: imports {', '.join(result['forbidden_loaded'])} at "
+                f"import time"
+            )
+
+    if arguments.output:
+        with open(arguments.output, "w") as file_obj:
+            json.dump(
+                {"scale": arguments.scale, "results": results}, file_obj, indent=2
+            )
+    for failure in failures:
+        print(f"FAILED {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
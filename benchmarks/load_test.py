@@ -0,0 +1,193 @@
+"""
+Load test for the online scoring service on localhost.
+
+    python -m networksecurity.pipeline.scoring_service --artifact-dir Artifacts/<run> &
+    python -m benchmarks.load_test --concurrency 64 --requests 20000
+
+With --start-server the service is started in a subprocess with the given
+arguments (after --) and stopped at the end:
+
+    python -m benchmarks.load_test --start-server -- --preprocessor-file-path p.pkl --no-model
+
+Every connection sends its requests back to back over keep-alive, with
+--rows-per-request synthetic rows each. The client side p50/p90/p99 latency and
+the throughput are printed alongside the service's own /metrics.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.run_benchmarks import REPO_ROOT
+
+
+async def send_request(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    method: str,
+    path: str,
+    body: bytes = b"",
+) -> tuple[int, bytes]:
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    content_length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            content_length = int(value)
+    return status, await reader.readexactly(content_length)
+
+
+async def get_json(host: str, port: int, path: str) -> dict:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, body = await send_request(reader, writer, "GET", path)
+        return json.loads(body)
+    finally:
+        writer.close()
+
+
+async def wait_until_ready(host: str, port: int, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            await get_json(host, port, "/health")
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+
+async def run_connection(
+    host: str, port: int, bodies: list[bytes], counter: dict, latencies: list
+) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while counter["sent"] < counter["total"]:
+            body = bodies[counter["sent"] % len(bodies)]
+            counter["sent"] += 1
+            started_at = time.perf_counter()
+            status, _ = await send_request(reader, writer, "POST", "/predict", body)
+            latencies.append(time.perf_counter() - started_at)
+            if status != 200:
+                counter["errors"] += 1
+    finally:
+        writer.close()
+
+
+def build_request_bodies(rows_per_request: int, n_bodies: int = 512) -> list[bytes]:
+    from benchmarks.synthetic_data import PhishingDataGenerator
+
+    features = (
+        PhishingDataGenerator()
+        .generate(rows_per_request * n_bodies, nan_rate=0.01)
+        .drop(columns=["Result"])
+    )
+    ## NaN is not valid JSON, missing values are sent as null
+    rows = features.astype(object).where(features.notna(), None).to_dict("records")
+    return [
+        json.dumps({"instances": rows[index : index + rows_per_request]}).encode()
+        for index in range(0, len(rows), rows_per_request)
+    ]
+
+
+async def run_load_test(arguments: argparse.Namespace) -> dict:
+    await wait_until_ready(arguments.host, arguments.port, arguments.startup_timeout)
+    bodies = build_request_bodies(arguments.rows_per_request)
+    ## Warm up the connection handling and the model before measuring
+    warmup = {"sent": 0, "total": min(100, arguments.requests), "errors": 0}
+    await run_connection(arguments.host, arguments.port, bodies, warmup, [])
+
+    counter = {"sent": 0, "total": arguments.requests, "errors": 0}
+    latencies: list = []
+    started_at = time.perf_counter()
+    await asyncio.gather(
+        *(
+            run_connection(arguments.host, arguments.port, bodies, counter, latencies)
+            for _ in range(arguments.concurrency)
+        )
+    )
+    elapsed = time.perf_counter() - started_at
+    latencies_ms = np.asarray(latencies) * 1000.0
+    p50, p90, p99 = np.percentile(latencies_ms, [50, 90, 99]).tolist()
+    return {
+        "concurrency": arguments.concurrency,
+        "rows_per_request": arguments.rows_per_request,
+        "requests": len(latencies),
+        "errors": counter["errors"],
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed,
+        "rows_per_second": len(latencies) * arguments.rows_per_request / elapsed,
+        "latency_p50_ms": p50,
+        "latency_p90_ms": p90,
+        "latency_p99_ms": p99,
+        "latency_max_ms": float(latencies_ms.max()),
+        "service": await get_json(arguments.host, arguments.port, "/metrics"),
+    }
+
+
+def parse_arguments(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--rows-per-request", type=int, default=1)
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--start-server", action="store_true")
+    parser.add_argument("--output", default=None, help="also write the report here")
+    parser.add_argument("server_arguments", nargs=argparse.REMAINDER)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    arguments = parse_arguments(argv)
+    server = None
+    if arguments.start_server:
+        server_arguments = [
+            argument for argument in arguments.server_arguments if argument != "--"
+        ]
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "networksecurity.pipeline.scoring_service",
+                "--host",
+                arguments.host,
+                "--port",
+                str(arguments.port),
+                *server_arguments,
+            ],
+            cwd=REPO_ROOT,
+        )
+    try:
+        report = asyncio.run(run_load_test(arguments))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+    print(json.dumps(report, indent=2))
+    if arguments.output:
+        if os.path.dirname(arguments.output):
+            os.makedirs(os.path.dirname(arguments.output), exist_ok=True)
+        with open(arguments.output, "w") as file_obj:
+            json.dump(report, file_obj, indent=2)
+
+
+if __name__ == "__main__":
+    main()
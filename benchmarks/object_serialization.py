@@ -0,0 +1,197 @@
+"""
+Compares loading a fitted preprocessor saved as one plain pickle with the
+memory-mapped layout of save_object, in several worker processes at once.
+
+    python -m benchmarks.object_serialization --rows 1000000 --workers 4
+
+Every worker loads the object, transforms a small batch (which reads the whole
+KNN training matrix, and for TernaryKNNImputer its fitted derived matrices) and
+reports its load time and memory from /proc/self/smaps_rollup. The workers stay
+alive until all of them are done, so the proportional set size (PSS) sums to the
+memory they use together: with the plain pickle every worker holds a private
+copy of the training matrix, with the memory-mapped arrays they share one
+page-cache copy.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks.run_benchmarks import REPO_ROOT
+
+FORMATS = ("pickle", "mmap")
+SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Private_Clean", "Private_Dirty")
+
+
+def read_smaps_rollup() -> dict:
+    """
+    Memory of the current process in bytes, empty where smaps_rollup is missing.
+    """
+    try:
+        with open("/proc/self/smaps_rollup") as file_obj:
+            lines = file_obj.read().splitlines()
+    except OSError:
+        return {}
+    memory = {}
+    for line in lines:
+        name, _, value = line.partition(":")
+        if name in SMAPS_FIELDS:
+            memory[name.lower()] = int(value.split()[0]) * 1024
+    return memory
+
+
+def load_in_worker(file_format: str, file_path: str, batch, barrier, results) -> None:
+    sys.path.insert(0, REPO_ROOT)
+    ## Imported up front so only unpickling is timed
+    import sklearn.impute, sklearn.pipeline  # noqa: F401
+    import networksecurity.utils.ml_utils.imputer  # noqa: F401
+    from networksecurity.utils.main_utils.utils import load_object
+
+    before = read_smaps_rollup()
+    started_at = time.perf_counter()
+    if file_format == "pickle":
+        with open(file_path, "rb") as file_obj:
+            preprocessor = pickle.load(file_obj)
+    else:
+        preprocessor = load_object(file_path)
+    load_seconds = time.perf_counter() - started_at
+    after_load = read_smaps_rollup()
+    started_at = time.perf_counter()
+    preprocessor.transform(batch)
+    transform_seconds = time.perf_counter() - started_at
+    after_transform = read_smaps_rollup()
+    ## Keep every worker's mappings alive until all of them are measured
+    barrier.wait()
+    results.put(
+        {
+            "load_seconds": load_seconds,
+            "transform_seconds": transform_seconds,
+            "before": before,
+            "after_load": after_load,
+            "after_transform": after_transform,
+            "pss_all_workers_alive": read_smaps_rollup().get("pss"),
+        }
+    )
+    barrier.wait()
+
+
+def measure_format(file_format: str, file_path: str, batch, n_workers: int) -> dict:
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(n_workers)
+    results = context.Queue()
+    workers = [
+        context.Process(
+            target=load_in_worker,
+            args=(file_format, file_path, batch, barrier, results),
+        )
+        for _ in range(n_workers)
+    ]
+    for worker in workers:
+        worker.start()
+    reports = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+
+    def total(stage: str, field: str) -> int:
+        return sum(
+            report[stage].get(field, 0) - report["before"].get(field, 0)
+            for report in reports
+        )
+
+    return {
+        "format": file_format,
+        "workers": n_workers,
+        "load_seconds_max": max(report["load_seconds"] for report in reports),
+        "load_seconds_mean": sum(report["load_seconds"] for report in reports)
+        / n_workers,
+        "transform_seconds_mean": sum(report["transform_seconds"] for report in reports)
+        / n_workers,
+        "rss_after_load_bytes": total("after_load", "rss"),
+        "rss_after_transform_bytes": total("after_transform", "rss"),
+        "private_after_transform_bytes": total("after_transform", "private_dirty")
+        + total("after_transform", "private_clean"),
+        "pss_all_workers_bytes": sum(
+            report["pss_all_workers_alive"] or 0 for report in reports
+        ),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, default=4)
+    ## The pipeline's default imputer, see DATA_TRANSFORMATION_IMPUTER
+    parser.add_argument(
+        "--imputer", choices=("knn", "ternary_knn"), default="ternary_knn"
+    )
+    parser.add_argument("--output", default=None, help="also write the report here")
+    arguments = parser.parse_args(argv)
+    sys.path.insert(0, REPO_ROOT)
+    os.chdir(REPO_ROOT)
+
+    from sklearn.impute import KNNImputer
+    from sklearn.pipeline import Pipeline
+
+    from benchmarks.synthetic_data import PhishingDataGenerator
+    from networksecurity.utils.main_utils.utils import save_object
+    from networksecurity.utils.ml_utils.imputer import TernaryKNNImputer
+
+    imputer_class = {"knn": KNNImputer, "ternary_knn": TernaryKNNImputer}[
+        arguments.imputer
+    ]
+    features = PhishingDataGenerator().generate(arguments.rows).drop(columns=["Result"])
+    preprocessor = Pipeline([("imputer", imputer_class(n_neighbors=3))]).fit(features)
+    batch = (
+        PhishingDataGenerator()
+        .generate(64, nan_rate=0.05, seed=1)
+        .drop(columns=["Result"])
+    )
+
+    work_dir = tempfile.mkdtemp(prefix="bench-objects-")
+    try:
+        file_paths = {
+            "pickle": os.path.join(work_dir, "pickle", "preprocessing.pkl"),
+            "mmap": os.path.join(work_dir, "mmap", "preprocessing.pkl"),
+        }
+        save_seconds = {}
+        for file_format, file_path in file_paths.items():
+            started_at = time.perf_counter()
+            save_object(
+                file_path,
+                preprocessor,
+                array_min_bytes=None if file_format == "pickle" else 1 << 16,
+            )
+            save_seconds[file_format] = time.perf_counter() - started_at
+        del preprocessor
+
+        report = {"rows": arguments.rows, "imputer": arguments.imputer, "results": []}
+        for file_format in FORMATS:
+            ## An untimed load first, so both formats are measured with a warm page cache
+            measure_format(file_format, file_paths[file_format], batch, 1)
+            result = measure_format(
+                file_format, file_paths[file_format], batch, arguments.workers
+            )
+            result["save_seconds"] = save_seconds[file_format]
+            report["results"].append(result)
+            print(
+                f"{file_format:>7}: load {result['load_seconds_mean'] * 1000:9.1f} ms, "
+                f"RSS after load {result['rss_after_load_bytes'] / 2**20:8.1f} MiB, "
+                f"PSS of {arguments.workers} workers "
+                f"{result['pss_all_workers_bytes'] / 2**20:8.1f} MiB"
+            )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if arguments.output:
+        with open(arguments.output, "w") as file_obj:
+            json.dump(report, file_obj, indent=2)
+
+
+if __name__ == "__main__":
+    main()
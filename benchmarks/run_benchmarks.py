@@ -0,0 +1,337 @@
+"""
+Times and measures the memory of the pipeline stages and the ETL loader on
+synthetic phishing data.
+
+    python -m benchmarks.run_benchmarks --sizes 10000 100000 1000000
+    python -m benchmarks.compare benchmarks/results/<old>.json benchmarks/results/<new>.json
+
+Every (benchmark, size) case runs in a fresh process: the inputs are generated
+and prepared first, then the stage is timed ``--repeat`` times and run once
+more under tracemalloc to record its peak allocations. The results are written
+to benchmarks/results/<label>_<timestamp>.json, the label defaults to the git
+commit. MongoDB bound cases use mongomock up to MONGOMOCK_MAX_ROWS rows, pass
+--mongo-url to run them against a real server at any size.
+"""
+
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+BENCHMARKS = ("data_ingestion", "data_validation", "data_transformation", "etl")
+## Stages that talk to MongoDB; above this many rows the in-process stand-in is
+## too slow to be meaningful, use --mongo-url for larger sizes
+MONGOMOCK_MAX_ROWS = 200_000
+BENCHMARK_DATABASE_NAME = "networksecurity_benchmark"
+BENCHMARK_COLLECTION_NAME = "network_data"
+
+
+def get_pipeline_config(work_dir: str):
+    from networksecurity.entity.config import TrainingPipelineConfig
+
+    training_pipeline_config = TrainingPipelineConfig()
+    training_pipeline_config.artifact_name = work_dir
+    training_pipeline_config.artifact_dir = os.path.join(work_dir, "run")
+    return training_pipeline_config
+
+
+def split_frame(dataframe, test_ratio: float = 0.2):
+    n_test = int(len(dataframe) * test_ratio)
+    return dataframe.iloc[n_test:].reset_index(drop=True), dataframe.iloc[
+        :n_test
+    ].reset_index(drop=True)
+
+
+def prepare_data_ingestion(n_rows: int, options: dict, work_dir: str):
+    from benchmarks.mongo_standin import fill_collection, get_benchmark_mongo_client
+    from benchmarks.synthetic_data import PhishingDataGenerator
+    from networksecurity.components.data_ingestion import DataIngestion
+    from networksecurity.entity.config import DataIngestionConfig
+    from networksecurity.utils.main_utils.artifact_writer import ArtifactWriter
+
+    dataframe = PhishingDataGenerator().generate(
+        n_rows, nan_rate=options["nan_rate"], seed=options["seed"]
+    )
+    client = get_benchmark_mongo_client(options["mongo_url"])
+    fill_collection(
+        client[BENCHMARK_DATABASE_NAME][BENCHMARK_COLLECTION_NAME], dataframe
+    )
+    config = DataIngestionConfig(get_pipeline_config(work_dir))
+    config.database_name = BENCHMARK_DATABASE_NAME
+    config.collection_name = BENCHMARK_COLLECTION_NAME
+    data_ingestion = DataIngestion(
+        config, mongo_client=client, artifact_writer=ArtifactWriter()
+    )
+    return data_ingestion.initiate_data_ingestion
+
+
+def prepare_data_validation(n_rows: int, options: dict, work_dir: str):
+    from benchmarks.synthetic_data import PhishingDataGenerator
+    from networksecurity.components.data_validation import DataValidation
+    from networksecurity.entity.artifact import DataIngestionArtifact
+    from networksecurity.entity.config import DataValidationConfig
+    from networksecurity.utils.main_utils.artifact_writer import ArtifactWriter
+
+    generator = PhishingDataGenerator()
+    train_dataframe, _ = split_frame(
+        generator.generate(n_rows, nan_rate=options["nan_rate"], seed=options["seed"])
+    )
+    ## The test partition is drawn separately so drift can be injected into it
+    test_dataframe = generator.generate(
+        n_rows - len(train_dataframe),
+        nan_rate=options["nan_rate"],
+        drift=options["drift"],
+        seed=options["seed"] + 1,
+    )
+    data_ingestion_artifact = DataIngestionArtifact(
+        train_file_path=os.path.join(work_dir, "train.csv"),
+        test_file_path=os.path.join(work_dir, "test.csv"),
+        train_dataframe=train_dataframe,
+        test_dataframe=test_dataframe,
+    )
+    data_validation = DataValidation(
+        data_ingestion_artifact,
+        DataValidationConfig(get_pipeline_config(work_dir)),
+        artifact_writer=ArtifactWriter(),
+    )
+    return data_validation.initiate_data_validation
+
+
+def prepare_data_transformation(n_rows: int, options: dict, work_dir: str):
+    from benchmarks.synthetic_data import PhishingDataGenerator
+    from networksecurity.components.data_transformation import DataTransformation
+    from networksecurity.entity.artifact import DataValidationArtifact
+    from networksecurity.entity.config import DataTransformationConfig
+    from networksecurity.utils.main_utils.artifact_writer import ArtifactWriter
+
+    train_dataframe, test_dataframe = split_frame(
+        PhishingDataGenerator().generate(
+            n_rows, nan_rate=options["nan_rate"], seed=options["seed"]
+        )
+    )
+    data_validation_artifact = DataValidationArtifact(
+        validation_status=True,
+        valid_train_file_path=os.path.join(work_dir, "train.csv"),
+        valid_test_file_path=os.path.join(work_dir, "test.csv"),
+        invalid_train_file_path=None,
+        invalid_test_file_path=None,
+        drift_report_file_path=os.path.join(work_dir, "report.yaml"),
+        valid_train_dataframe=train_dataframe,
+        valid_test_dataframe=test_dataframe,
+    )
+    data_transformation = DataTransformation(
+        data_validation_artifact,
+        DataTransformationConfig(get_pipeline_config(work_dir)),
+        artifact_writer=ArtifactWriter(),
+    )
+    return data_transformation.initiate_data_transformation
+
+
+def prepare_etl(n_rows: int, options: dict, work_dir: str):
+    from benchmarks.mongo_standin import get_benchmark_mongo_client
+    from benchmarks.synthetic_data import PhishingDataGenerator
+    from etl_pipeline import NetworkDataExtract
+
+    file_path = os.path.join(work_dir, "phishing.csv")
+    PhishingDataGenerator().generate(
+        n_rows, nan_rate=options["nan_rate"], seed=options["seed"]
+    ).to_csv(file_path, index=False)
+    client = get_benchmark_mongo_client(options["mongo_url"])
+    client[BENCHMARK_DATABASE_NAME][BENCHMARK_COLLECTION_NAME].drop()
+    network_data_extract = NetworkDataExtract(mongo_client=client)
+    ## mongomock checks unique indexes with a collection scan per upsert, so the
+    ## stand-in only times the plain insert path
+    upsert = bool(options["mongo_url"])
+
+    def run():
+        return network_data_extract.load_csv_to_mongo(
+            file_path,
+            BENCHMARK_DATABASE_NAME,
+            BENCHMARK_COLLECTION_NAME,
+            upsert=upsert,
+        )
+
+    return run
+
+
+PREPARE_FUNCTIONS = {
+    "data_ingestion": prepare_data_ingestion,
+    "data_validation": prepare_data_validation,
+    "data_transformation": prepare_data_transformation,
+    "etl": prepare_etl,
+}
+
+
+def measure_case(benchmark: str, n_rows: int, options: dict) -> dict:
+    """
+    Runs one benchmark case, in a worker process started for this case only.
+    """
+    from networksecurity.logging.metrics import get_peak_rss_bytes, get_rss_bytes
+
+    os.chdir(REPO_ROOT)
+    prepare = PREPARE_FUNCTIONS[benchmark]
+    seconds = []
+    for _ in range(options["repeat"]):
+        work_dir = tempfile.mkdtemp(prefix=f"bench-{benchmark}-")
+        try:
+            run = prepare(n_rows, options, work_dir)
+            gc.collect()
+            started_at = time.perf_counter()
+            run()
+            seconds.append(time.perf_counter() - started_at)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    work_dir = tempfile.mkdtemp(prefix=f"bench-{benchmark}-")
+    try:
+        run = prepare(n_rows, options, work_dir)
+        gc.collect()
+        rss_before = get_rss_bytes()
+        tracemalloc.start()
+        run()
+        _, peak_traced_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rss_delta_bytes = get_rss_bytes() - rss_before
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    best_seconds = min(seconds)
+    return {
+        "benchmark": benchmark,
+        "n_rows": n_rows,
+        "seconds": seconds,
+        "best_seconds": best_seconds,
+        "median_seconds": statistics.median(seconds),
+        "rows_per_second": n_rows / best_seconds if best_seconds else None,
+        "peak_traced_bytes": peak_traced_bytes,
+        "rss_delta_bytes": rss_delta_bytes,
+        "peak_rss_bytes": get_peak_rss_bytes(),
+    }
+
+
+def get_environment() -> dict:
+    import numpy
+    import pandas
+    import sklearn
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "pandas": pandas.__version__,
+        "scikit-learn": sklearn.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_benchmarks(
+    benchmarks: list[str], sizes: list[int], options: dict, output_file_path: str
+) -> dict:
+    environment = get_environment()
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for benchmark in benchmarks:
+        for n_rows in sizes:
+            if (
+                benchmark in ("data_ingestion", "etl")
+                and not options["mongo_url"]
+                and n_rows > MONGOMOCK_MAX_ROWS
+            ):
+                print(f"{benchmark:>20} {n_rows:>10} skipped, needs --mongo-url")
+                results.append(
+                    {
+                        "benchmark": benchmark,
+                        "n_rows": n_rows,
+                        "skipped": "too large for the in-process MongoDB stand-in",
+                    }
+                )
+                continue
+            with context.Pool(processes=1, maxtasksperchild=1) as pool:
+                result = pool.apply(measure_case, (benchmark, n_rows, options))
+            results.append(result)
+            print(
+                f"{benchmark:>20} {n_rows:>10} {result['best_seconds']:>9.3f}s "
+                f"{result['rows_per_second']:>12,.0f} rows/s "
+                f"{result['peak_traced_bytes'] / 2**20:>9.1f} MiB peak"
+            )
+
+    content = {
+        "label": options["label"] or environment["git_commit"] or "unlabelled",
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment,
+        "options": options,
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
+    with open(output_file_path, "w") as file_obj:
+        json.dump(content, file_obj, indent=2)
+    print(f"Results written to {output_file_path}")
+    return content
+
+
+def parse_arguments(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--benchmarks", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS)
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--nan-rate", type=float, default=0.01)
+    parser.add_argument(
+        "--drift", type=float, default=0.0, help="drift injected into the test set"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--mongo-url", default=None, help="use this MongoDB instead of mongomock"
+    )
+    parser.add_argument("--label", default=None, help="defaults to the git commit")
+    parser.add_argument("--output", default=None, help="results JSON file path")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    arguments = parse_arguments(argv)
+    sys.path.insert(0, REPO_ROOT)
+    os.chdir(REPO_ROOT)
+    options = {
+        "nan_rate": arguments.nan_rate,
+        "drift": arguments.drift,
+        "repeat": arguments.repeat,
+        "seed": arguments.seed,
+        "mongo_url": arguments.mongo_url,
+        "label": arguments.label,
+    }
+    label = arguments.label or get_environment()["git_commit"] or "unlabelled"
+    output_file_path = arguments.output or os.path.join(
+        RESULTS_DIR, f"{label}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    run_benchmarks(arguments.benchmarks, arguments.sizes, options, output_file_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.constants.training_pipeline import SCHEMA_FILE_PATH, TARGET_COLUMN
+from networksecurity.utils.main_utils.utils import read_yaml_file
+
+REFERENCE_DATA_FILE_PATH = os.path.join("network_data", "phisingData.csv")
+
+
+class PhishingDataGenerator:
+    """
+    Generates synthetic phishing datasets with the columns of data_schema/schema.yaml.
+
+    Every feature is sampled from its distribution conditional on the target, as
+    measured on network_data/phisingData.csv (uniform over the schema's allowed
+    values when the file is missing), so the generated data keeps the per-class
+    shape of the real data at any row count. Sampling is vectorized: one uniform
+    draw per cell compared against the cumulative class probabilities.
+    """
+
+    def __init__(
+        self,
+        schema_file_path: str = SCHEMA_FILE_PATH,
+        reference_file_path: str | None = REFERENCE_DATA_FILE_PATH,
+    ) -> None:
+        schema = read_yaml_file(schema_file_path)
+        self.columns = [next(iter(column)) for column in schema["columns"]]
+        self.feature_columns = [c for c in self.columns if c != TARGET_COLUMN]
+        self.values = np.asarray(schema.get("allowed_values", [-1, 0, 1]), np.int8)
+        self.target_values = np.array([-1, 1], dtype=np.int8)
+
+        n_values = len(self.values)
+        ## probabilities[class, feature, value]
+        self.probabilities = np.full(
+            (2, len(self.feature_columns), n_values), 1.0 / n_values
+        )
+        self.target_probability = 0.5
+        if reference_file_path is not None and os.path.exists(reference_file_path):
+            reference = pd.read_csv(reference_file_path)
+            target = reference[TARGET_COLUMN].to_numpy()
+            self.target_probability = float((target == 1).mean())
+            for class_index, class_value in enumerate(self.target_values):
+                rows = reference[target == class_value]
+                for feature_index, column in enumerate(self.feature_columns):
+                    counts = (
+                        rows[column].value_counts().reindex(self.values, fill_value=0)
+                    )
+                    self.probabilities[class_index, feature_index] = (
+                        counts.to_numpy() / max(len(rows), 1)
+                    )
+
+    def generate(
+        self,
+        n_rows: int,
+        nan_rate: float = 0.0,
+        drift: float = 0.0,
+        drift_columns: list[str] | None = None,
+        seed: int = 0,
+    ) -> pd.DataFrame:
+        """
+        Returns ``n_rows`` synthetic rows. ``nan_rate`` blanks that share of the
+        feature cells. ``drift`` (0 to 1) moves the distribution of
+        ``drift_columns`` (every third feature by default) towards its mirror
+        image, which the drift tests detect.
+        """
+        rng = np.random.default_rng(seed)
+        classes = (rng.random(n_rows) < self.target_probability).astype(np.intp)
+        probabilities = self.probabilities
+        if drift > 0:
+            probabilities = probabilities.copy()
+            drift_columns = drift_columns or self.feature_columns[::3]
+            for column in drift_columns:
+                feature_index = self.feature_columns.index(column)
+                current = probabilities[:, feature_index]
+                probabilities[:, feature_index] = (
+                    1 - drift
+                ) * current + drift * current[:, ::-1]
+        cumulative = np.cumsum(probabilities, axis=2)[:, :, :-1]
+
+        data = {}
+        for feature_index, column in enumerate(self.feature_columns):
+            thresholds = cumulative[classes, feature_index]
+            draws = rng.random(n_rows)
+            value_index = (draws[:, None] > thresholds).sum(axis=1)
+            values = self.values[value_index]
+            if nan_rate > 0:
+                values = values.astype(np.float32)
+                values[rng.random(n_rows) < nan_rate] = np.nan
+            data[column] = values
+        data[TARGET_COLUMN] = self.target_values[classes]
+        return pd.DataFrame(data, columns=self.columns)
@@ -1,14 +1,19 @@
 import os
 import sys
 import json
+import time
 import certifi
 import pymongo
 import numpy as np
 import pandas as pd
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from dotenv import load_dotenv
 from networksecurity.logging.logger import logging
 from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.constants.training_pipeline import DATA_INGESTION_ROW_HASH_FIELD
+from networksecurity.data_access.mongo_client import get_mongo_client
 
 load_dotenv()
 
@@ -18,9 +23,9 @@ ca = certifi.where()
 
 
 class NetworkDataExtract:
-    def __init__(self) -> None:
+    def __init__(self, mongo_client=None) -> None:
         try:
-            pass
+            self.mongo_client = mongo_client
         except Exception as e:
             raise NetworkSecurityException(e, sys)  # type: ignore
 
@@ -39,7 +44,8 @@ class NetworkDataExtract:
             self.collection = collection
             self.records = records
 
-            self.mongo_client = pymongo.MongoClient(MONGO_DB_URL)
+            if self.mongo_client is None:
+                self.mongo_client = get_mongo_client()
             self.database = self.mongo_client[self.database]
 
             self.collection = self.database[self.collection]
@@ -48,6 +54,147 @@ class NetworkDataExtract:
         except Exception as e:
             raise NetworkSecurityException(e, sys)  # type: ignore
 
+    @staticmethod
+    def iter_csv_record_batches(file_path: str, chunksize: int):
+        """
+        Reads the CSV in blocks and yields one list of documents per block.
+
+        Documents are built straight from the column arrays: values are boxed to
+        Python scalars, missing values become None as in csv_to_json_converter, and
+        every document carries a row hash so a reload can be made idempotent.
+
+        The row hash covers the row's values and its occurrence number, i.e. how
+        many identical rows came before it in the file, but not its position or
+        the file name. Reloading a file, reordered or re-exported, writes nothing
+        new, while rows that repeat within a file are all kept. A row of a new
+        file is only skipped if an earlier load already holds as many identical
+        rows.
+        """
+        try:
+            seen_counts: dict = {}
+            for chunk in pd.read_csv(file_path, chunksize=chunksize):
+                columns = chunk.columns.tolist()
+                ## Numeric values are hashed as float64 so the hash does not depend
+                ## on the chunk dtypes
+                hash_frame = chunk.apply(
+                    lambda column: (
+                        column.astype(np.float64)
+                        if pd.api.types.is_numeric_dtype(column)
+                        else column
+                    )
+                )
+                content_hashes = pd.util.hash_pandas_object(hash_frame, index=False)
+                occurrences = content_hashes.groupby(
+                    content_hashes, sort=False
+                ).cumcount() + content_hashes.map(seen_counts).fillna(0).astype(
+                    np.int64
+                )
+                for content_hash, count in content_hashes.value_counts().items():
+                    seen_counts[content_hash] = seen_counts.get(content_hash, 0) + count
+                row_hashes = pd.util.hash_pandas_object(
+                    pd.DataFrame(
+                        {"content": content_hashes, "occurrence": occurrences}
+                    ),
+                    index=False,
+                )
+                values = chunk.astype(object).where(chunk.notna(), None)
+                arrays = [values[column].to_numpy() for column in columns]
+                arrays.append([f"{row_hash:016x}" for row_hash in row_hashes])
+                keys = columns + [DATA_INGESTION_ROW_HASH_FIELD]
+                yield [dict(zip(keys, row)) for row in zip(*arrays)]
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @staticmethod
+    def write_batch(collection, records: list, upsert: bool) -> int:
+        """
+        Writes one batch unordered. With upsert, rows whose hash is already in the
+        collection are left untouched, otherwise the batch is inserted.
+        """
+        try:
+            if upsert:
+                result = collection.bulk_write(
+                    [
+                        pymongo.UpdateOne(
+                            {
+                                DATA_INGESTION_ROW_HASH_FIELD: record[
+                                    DATA_INGESTION_ROW_HASH_FIELD
+                                ]
+                            },
+                            {"$setOnInsert": record},
+                            upsert=True,
+                        )
+                        for record in records
+                    ],
+                    ordered=False,
+                )
+                return result.upserted_count
+            result = collection.insert_many(records, ordered=False)
+            return len(result.inserted_ids)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def load_csv_to_mongo(
+        self,
+        file_path: str,
+        database: str,
+        collection: str,
+        chunksize: int = 50_000,
+        max_workers: int = 4,
+        upsert: bool = True,
+    ) -> dict:
+        """
+        Streams a CSV file into MongoDB with several concurrent unordered writers.
+
+        At most ``2 * max_workers`` batches are in memory at any time. With upsert
+        the load is keyed on the row hash, so a failed load can be re-run without
+        creating duplicates. Returns the row count, written count and rows/sec.
+        """
+        try:
+            if self.mongo_client is None:
+                self.mongo_client = get_mongo_client()
+            target = self.mongo_client[database][collection]
+            if upsert:
+                ## Partial, so documents loaded without a row hash do not all
+                ## index as null and collide
+                target.create_index(
+                    DATA_INGESTION_ROW_HASH_FIELD,
+                    unique=True,
+                    partialFilterExpression={
+                        DATA_INGESTION_ROW_HASH_FIELD: {"$exists": True}
+                    },
+                )
+
+            start_time = time.perf_counter()
+            rows, written = 0, 0
+            pending = deque()
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for records in NetworkDataExtract.iter_csv_record_batches(
+                    file_path, chunksize
+                ):
+                    if len(pending) >= 2 * max_workers:
+                        written += pending.popleft().result()
+                    pending.append(
+                        executor.submit(
+                            NetworkDataExtract.write_batch, target, records, upsert
+                        )
+                    )
+                    rows += len(records)
+                while pending:
+                    written += pending.popleft().result()
+
+            elapsed = time.perf_counter() - start_time
+            stats = {
+                "rows": rows,
+                "written": written,
+                "seconds": round(elapsed, 3),
+                "rows_per_second": round(rows / elapsed, 1) if elapsed > 0 else None,
+            }
+            logging.info(f"Loaded {file_path} into {database}.{collection}: {stats}")
+            return stats
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
 
 if __name__ == "__main__":
     FILE_PATH = "network_data\\phisingData.csv"
@@ -55,7 +202,5 @@ if __name__ == "__main__":
     COLLECTION = "network_data"
 
     networkETLobj = NetworkDataExtract()
-    records = networkETLobj.csv_to_json_converter(FILE_PATH)
-    print(records)
-    no_of_records = networkETLobj.insert_data_to_mongo(records, DATABSE, COLLECTION)
-    print(no_of_records)
+    stats = networkETLobj.load_csv_to_mongo(FILE_PATH, DATABSE, COLLECTION)
+    print(stats)
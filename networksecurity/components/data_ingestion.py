@@ -1,92 +1,638 @@
 from networksecurity.logging.logger import logging
+from networksecurity.logging.metrics import metrics, track_stage
 from networksecurity.entity.config import DataIngestionConfig
 from networksecurity.entity.artifact import DataIngestionArtifact
 from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.constants.training_pipeline import (
+    SCHEMA_FILE_PATH,
+    TARGET_COLUMN,
+    DATA_INGESTION_DIR_NAME,
+    DATA_INGESTION_ROW_HASH_FIELD,
+)
+from networksecurity.utils.main_utils.utils import (
+    read_yaml_file,
+    write_yaml_file,
+    save_dataframe,
+)
+from networksecurity.utils.main_utils.artifact_writer import ArtifactWriter
+from networksecurity.data_access.mongo_client import get_mongo_client
 
 import os
 import sys
-import pymongo
+import itertools
 import numpy as np
 import pandas as pd
 from typing import List
-from dotenv import load_dotenv
-from sklearn.model_selection import train_test_split
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from bson import ObjectId
 
 ## Configuration of the data ingestion config
 
-load_dotenv()
-
-MONGO_DB_URL = os.getenv("MONGO_DB_URL")
+## Resolution of the hash based split ratio
+HASH_SPLIT_BUCKETS = 1_000_000
 
 
 class DataIngestion:
-    def __init__(self, data_ingestion_config: DataIngestionConfig) -> None:
+    def __init__(
+        self,
+        data_ingestion_config: DataIngestionConfig,
+        mongo_client=None,
+        artifact_writer: ArtifactWriter | None = None,
+    ) -> None:
         try:
             self.data_ingestion_config = data_ingestion_config
+            self.mongo_client = mongo_client
+            self.artifact_writer = artifact_writer or ArtifactWriter()
         except Exception as e:
             raise NetworkSecurityException(e, sys)  # type: ignore
 
-    def export_collection_as_dataframe(self):
+    def get_collection(self):
         """
-        Read data from MongoDB collection and convert it to a pandas DataFrame.
+        Returns the MongoDB collection configured for data ingestion.
         """
         try:
             database_name = self.data_ingestion_config.database_name
             collection_name = self.data_ingestion_config.collection_name
-            self.mongo_client = pymongo.MongoClient(MONGO_DB_URL)
-            collection = self.mongo_client[database_name][collection_name]
+            if self.mongo_client is None:
+                self.mongo_client = get_mongo_client()
+            return self.mongo_client[database_name][collection_name]
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def get_collection_fingerprint(self) -> dict:
+        """
+        Cheap fingerprint of the collection contents: the document count and the
+        largest ``_id``. Used to key the stage cache without reading the data, so
+        documents updated in place are not detected.
+        """
+        try:
+            import pymongo
+
+            collection = self.get_collection()
+            last_document = next(
+                iter(
+                    collection.find({}, {"_id": 1})
+                    .sort("_id", pymongo.DESCENDING)
+                    .limit(1)
+                ),
+                None,
+            )
+            return {
+                "database": self.data_ingestion_config.database_name,
+                "collection": self.data_ingestion_config.collection_name,
+                "count": collection.estimated_document_count(),
+                "last_id": None if last_document is None else str(last_document["_id"]),
+            }
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @staticmethod
+    def get_schema_columns() -> dict:
+        """
+        Returns the column name to dtype mapping declared in the schema file.
+        """
+        try:
+            schema = read_yaml_file(SCHEMA_FILE_PATH)
+            columns = {}
+            for column in schema["columns"]:
+                columns.update(column)
+            return columns
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def export_collection_as_dataframe(self):
+        """
+        Read data from MongoDB collection and convert it to a pandas DataFrame.
+        """
+        try:
+            collection = self.get_collection()
             dataframe = pd.DataFrame(list(collection.find()))
             if "_id" in dataframe.columns.to_list():
                 dataframe.drop(columns=["_id"], inplace=True)
+            if DATA_INGESTION_ROW_HASH_FIELD in dataframe.columns.to_list():
+                dataframe.drop(columns=[DATA_INGESTION_ROW_HASH_FIELD], inplace=True)
             dataframe.replace({"na": np.nan}, inplace=True)
             return dataframe
         except Exception as e:
             raise NetworkSecurityException(e, sys)  # type: ignore
 
+    @staticmethod
+    def cursor_to_column_buffers(
+        cursor, column_names: List[str], capacity: int, batch_size: int
+    ) -> dict:
+        """
+        Drains a cursor batch by batch into pre-allocated float64 column buffers.
+
+        Only one batch of documents is held as Python objects at a time, so peak
+        memory is the column buffers plus ``batch_size`` documents.
+        """
+        try:
+            capacity = max(int(capacity), 1)
+            buffers = {
+                name: np.empty(capacity, dtype=np.float64) for name in column_names
+            }
+            n_rows = 0
+            while True:
+                batch = list(itertools.islice(cursor, batch_size))
+                if not batch:
+                    break
+                end = n_rows + len(batch)
+                if end > capacity:
+                    ## The collection grew after it was counted
+                    capacity = max(end, capacity * 2)
+                    for name in column_names:
+                        grown = np.empty(capacity, dtype=np.float64)
+                        grown[:n_rows] = buffers[name][:n_rows]
+                        buffers[name] = grown
+                batch_frame = pd.DataFrame.from_records(batch, columns=column_names)
+                batch_frame = batch_frame.replace({"na": np.nan})
+                for name in column_names:
+                    buffers[name][n_rows:end] = batch_frame[name].to_numpy(
+                        dtype=np.float64, na_value=np.nan
+                    )
+                n_rows = end
+                del batch, batch_frame
+            return {name: buffer[:n_rows] for name, buffer in buffers.items()}
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @staticmethod
+    def column_buffers_to_dataframe(
+        buffers: dict, schema_columns: dict
+    ) -> pd.DataFrame:
+        """
+        Builds a DataFrame from column buffers, casting the columns without missing
+        values back to their schema dtype.
+        """
+        try:
+            columns = {}
+            for name, dtype in schema_columns.items():
+                values = buffers.pop(name)
+                if not np.isnan(values).any():
+                    values = values.astype(dtype)
+                columns[name] = values
+            return pd.DataFrame(columns, columns=list(schema_columns))
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @staticmethod
+    def cursor_to_dataframe(
+        cursor, schema_columns: dict, capacity: int, batch_size: int
+    ) -> pd.DataFrame:
+        """
+        Drains a cursor into a DataFrame typed from the schema.
+        """
+        try:
+            buffers = DataIngestion.cursor_to_column_buffers(
+                cursor, list(schema_columns), capacity, batch_size
+            )
+            return DataIngestion.column_buffers_to_dataframe(buffers, schema_columns)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def export_collection_as_dataframe_streaming(self, batch_size: int | None = None):
+        """
+        Stream the MongoDB collection into typed column buffers and return the same
+        DataFrame as export_collection_as_dataframe.
+
+        The ``_id`` field is excluded by the projection, so it never leaves the server.
+        """
+        try:
+            batch_size = batch_size or self.data_ingestion_config.export_batch_size
+            collection = self.get_collection()
+            schema_columns = DataIngestion.get_schema_columns()
+            projection = {"_id": 0, **{name: 1 for name in schema_columns}}
+            capacity = collection.estimated_document_count()
+            logging.info(f"Streaming {capacity} documents in batches of {batch_size}")
+            cursor = collection.find({}, projection=projection, batch_size=batch_size)
+            try:
+                return DataIngestion.cursor_to_dataframe(
+                    cursor, schema_columns, capacity, batch_size
+                )
+            finally:
+                cursor.close()
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @staticmethod
+    def get_shard_boundaries(collection, num_shards: int) -> list:
+        """
+        Splits the collection into ``_id`` ranges of roughly equal size.
+
+        Returns ``num_shards + 1`` boundaries where shard ``i`` covers
+        ``[boundaries[i], boundaries[i + 1])``. The outer boundaries are ``None`` so
+        the first and last shards are open ended.
+        """
+        try:
+            import pymongo
+            import pymongo.errors
+
+            try:
+                buckets = collection.aggregate(
+                    [{"$bucketAuto": {"groupBy": "$_id", "buckets": num_shards}}],
+                    allowDiskUse=True,
+                )
+                lower_bounds = [bucket["_id"]["min"] for bucket in buckets]
+            except (pymongo.errors.OperationFailure, NotImplementedError):
+                ## Servers or stand-ins without $bucketAuto: walk the _id index
+                total = collection.estimated_document_count()
+                step = max(-(-total // num_shards), 1)
+                lower_bounds = []
+                for offset in range(0, total, step):
+                    cursor = (
+                        collection.find({}, {"_id": 1})
+                        .sort("_id", pymongo.ASCENDING)
+                        .skip(offset)
+                        .limit(1)
+                    )
+                    document = next(iter(cursor), None)
+                    if document is not None:
+                        lower_bounds.append(document["_id"])
+            return [None] + lower_bounds[1:] + [None]
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @staticmethod
+    def read_shard(
+        collection,
+        lower_bound,
+        upper_bound,
+        column_names: List[str],
+        capacity: int,
+        batch_size: int,
+    ) -> dict:
+        """
+        Reads one ``_id`` range, sorted by ``_id``, into column buffers.
+        """
+        try:
+            import pymongo
+
+            id_range = {}
+            if lower_bound is not None:
+                id_range["$gte"] = lower_bound
+            if upper_bound is not None:
+                id_range["$lt"] = upper_bound
+            query = {"_id": id_range} if id_range else {}
+            projection = {"_id": 0, **{name: 1 for name in column_names}}
+            cursor = collection.find(
+                query, projection=projection, batch_size=batch_size
+            ).sort("_id", pymongo.ASCENDING)
+            try:
+                return DataIngestion.cursor_to_column_buffers(
+                    cursor, column_names, capacity, batch_size
+                )
+            finally:
+                cursor.close()
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def export_collection_as_dataframe_sharded(
+        self,
+        num_shards: int | None = None,
+        max_workers: int | None = None,
+        batch_size: int | None = None,
+    ):
+        """
+        Read the collection as concurrent ``_id`` range shards.
+
+        Shards are concatenated in ``_id`` order and each shard is sorted by ``_id``,
+        so the resulting row order, and therefore the seeded train/test split, does
+        not depend on which shard finishes first.
+        """
+        try:
+            num_shards = num_shards or self.data_ingestion_config.export_num_shards
+            max_workers = max_workers or self.data_ingestion_config.export_max_workers
+            batch_size = batch_size or self.data_ingestion_config.export_batch_size
+            collection = self.get_collection()
+            schema_columns = DataIngestion.get_schema_columns()
+            column_names = list(schema_columns)
+
+            boundaries = DataIngestion.get_shard_boundaries(collection, num_shards)
+            n_shards = len(boundaries) - 1
+            capacity = collection.estimated_document_count() // n_shards + 1
+            logging.info(f"Reading {n_shards} shards with {max_workers} workers")
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(
+                        DataIngestion.read_shard,
+                        collection,
+                        lower_bound,
+                        upper_bound,
+                        column_names,
+                        capacity,
+                        batch_size,
+                    )
+                    for lower_bound, upper_bound in zip(boundaries[:-1], boundaries[1:])
+                ]
+                shards = [future.result() for future in futures]
+
+            buffers = {}
+            for name in column_names:
+                buffers[name] = np.concatenate([shard.pop(name) for shard in shards])
+            return DataIngestion.column_buffers_to_dataframe(buffers, schema_columns)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def export_collection(self) -> pd.DataFrame:
+        """
+        Export the collection using the export mode from the ingestion config.
+        """
+        try:
+            export_mode = self.data_ingestion_config.export_mode
+            if export_mode == "streaming":
+                return self.export_collection_as_dataframe_streaming()
+            if export_mode == "sharded":
+                return self.export_collection_as_dataframe_sharded()
+            if export_mode == "full":
+                return self.export_collection_as_dataframe()
+            raise ValueError(f"Unsupported data ingestion export mode: {export_mode}")
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
     def export_data_to_feature_store(self, dataframe: pd.DataFrame):
         """
-        Save the DataFrame to a CSV file in the feature store directory.
+        Save the DataFrame to the feature store directory in the artifact format.
         """
         try:
             feature_store_file_path = self.data_ingestion_config.feature_store_file_path
-            os.makedirs(os.path.dirname(feature_store_file_path), exist_ok=True)
-            dataframe.to_csv(feature_store_file_path, index=False, header=True)
+            self.artifact_writer.submit(
+                save_dataframe, feature_store_file_path, dataframe
+            )
             return dataframe
         except Exception as e:
             raise NetworkSecurityException(e, sys)  # type: ignore
 
+    @staticmethod
+    def hash_test_mask(
+        dataframe: pd.DataFrame,
+        test_ratio: float,
+        key_columns: List[str] | None = None,
+        stratify_column: str | None = None,
+    ) -> np.ndarray:
+        """
+        Returns a boolean mask that is True for the rows assigned to the test set.
+
+        Each row is assigned from a stable hash of its key columns (the features by
+        default), so the assignment depends on nothing but the row itself: it can be
+        computed chunk by chunk or in parallel, and rows never move as data grows.
+        Identical feature vectors always land on the same side.
+
+        With ``stratify_column`` the rows of every class are compared with the
+        same fixed threshold. The label is not part of the hash, which is uniform
+        within each class, so every class's test share comes out close to
+        ``test_ratio`` while each row keeps its side; the shares are logged.
+        """
+        try:
+            if key_columns is None:
+                key_columns = [
+                    column for column in dataframe.columns if column != TARGET_COLUMN
+                ]
+            ## Hash as float64 so a column does not change its hash when a NaN in
+            ## another batch changes its dtype
+            hashes = pd.util.hash_pandas_object(
+                dataframe[key_columns].astype(np.float64), index=False
+            ).to_numpy()
+            buckets = hashes % np.uint64(HASH_SPLIT_BUCKETS)
+            test_mask = buckets < np.uint64(round(test_ratio * HASH_SPLIT_BUCKETS))
+            if stratify_column is not None:
+                shares = (
+                    pd.Series(test_mask)
+                    .groupby(dataframe[stratify_column].to_numpy(), dropna=False)
+                    .mean()
+                )
+                logging.info(
+                    f"Test share per {stratify_column} class: "
+                    f"{shares.round(4).to_dict()}"
+                )
+            return test_mask
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def train_test_partition(self, dataframe: pd.DataFrame):
+        """
+        Partition the DataFrame into training and testing sets.
+        """
+        try:
+            split_strategy = self.data_ingestion_config.split_strategy
+            if split_strategy == "random":
+                from sklearn.model_selection import train_test_split
+
+                train_set, test_set = train_test_split(
+                    dataframe,
+                    test_size=self.data_ingestion_config.train_test_split_ratio,
+                    random_state=42,
+                )
+            elif split_strategy == "hash":
+                stratify_column = (
+                    TARGET_COLUMN if self.data_ingestion_config.split_stratify else None
+                )
+                test_mask = DataIngestion.hash_test_mask(
+                    dataframe,
+                    self.data_ingestion_config.train_test_split_ratio,
+                    stratify_column=stratify_column,
+                )
+                train_set, test_set = dataframe[~test_mask], dataframe[test_mask]
+            else:
+                raise ValueError(
+                    f"Unsupported train test split strategy: {split_strategy}"
+                )
+            return train_set, test_set
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
     def split_data_as_train_test(self, dataframe: pd.DataFrame):
         """
         Split the DataFrame into training and testing sets.
         """
         try:
             logging.info("Performed train test split on the data")
-            train_set, test_set = train_test_split(
-                dataframe,
-                test_size=self.data_ingestion_config.train_test_split_ratio,
-                random_state=42,
-            )
+            train_set, test_set = self.train_test_partition(dataframe)
             logging.info("Exited split_data_as_train_test method")
             train_file_path = self.data_ingestion_config.training_file_path
             test_file_path = self.data_ingestion_config.testing_file_path
 
-            logging.info("Exporting train and test data to CSV files")
-            os.makedirs(os.path.dirname(train_file_path), exist_ok=True)
-            os.makedirs(os.path.dirname(test_file_path), exist_ok=True)
-            train_set.to_csv(train_file_path, index=False, header=True)
-            test_set.to_csv(test_file_path, index=False, header=True)
-            logging.info("Exported train and test data to CSV files")
+            logging.info("Exporting train and test data files")
+            self.artifact_writer.submit(save_dataframe, train_file_path, train_set)
+            self.artifact_writer.submit(save_dataframe, test_file_path, test_set)
+            logging.info("Submitted train and test data files for export")
+            return train_set, test_set
         except Exception as e:
             raise NetworkSecurityException(e, sys)  # type: ignore
 
-    def initiate_data_ingestion(self):
+    def get_incremental_file_paths(self) -> List[str]:
+        """
+        Returns the persistent files that incremental ingestion appends to.
+        """
+        return [
+            self.data_ingestion_config.incremental_feature_store_file_path,
+            self.data_ingestion_config.incremental_training_file_path,
+            self.data_ingestion_config.incremental_testing_file_path,
+        ]
+
+    def read_watermark(self) -> dict:
+        """
+        Reads the watermark left by the previous incremental run and rolls back any
+        appends that were made after it was written.
+
+        The watermark records the size of every persistent file at commit time, so a
+        run that failed half way through appending does not leave duplicated rows.
+        """
         try:
-            dataframe = self.export_collection_as_dataframe()
+            watermark_file_path = self.data_ingestion_config.watermark_file_path
+            if not os.path.exists(watermark_file_path):
+                watermark = {"last_id": None, "file_sizes": {}, "rows": 0}
+            else:
+                watermark = read_yaml_file(watermark_file_path)
+                last_id = watermark.get("last_id")
+                if isinstance(last_id, str) and ObjectId.is_valid(last_id):
+                    watermark["last_id"] = ObjectId(last_id)
+
+            for file_path in self.get_incremental_file_paths():
+                committed_size = watermark["file_sizes"].get(file_path, 0)
+                if (
+                    os.path.exists(file_path)
+                    and os.path.getsize(file_path) > committed_size
+                ):
+                    logging.info(
+                        f"Rolling back uncommitted rows in {file_path} to {committed_size} bytes"
+                    )
+                    with open(file_path, "r+b") as file_obj:
+                        file_obj.truncate(committed_size)
+            return watermark
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def write_watermark(self, last_id, rows: int) -> None:
+        """
+        Commits the watermark together with the current size of the persistent files.
+        """
+        try:
+            watermark = {
+                "last_id": str(last_id) if isinstance(last_id, ObjectId) else last_id,
+                "rows": int(rows),
+                "updated_at": datetime.now().isoformat(),
+                "file_sizes": {
+                    file_path: os.path.getsize(file_path)
+                    for file_path in self.get_incremental_file_paths()
+                    if os.path.exists(file_path)
+                },
+            }
+            if isinstance(last_id, ObjectId):
+                watermark["last_id_generation_time"] = (
+                    last_id.generation_time.isoformat()
+                )
+            write_yaml_file(
+                file_path=self.data_ingestion_config.watermark_file_path,
+                content=watermark,
+                replace=True,
+            )
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def export_new_documents(self, last_id, batch_size: int | None = None):
+        """
+        Stream only the documents whose ``_id`` is greater than ``last_id``.
+
+        Relies on the default ObjectId ``_id`` values, which increase with insertion
+        time. Returns the new rows and the largest ``_id`` that was read.
+        """
+        try:
+            import pymongo
+
+            batch_size = batch_size or self.data_ingestion_config.export_batch_size
+            collection = self.get_collection()
+            schema_columns = DataIngestion.get_schema_columns()
+            query = {} if last_id is None else {"_id": {"$gt": last_id}}
+            projection = {"_id": 1, **{name: 1 for name in schema_columns}}
+            capacity = collection.count_documents(query)
+            logging.info(f"Found {capacity} documents after watermark {last_id}")
+            cursor = collection.find(
+                query, projection=projection, batch_size=batch_size
+            ).sort("_id", pymongo.ASCENDING)
+            last_seen = {"_id": last_id}
+
+            def track_last_id(documents):
+                for document in documents:
+                    last_seen["_id"] = document["_id"]
+                    yield document
+
+            try:
+                dataframe = DataIngestion.cursor_to_dataframe(
+                    track_last_id(cursor), schema_columns, capacity, batch_size
+                )
+            finally:
+                cursor.close()
+            return dataframe, last_seen["_id"]
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @staticmethod
+    def append_to_csv(dataframe: pd.DataFrame, file_path: str) -> None:
+        """
+        Appends rows to a CSV file, writing the header only when the file is new.
+        """
+        try:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            write_header = (
+                not os.path.exists(file_path) or os.path.getsize(file_path) == 0
+            )
+            dataframe.to_csv(file_path, mode="a", index=False, header=write_header)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def initiate_incremental_data_ingestion(self) -> DataIngestionArtifact:
+        """
+        Fetch the documents added since the last run, append them to the persistent
+        feature store and split only the new rows into the persistent train and test
+        partitions. Rows that were already assigned are never re-read or moved.
+        """
+        try:
+            watermark = self.read_watermark()
+            dataframe, last_id = self.export_new_documents(watermark["last_id"])
+            if len(dataframe) > 0:
+                train_set, test_set = self.train_test_partition(dataframe)
+                DataIngestion.append_to_csv(
+                    dataframe,
+                    self.data_ingestion_config.incremental_feature_store_file_path,
+                )
+                DataIngestion.append_to_csv(
+                    train_set, self.data_ingestion_config.incremental_training_file_path
+                )
+                DataIngestion.append_to_csv(
+                    test_set, self.data_ingestion_config.incremental_testing_file_path
+                )
+                self.write_watermark(last_id, watermark["rows"] + len(dataframe))
+            metrics.record_rows(len(dataframe))
+            logging.info(
+                f"Incremental ingestion appended {len(dataframe)} rows up to {last_id}"
+            )
+            ## Only the new rows are in memory, so the next stage reads the full
+            ## partitions from disk
+            return DataIngestionArtifact(
+                train_file_path=self.data_ingestion_config.incremental_training_file_path,
+                test_file_path=self.data_ingestion_config.incremental_testing_file_path,
+            )
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @track_stage(DATA_INGESTION_DIR_NAME)
+    def initiate_data_ingestion(self, incremental: bool | None = None):
+        try:
+            if incremental is None:
+                incremental = self.data_ingestion_config.incremental
+            if incremental:
+                return self.initiate_incremental_data_ingestion()
+
+            dataframe = self.export_collection()
+            metrics.record_rows(len(dataframe))
             dataframe = self.export_data_to_feature_store(dataframe)
-            self.split_data_as_train_test(dataframe)
+            train_set, test_set = self.split_data_as_train_test(dataframe)
             data_ingestion_artifact = DataIngestionArtifact(
                 train_file_path=self.data_ingestion_config.training_file_path,
-                test_file_path=self.data_ingestion_config.testing_file_path
+                test_file_path=self.data_ingestion_config.testing_file_path,
+                train_dataframe=train_set,
+                test_dataframe=test_set,
             )
             return data_ingestion_artifact
         except Exception as e:
@@ -1,10 +1,11 @@
 import sys, os
+from functools import partial
 import numpy as np
 import pandas as pd
-from sklearn.impute import KNNImputer
-from sklearn.pipeline import Pipeline
 from networksecurity.constants.training_pipeline import TARGET_COLUMN
 from networksecurity.constants.training_pipeline import (
+    DATA_TRANSFORMATION_DIR_NAME,
+    DATA_TRANSFORMATION_IMPUTER,
     DATA_TRANSFORMATION_IMPUTER_PARAMS,
 )
 from networksecurity.entity.artifact import (
@@ -14,7 +15,16 @@ from networksecurity.entity.artifact import (
 from networksecurity.entity.config import DataTransformationConfig
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
-from networksecurity.utils.main_utils.utils import save_numpy_array_data, save_object
+from networksecurity.logging.metrics import metrics, track_stage
+from networksecurity.pipeline.dag_executor import run_concurrently
+from networksecurity.utils.main_utils.artifact_writer import ArtifactWriter
+from networksecurity.utils.main_utils.packed_rows import can_pack, deduplicate_rows
+from networksecurity.utils.ml_utils.parallel_transform import ParallelTransformer
+from networksecurity.utils.main_utils.utils import (
+    load_dataframe,
+    save_numpy_array_data,
+    save_object,
+)
 
 
 class DataTransformation:
@@ -22,25 +32,37 @@ class DataTransformation:
         self,
         data_validation_artifact: DataValidationArtifact,
         data_transformation_config: DataTransformationConfig,
+        artifact_writer: ArtifactWriter | None = None,
     ):
         try:
             self.data_validation_artifact = data_validation_artifact
             self.data_transformation_config = data_transformation_config
+            self.artifact_writer = artifact_writer or ArtifactWriter()
         except Exception as e:
             raise NetworkSecurityException(e, sys)  # type: ignore
 
     @staticmethod
     def read_data(file_path: str) -> pd.DataFrame:
         try:
-            return pd.read_csv(file_path)
+            return load_dataframe(file_path)
         except Exception as e:
             raise NetworkSecurityException(e, sys)  # type: ignore
 
-    def get_data_transformer_object(self) -> Pipeline:
+    @staticmethod
+    def get_dataframe(dataframe: pd.DataFrame | None, file_path: str) -> pd.DataFrame:
+        """
+        Returns the DataFrame handed over by the previous stage, or reads it.
+        """
+        if dataframe is not None:
+            return dataframe
+        return DataTransformation.read_data(file_path)
+
+    def get_data_transformer_object(self) -> "Pipeline":
         """
-        It initialises KNNImputer object with the parameters specified in the training_pipeline.py file
-        and returns a Pipeline object with the KNNImputer object as the first step.
-        
+        It initialises the imputer selected by DATA_TRANSFORMATION_IMPUTER ("knn" or "ternary_knn")
+        with the parameters specified in the training_pipeline.py file and returns a Pipeline
+        object with the imputer as the first step.
+
         Returns:
             A pipeline object
         """
@@ -48,24 +70,93 @@ class DataTransformation:
             f"Entered get_data_transformer_object method of Transformation class"
         )
         try:
-            imputer = KNNImputer(**DATA_TRANSFORMATION_IMPUTER_PARAMS)
+            ## scikit-learn is only needed to fit, not to import the pipeline
+            from sklearn.impute import KNNImputer
+            from sklearn.pipeline import Pipeline
+
+            from networksecurity.utils.ml_utils.imputer import TernaryKNNImputer
+
+            imputers = {"knn": KNNImputer, "ternary_knn": TernaryKNNImputer}
+            if DATA_TRANSFORMATION_IMPUTER not in imputers:
+                raise ValueError(f"Unknown imputer: {DATA_TRANSFORMATION_IMPUTER}")
+            imputer = imputers[DATA_TRANSFORMATION_IMPUTER](
+                **DATA_TRANSFORMATION_IMPUTER_PARAMS
+            )
             logging.info(
-                f"Initialise KNNImputer with {DATA_TRANSFORMATION_IMPUTER_PARAMS}"
+                f"Initialise {type(imputer).__name__} with {DATA_TRANSFORMATION_IMPUTER_PARAMS}"
             )
             processor = Pipeline([("imputer", imputer)])
             return processor
         except Exception as e:
             raise NetworkSecurityException(e, sys)  # type: ignore
 
+    def deduplicate_rows(
+        self, dataframe: pd.DataFrame
+    ) -> tuple[pd.DataFrame, np.ndarray | None]:
+        """
+        Collapses identical rows, target included, into their first occurrence and
+        returns the counts as sample weights. Returns the rows unchanged and no
+        weights when deduplication is off or the rows are not ternary.
+        """
+        try:
+            if not self.data_transformation_config.deduplicate:
+                return dataframe, None
+            if not can_pack(dataframe):
+                logging.info("Training rows are not ternary, not deduplicating them")
+                return dataframe, None
+            first, _, counts = deduplicate_rows(dataframe)
+            logging.info(
+                f"Deduplicated {len(dataframe)} training rows into {len(first)}"
+            )
+            return dataframe.iloc[first].reset_index(drop=True), counts
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @staticmethod
+    def fit_preprocessor(
+        preprocessor, features: pd.DataFrame, sample_weight: np.ndarray | None
+    ):
+        """
+        Fits the preprocessor, passing the row counts to the imputer when the rows
+        were deduplicated. An imputer without sample weights is fitted on the
+        rows repeated by their counts instead.
+        """
+        try:
+            if sample_weight is None:
+                return preprocessor.fit(features)
+            from sklearn.utils.validation import has_fit_parameter
+
+            imputer_name, imputer = preprocessor.steps[0]
+            if has_fit_parameter(imputer, "sample_weight"):
+                return preprocessor.fit(
+                    features, **{f"{imputer_name}__sample_weight": sample_weight}
+                )
+            return preprocessor.fit(features.loc[features.index.repeat(sample_weight)])
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @track_stage(DATA_TRANSFORMATION_DIR_NAME)
     def initiate_data_transformation(self) -> DataTransformationArtifact:
         try:
             logging.info(f"Data Transformation started.")
-            train_dataframe = DataTransformation.read_data(
-                self.data_validation_artifact.valid_train_file_path
-            )
-            test_dataframe = DataTransformation.read_data(
-                self.data_validation_artifact.valid_test_file_path
+            ## Use the DataFrames handed over in memory, otherwise read both files concurrently
+            dataframes = run_concurrently(
+                {
+                    "train": partial(
+                        DataTransformation.get_dataframe,
+                        self.data_validation_artifact.valid_train_dataframe,
+                        self.data_validation_artifact.valid_train_file_path,
+                    ),
+                    "test": partial(
+                        DataTransformation.get_dataframe,
+                        self.data_validation_artifact.valid_test_dataframe,
+                        self.data_validation_artifact.valid_test_file_path,
+                    ),
+                }
             )
+            train_dataframe, test_dataframe = dataframes["train"], dataframes["test"]
+            metrics.record_rows(len(train_dataframe) + len(test_dataframe))
+            train_dataframe, train_weights = self.deduplicate_rows(train_dataframe)
 
             ## training dataframe
             input_feature_train_dataframe = train_dataframe.drop(
@@ -81,41 +172,68 @@ class DataTransformation:
             target_feature_test_dataframe = target_feature_test_dataframe.replace(-1, 0)
 
             preprocessor = self.get_data_transformer_object()
-            preprocessor_obj = preprocessor.fit(input_feature_train_dataframe)
-            transformed_input_train_feature = preprocessor_obj.transform(
-                input_feature_train_dataframe
+            preprocessor_obj = self.fit_preprocessor(
+                preprocessor, input_feature_train_dataframe, train_weights
             )
-            transformed_input_test_feature = preprocessor_obj.transform(
-                input_feature_test_dataframe
+            ## Each array is written once, with the target as its last column
+            transformer = ParallelTransformer(
+                n_jobs=self.data_transformation_config.n_jobs,
+                chunk_size=self.data_transformation_config.chunk_size,
             )
-
-            train_arr = np.c_[
-                transformed_input_train_feature,
-                np.array(target_feature_train_dataframe),
-            ]
-            test_arr = np.c_[
-                transformed_input_test_feature, np.array(target_feature_test_dataframe)
-            ]
-
-            ## Save numpy array data
-            save_numpy_array_data(
-                self.data_transformation_config.transformed_train_file_path,
-                array=train_arr,
-            )
-            save_numpy_array_data(
-                self.data_transformation_config.transformed_test_file_path,
-                array=test_arr,
+            persist = self.artifact_writer.persist
+            arrays = run_concurrently(
+                {
+                    "train": partial(
+                        transformer.transform,
+                        preprocessor_obj,
+                        input_feature_train_dataframe,
+                        target_feature_train_dataframe,
+                        (
+                            self.data_transformation_config.transformed_train_file_path
+                            if persist
+                            else None
+                        ),
+                    ),
+                    "test": partial(
+                        transformer.transform,
+                        preprocessor_obj,
+                        input_feature_test_dataframe,
+                        target_feature_test_dataframe,
+                        (
+                            self.data_transformation_config.transformed_test_file_path
+                            if persist
+                            else None
+                        ),
+                    ),
+                }
             )
-            save_object(
+            train_arr, test_arr = arrays["train"], arrays["test"]
+
+            ## Save preprocessing object
+            self.artifact_writer.submit(
+                save_object,
                 self.data_transformation_config.transformed_object_file_path,
                 obj=preprocessor_obj,
             )
+            train_weights_file_path = None
+            if train_weights is not None:
+                train_weights_file_path = (
+                    self.data_transformation_config.transformed_train_weights_file_path
+                )
+                if persist:
+                    self.artifact_writer.submit(
+                        save_numpy_array_data, train_weights_file_path, train_weights
+                    )
 
             ## Preparing artifcat
             return DataTransformationArtifact(
                 transformed_object_file_path=self.data_transformation_config.transformed_object_file_path,
                 transformed_train_file_path=self.data_transformation_config.transformed_train_file_path,
                 transformed_test_file_path=self.data_transformation_config.transformed_test_file_path,
+                transformed_train_weights_file_path=train_weights_file_path,
+                transformed_train_array=train_arr,
+                transformed_test_array=test_arr,
+                transformed_train_weights=train_weights,
             )
         except Exception as e:
             raise NetworkSecurityException(e, sys)  # type: ignore
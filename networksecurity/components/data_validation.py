@@ -4,12 +4,30 @@ from networksecurity.entity.artifact import (
 )
 from networksecurity.entity.config import DataValidationConfig
 from networksecurity.exception.exception import NetworkSecurityException
-from networksecurity.utils.main_utils.utils import read_yaml_file, write_yaml_file
+from networksecurity.utils.main_utils.utils import (
+    read_yaml_file,
+    write_yaml_file,
+    load_dataframe,
+    save_dataframe,
+)
+from networksecurity.utils.main_utils.artifact_writer import ArtifactWriter
+from networksecurity.utils.main_utils.schema_validator import (
+    SchemaValidationReport,
+    SchemaValidator,
+)
 from networksecurity.logging.logger import logging
-from networksecurity.constants.training_pipeline import SCHEMA_FILE_PATH
-from scipy.stats import ks_2samp
+from networksecurity.logging.metrics import metrics, track_stage
+from networksecurity.pipeline.dag_executor import run_concurrently
+from networksecurity.constants.training_pipeline import (
+    SCHEMA_FILE_PATH,
+    DATA_VALIDATION_DIR_NAME,
+    DATA_VALIDATION_DRIFT_N_JOBS,
+)
+from networksecurity.utils.ml_utils.drift_engine import DriftEngine
+from networksecurity.utils.ml_utils.drift_monitor import DriftSketch
 import pandas as pd
 import os, sys
+from functools import partial
 
 
 class DataValidation:
@@ -17,53 +35,97 @@ class DataValidation:
         self,
         data_ingestion_artifact: DataIngestionArtifact,
         data_validation_config: DataValidationConfig,
+        artifact_writer: ArtifactWriter | None = None,
     ) -> None:
         try:
             self.data_ingestion_artifact = data_ingestion_artifact
             self.data_validation_config = data_validation_config
+            self.artifact_writer = artifact_writer or ArtifactWriter()
             self._schema_file_path = read_yaml_file(SCHEMA_FILE_PATH)
+            self.schema_validator = SchemaValidator(self._schema_file_path)
         except Exception as e:
             raise NetworkSecurityException(e, sys)  # type: ignore
 
     @staticmethod
     def read_data(file_path: str) -> pd.DataFrame:
         """
-        Reads a CSV file and returns a DataFrame.
+        Reads a DataFrame artifact (csv, parquet, feather or npy) and returns it.
         """
         try:
-            return pd.read_csv(file_path)
+            return load_dataframe(file_path)
         except Exception as e:
             raise NetworkSecurityException(e, sys)  # type: ignore
 
+    @staticmethod
+    def get_dataframe(dataframe: pd.DataFrame | None, file_path: str) -> pd.DataFrame:
+        """
+        Returns the DataFrame handed over by the previous stage, or reads it.
+        """
+        if dataframe is not None:
+            return dataframe
+        return DataValidation.read_data(file_path)
+
     def validate_number_of_columns(self, dataframe: pd.DataFrame) -> bool:
         """
         Validates the number of columns in the DataFrame against the schema.
         """
         try:
-            expected_columns = self._schema_file_path["columns"]
-            actual_columns = dataframe.columns.tolist()
-            logging.info(f"Expected columns: {len(expected_columns)}")
-            logging.info(f"Actual columns: {len(actual_columns)}")
-            if len(actual_columns) == len(expected_columns):
-                return True
-            return False
+            errors = self.schema_validator.check_columns(dataframe)
+            logging.info(f"Expected columns: {len(self.schema_validator.columns)}")
+            logging.info(f"Actual columns: {len(dataframe.columns)}")
+            return not errors
         except Exception as e:
             raise NetworkSecurityException(e, sys)  # type: ignore
 
     def validate_numerical_columns(self, dataframe: pd.DataFrame) -> bool:
         """
-        Validates the numerical columns in the DataFrame against the schema.
+        Validates the numerical columns and dtypes in the DataFrame against the schema.
+        """
+        try:
+            errors = self.schema_validator.check_dtypes(dataframe)
+            for error in errors:
+                logging.info(error)
+            return not errors
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def validate_schema(self, dataframe: pd.DataFrame) -> SchemaValidationReport:
+        """
+        Checks column names and order, dtypes, the allowed value domain and null
+        rates of the DataFrame against the schema.
+        """
+        try:
+            report = self.schema_validator.validate(dataframe)
+            ## Lazy arguments, the report is only formatted when INFO is enabled
+            logging.info(
+                "Schema validation: %d errors, %d invalid rows, out of domain values %s",
+                len(report.errors),
+                report.n_invalid_rows,
+                report.invalid_value_counts,
+            )
+            return report
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def route_invalid_rows(
+        self,
+        dataframe: pd.DataFrame,
+        report: SchemaValidationReport,
+        invalid_file_path: str,
+    ) -> str | None:
+        """
+        Writes the invalid rows of the DataFrame to invalid_file_path and returns
+        the path, or None when every row is valid.
         """
         try:
-            expected_numerical_columns = self._schema_file_path["numerical_columns"]
-            actual_numerical_columns = dataframe.select_dtypes(
-                include=["number"]
-            ).columns.tolist()
-            logging.info(f"Expected numerical columns: {expected_numerical_columns}")
-            logging.info(f"Actual numerical columns: {actual_numerical_columns}")
-            if set(actual_numerical_columns) == set(expected_numerical_columns):
-                return True
-            return False
+            if not report.n_invalid_rows:
+                return None
+            self.artifact_writer.submit(
+                save_dataframe,
+                invalid_file_path,
+                dataframe[report.invalid_row_mask],
+            )
+            return invalid_file_path
         except Exception as e:
             raise NetworkSecurityException(e, sys)  # type: ignore
 
@@ -75,27 +137,15 @@ class DataValidation:
     ) -> bool:
         """
         Detect data drift between the base and current DataFrames using the Kolmogorov-Smirnov test.
+        All columns are tested in one vectorized pass over value-count histograms.
         """
         try:
-            drift_detected = True
-            report = {}
-            for column in base_dataframe.columns:
-                base_data = base_dataframe[column]
-                current_data = current_dataframe[column]
-                _, pvalue = ks_2samp(base_data, current_data)
-                if threshold <= float(pvalue): # type: ignore
-                    is_found = False
-                else:
-                    is_found = True
-                    drift_detected = False
-                report.update(
-                    {
-                        column: {
-                            "p_value": float(pvalue),  # type: ignore
-                            "drift_detected": is_found,
-                        }
-                    }
-                )
+            drift_engine = DriftEngine(
+                threshold=threshold, n_jobs=DATA_VALIDATION_DRIFT_N_JOBS
+            )
+            drift_result = drift_engine.detect(base_dataframe, current_dataframe)
+            report = DriftEngine.to_report(drift_result)
+            drift_detected = not bool(drift_result["drift_detected"].any())
             drift_report_file_path = self.data_validation_config.drift_report_file_path
             os.makedirs(os.path.dirname(drift_report_file_path), exist_ok=True)
             write_yaml_file(
@@ -105,61 +155,96 @@ class DataValidation:
         except Exception as e:
             raise NetworkSecurityException(e, sys)  # type: ignore
 
+    @track_stage(DATA_VALIDATION_DIR_NAME)
     def initiate_data_validation(self) -> DataValidationArtifact:
         try:
             train_file_path = self.data_ingestion_artifact.train_file_path
             test_file_path = self.data_ingestion_artifact.test_file_path
 
-            ## Read the data from train and test files
-            train_dataframe = DataValidation.read_data(train_file_path)
-            test_dataframe = DataValidation.read_data(test_file_path)
-
-            ## Validate the number of columns
-            status = self.validate_number_of_columns(train_dataframe)
-            if not status:
-                error_message = (
-                    f"Train dataframe does not have the expected number of columns.\n"
-                )
-            status = self.validate_number_of_columns(test_dataframe)
-            if not status:
-                error_message = (
-                    f"Test dataframe does not have the expected number of columns.\n"
-                )
-
-            ## Validate the numerical columns
-            status = self.validate_numerical_columns(train_dataframe)
-            if not status:
-                error_message = (
-                    f"Train dataframe does not have the expected numerical columns.\n"
-                )
+            ## Use the DataFrames handed over in memory, otherwise read both files concurrently
+            dataframes = run_concurrently(
+                {
+                    "train": partial(
+                        DataValidation.get_dataframe,
+                        self.data_ingestion_artifact.train_dataframe,
+                        train_file_path,
+                    ),
+                    "test": partial(
+                        DataValidation.get_dataframe,
+                        self.data_ingestion_artifact.test_dataframe,
+                        test_file_path,
+                    ),
+                }
+            )
+            train_dataframe, test_dataframe = dataframes["train"], dataframes["test"]
+            metrics.record_rows(len(train_dataframe) + len(test_dataframe))
+
+            ## Validate columns, dtypes, value domain and null rates in one pass
+            reports = run_concurrently(
+                {
+                    "train": partial(self.validate_schema, train_dataframe),
+                    "test": partial(self.validate_schema, test_dataframe),
+                }
+            )
+            train_report, test_report = reports["train"], reports["test"]
+            error_message = "".join(
+                f"{name} dataframe: {error}\n"
+                for name, report in (("Train", train_report), ("Test", test_report))
+                for error in report.errors
+            )
+            if error_message:
+                logging.error(f"Schema validation failed:\n{error_message}")
+            ## Later stages rely on the schema columns, so a wrong layout is fatal
+            if train_report.structure_errors or test_report.structure_errors:
+                raise ValueError(error_message)
+
+            ## Route the rows that break a row level rule to the invalid files
+            invalid_train_file_path = self.route_invalid_rows(
+                train_dataframe,
+                train_report,
+                self.data_validation_config.invalid_train_file_path,
+            )
+            invalid_test_file_path = self.route_invalid_rows(
+                test_dataframe,
+                test_report,
+                self.data_validation_config.invalid_test_file_path,
+            )
+            if train_report.n_invalid_rows:
+                train_dataframe = train_dataframe[~train_report.invalid_row_mask]
+            if test_report.n_invalid_rows:
+                test_dataframe = test_dataframe[~test_report.invalid_row_mask]
 
             ## let's check data drift
             drift_status = self.detect_data_drift(
                 base_dataframe=train_dataframe, current_dataframe=test_dataframe
             )
-            dir_path = os.path.dirname(
-                self.data_validation_config.valid_train_file_path
-            )
-            os.makedirs(dir_path, exist_ok=True)
 
-            train_dataframe.to_csv(
+            ## Persist the training baseline so new data can be checked for drift
+            ## without reloading the training set
+            DriftSketch.from_dataframe(train_dataframe).save(
+                self.data_validation_config.drift_baseline_file_path
+            )
+            self.artifact_writer.submit(
+                save_dataframe,
                 self.data_validation_config.valid_train_file_path,
-                index=False,
-                header=True,
+                train_dataframe,
             )
-            test_dataframe.to_csv(
+            self.artifact_writer.submit(
+                save_dataframe,
                 self.data_validation_config.valid_test_file_path,
-                index=False,
-                header=True,
+                test_dataframe,
             )
 
             return DataValidationArtifact(
-                validation_status=drift_status,
-                valid_train_file_path=self.data_ingestion_artifact.train_file_path,
-                valid_test_file_path=self.data_ingestion_artifact.test_file_path,
-                invalid_train_file_path=None,
-                invalid_test_file_path=None,
+                validation_status=drift_status and not error_message,
+                valid_train_file_path=self.data_validation_config.valid_train_file_path,
+                valid_test_file_path=self.data_validation_config.valid_test_file_path,
+                invalid_train_file_path=invalid_train_file_path,
+                invalid_test_file_path=invalid_test_file_path,
                 drift_report_file_path=self.data_validation_config.drift_report_file_path,
+                drift_baseline_file_path=self.data_validation_config.drift_baseline_file_path,
+                valid_train_dataframe=train_dataframe,
+                valid_test_dataframe=test_dataframe,
             )
         except Exception as e:
             raise NetworkSecurityException(e, sys)  # type: ignore
@@ -0,0 +1,196 @@
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+from networksecurity.constants.training_pipeline import (
+    FEATURE_EXTRACTION_DIR_NAME,
+    SCHEMA_FILE_PATH,
+    TARGET_COLUMN,
+)
+from networksecurity.data_access.domain_resolver import (
+    CachedDomainResolver,
+    DomainResolver,
+    get_domain_resolvers,
+)
+from networksecurity.entity.artifact import FeatureExtractionArtifact
+from networksecurity.entity.config import (
+    FeatureExtractionConfig,
+    TrainingPipelineConfig,
+)
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.logging.metrics import metrics, track_stage
+from networksecurity.pipeline.batch_prediction import (
+    BatchPrediction,
+    ChunkedOutputWriter,
+)
+from networksecurity.utils.main_utils.utils import read_yaml_file
+from networksecurity.utils.ml_utils.url_features import (
+    extract_lexical_features,
+    extract_lookup_features,
+    extract_page_features,
+    get_domains,
+    get_hosts,
+)
+
+
+class FeatureExtraction:
+    """
+    Turns raw URLs, and optionally the HTML of their pages, into the feature
+    columns of the schema.
+
+    The URL and page features are computed per batch with vectorized string
+    operations. The lookup based features come from the resolvers, each behind
+    a bounded LRU/TTL cache, which see every distinct domain of a batch once.
+    Features that cannot be computed for a row (no HTML, a domain no resolver
+    knows) are left missing for the imputer.
+    """
+
+    def __init__(
+        self,
+        feature_extraction_config: FeatureExtractionConfig,
+        resolvers: list[DomainResolver] | None = None,
+    ) -> None:
+        try:
+            self.feature_extraction_config = feature_extraction_config
+            config = feature_extraction_config
+            self.resolvers = (
+                resolvers
+                if resolvers is not None
+                else get_domain_resolvers(
+                    config.domain_facts_file_path,
+                    config.resolve_dns,
+                    config.resolver_cache_size,
+                    config.resolver_cache_ttl_seconds,
+                    config.resolver_max_workers,
+                )
+            )
+            schema = read_yaml_file(SCHEMA_FILE_PATH)
+            self.feature_columns = [
+                name
+                for column in schema["columns"]
+                for name in column
+                if name != TARGET_COLUMN
+            ]
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def extract_features(self, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns the feature columns for the URLs of ``dataframe``, followed by its
+        target column when it has one.
+        """
+        try:
+            config = self.feature_extraction_config
+            dataframe = dataframe.reset_index(drop=True)
+            urls = dataframe[config.url_column]
+            if config.html_column in dataframe.columns:
+                pages = dataframe[config.html_column]
+            else:
+                pages = pd.Series(None, index=dataframe.index, dtype=object)
+            hosts, _ = get_hosts(urls.fillna("").astype("str").str.strip().str.lower())
+            features = pd.concat(
+                [
+                    extract_lexical_features(urls),
+                    extract_page_features(urls, pages),
+                    extract_lookup_features(get_domains(hosts), self.resolvers),
+                ],
+                axis=1,
+            )[self.feature_columns]
+            if TARGET_COLUMN in dataframe.columns:
+                features[TARGET_COLUMN] = dataframe[TARGET_COLUMN]
+            return features
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @track_stage(FEATURE_EXTRACTION_DIR_NAME)
+    def initiate_feature_extraction(
+        self, input_file_path: str, output_file_path: str | None = None
+    ) -> FeatureExtractionArtifact:
+        """
+        Extracts the features of the URLs in a csv or parquet file, chunk by
+        chunk, into ``output_file_path`` (by default the configured feature file).
+        """
+        try:
+            config = self.feature_extraction_config
+            output_file_path = output_file_path or config.feature_file_path
+            started_at = time.perf_counter()
+            writer = ChunkedOutputWriter(output_file_path)
+            try:
+                for chunk in BatchPrediction.iter_input_chunks(
+                    input_file_path, config.chunk_size
+                ):
+                    writer.write(self.extract_features(chunk))
+            except BaseException:
+                writer.close(commit=False)
+                raise
+            writer.close()
+
+            elapsed = time.perf_counter() - started_at
+            metrics.record_rows(writer.n_rows)
+            logging.info(
+                "Extracted the features of %d URLs from %s in %.3fs",
+                writer.n_rows,
+                input_file_path,
+                elapsed,
+            )
+            for resolver in self.resolvers:
+                if isinstance(resolver, CachedDomainResolver):
+                    logging.info(
+                        f"{type(resolver.resolver).__name__} cache: {resolver.stats()}"
+                    )
+            return FeatureExtractionArtifact(
+                feature_file_path=output_file_path, n_rows=writer.n_rows
+            )
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+
+def get_feature_extraction_config(
+    argv=None,
+) -> tuple[FeatureExtractionConfig, argparse.Namespace]:
+    """
+    Parses the command line into the configuration and the input and output
+    file paths.
+    """
+    parser = argparse.ArgumentParser(description="URL feature extraction")
+    parser.add_argument("input_file_path", help="csv or parquet file of URLs")
+    parser.add_argument(
+        "output_file_path",
+        nargs="?",
+        default=None,
+        help="csv or parquet file, defaults to the configured feature file",
+    )
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument(
+        "--domain-facts-file-path",
+        default=None,
+        help="csv of domain facts for the lookup based features",
+    )
+    parser.add_argument(
+        "--resolve-dns",
+        action="store_true",
+        help="look the DNS record feature up with the system resolver",
+    )
+    arguments = parser.parse_args(argv)
+
+    config = FeatureExtractionConfig(TrainingPipelineConfig())
+    for name in ("chunk_size", "domain_facts_file_path"):
+        if getattr(arguments, name) is not None:
+            setattr(config, name, getattr(arguments, name))
+    if arguments.resolve_dns:
+        config.resolve_dns = True
+    return config, arguments
+
+
+if __name__ == "__main__":
+    try:
+        config, arguments = get_feature_extraction_config()
+        artifact = FeatureExtraction(config).initiate_feature_extraction(
+            arguments.input_file_path, arguments.output_file_path
+        )
+        print(artifact)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)  # type: ignore
@@ -1,7 +1,4 @@
 import os
-import sys
-import numpy as np
-import pandas as pd
 
 """
 defining common constant variables for training pipeline
@@ -16,6 +13,31 @@ TEST_FILE_NAME: str = "test.csv"
 
 SCHEMA_FILE_PATH: str = os.path.join("data_schema", "schema.yaml")
 
+## Stage level cache of artifacts keyed on a hash of each stage's inputs
+STAGE_CACHE_DIR_NAME: str = "stage_cache"
+STAGE_CACHE_MAX_BYTES: int = 5 * 1024**3
+
+## File format of the DataFrame artifacts handed between stages:
+## "csv", "parquet", "feather", "npy" (structured array, memory-mappable) or
+## "packed" (one uint64 per row of ternary values)
+DATA_ARTIFACT_FORMAT: str = "csv"
+
+## Stages run as a DAG; finished stages are checkpointed so a failed run resumes
+## from its last good artifact. Independent nodes run on a thread pool
+PIPELINE_CHECKPOINT_DIR_NAME: str = "checkpoints"
+PIPELINE_CHECKPOINT_FILE_NAME: str = "pipeline_state.yaml"
+PIPELINE_MAX_WORKERS: int = 2
+
+## Per-run stage and I/O metrics, written as JSON and Prometheus text to the run's
+## artifact directory. METRICS_PROFILE_STAGE names one stage (e.g. "data_validation")
+## to profile with METRICS_PROFILE_MODE: "cprofile" or "tracemalloc"
+METRICS_DIR_NAME: str = "metrics"
+METRICS_FILE_NAME: str = "metrics.json"
+METRICS_PROMETHEUS_FILE_NAME: str = "metrics.prom"
+METRICS_PROFILE_DIR_NAME: str = "profiles"
+METRICS_PROFILE_STAGE: str | None = None
+METRICS_PROFILE_MODE: str = "cprofile"
+
 """
 Data Ingestion related constants start with DATA_INGESTION VAR NAME
 """
@@ -25,6 +47,26 @@ DATA_INGESTION_DIR_NAME: str = "data_ingestion"
 DATA_INGESTION_FEATURE_STORE_DIR: str = "feature_store"
 DATA_INGESTION_INGESTED_DIR: str = "ingested"
 DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO: float = 0.2
+## Field added by the ETL bulk loader to make reloads idempotent
+DATA_INGESTION_ROW_HASH_FIELD: str = "row_hash"
+## "random" shuffles the whole frame with a fixed seed, "hash" assigns every row
+## from a stable hash of its features so assignments survive new data
+DATA_INGESTION_SPLIT_STRATEGY: str = "random"
+## Hash split only: check that every Result class gets close to the split ratio
+## (rows are still assigned one by one and never move)
+DATA_INGESTION_SPLIT_STRATIFY: bool = False
+## "full" materialises every document before building the frame,
+## "streaming" fills typed column buffers batch by batch,
+## "sharded" reads _id ranges of the collection concurrently
+DATA_INGESTION_EXPORT_MODE: str = "streaming"
+DATA_INGESTION_EXPORT_BATCH_SIZE: int = 10_000
+DATA_INGESTION_EXPORT_NUM_SHARDS: int = 8
+DATA_INGESTION_EXPORT_MAX_WORKERS: int = 4
+## Incremental ingestion keeps its feature store and partitions outside the
+## timestamped run directories and only fetches documents past the watermark
+DATA_INGESTION_INCREMENTAL: bool = False
+DATA_INGESTION_INCREMENTAL_DIR_NAME: str = "incremental_ingestion"
+DATA_INGESTION_WATERMARK_FILE_NAME: str = "watermark.yaml"
 
 """
 Data Validation related constants start with DATA_VALIDATION VAR NAME
@@ -34,6 +76,9 @@ DATA_VALIDATION_VALID_DIR: str = "validated"
 DATA_VALIDATION_INVALID_DIR: str = "invalid"
 DATA_VALIDATION_DRIFT_REPORT_DIR: str = "drift_report"
 DATA_VALIDATION_DRIFT_REPORT_FILE_NAME: str = "report.yaml"
+DATA_VALIDATION_DRIFT_BASELINE_FILE_NAME: str = "baseline_sketch.yaml"
+## Threads used to build the drift histograms
+DATA_VALIDATION_DRIFT_N_JOBS: int = 4
 
 """
 Data Transformation related constants start with DATA_TRANSFORMATION VAR NAME
@@ -44,7 +89,65 @@ DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR: str = "transformed"
 DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR: str = "transformed_object"
 ## KNN Imputer to replace missing values
 DATA_TRANSFORMATION_IMPUTER_PARAMS: dict = {
-    "missing_values": np.nan,
+    "missing_values": float("nan"),
     "n_neighbors": 3,
     "weights": "uniform",
 }
+## "ternary_knn" gives the same values as sklearn's KNNImputer ("knn") but only
+## computes distances for rows with missing values
+DATA_TRANSFORMATION_IMPUTER: str = "ternary_knn"
+## Processes used to transform the train/test rows (1 = in process, -1 = all cores)
+DATA_TRANSFORMATION_N_JOBS: int = 1
+DATA_TRANSFORMATION_CHUNK_SIZE: int = 4096
+## Opt-in: identical training rows are collapsed into one row weighted by its count
+## before the imputer is fitted, and the weights are saved next to the transformed
+## train array. The weighted fit can pick other donors among equally distant rows
+## than the fit on every row; benchmarks/deduplication.py measures the difference
+DATA_TRANSFORMATION_DEDUPLICATE: bool = False
+DATA_TRANSFORMATION_TRAIN_WEIGHTS_FILE_NAME: str = "train_weights.npy"
+
+"""
+Batch prediction related constants start with BATCH_PREDICTION VAR NAME
+"""
+BATCH_PREDICTION_DIR_NAME: str = "prediction_output"
+## csv or parquet, the output is written chunk by chunk in this format
+BATCH_PREDICTION_OUTPUT_FILE_NAME: str = "output.csv"
+BATCH_PREDICTION_PREDICTION_COLUMN: str = "predicted_column"
+## Rows read, transformed and predicted per batch, and scoring processes (-1 = all cores)
+BATCH_PREDICTION_CHUNK_SIZE: int = 100_000
+BATCH_PREDICTION_N_JOBS: int = -1
+
+"""
+Online scoring service related constants start with SCORING_SERVICE VAR NAME
+"""
+SCORING_SERVICE_HOST: str = "127.0.0.1"
+SCORING_SERVICE_PORT: int = 8000
+## Concurrent requests are scored together: a batch closes when it holds
+## MAX_BATCH_SIZE rows or its first request has waited MAX_WAIT_MS
+SCORING_SERVICE_MAX_BATCH_SIZE: int = 256
+SCORING_SERVICE_MAX_WAIT_MS: float = 5.0
+## Latencies of the most recent requests kept for the p50/p99 report
+SCORING_SERVICE_LATENCY_WINDOW: int = 10_000
+SCORING_SERVICE_MAX_BODY_BYTES: int = 8 * 1024**2
+## Predictions of recently scored feature vectors, reused for identical rows
+## until the preprocessor or model changes; 0 disables the cache
+SCORING_SERVICE_CACHE_MAX_SIZE: int = 100_000
+
+"""
+Feature extraction related constants start with FEATURE_EXTRACTION VAR NAME
+"""
+FEATURE_EXTRACTION_DIR_NAME: str = "feature_extraction"
+## csv or parquet, the features are written chunk by chunk in this format
+FEATURE_EXTRACTION_FILE_NAME: str = "features.csv"
+## Input columns with the raw URL and the optional page HTML
+FEATURE_EXTRACTION_URL_COLUMN: str = "url"
+FEATURE_EXTRACTION_HTML_COLUMN: str = "html"
+FEATURE_EXTRACTION_CHUNK_SIZE: int = 100_000
+## Local csv of domain facts (see domain_resolver.DOMAIN_FACTS) serving the lookup
+## based features; without it and without DNS lookups those features are missing
+FEATURE_EXTRACTION_DOMAIN_FACTS_FILE_PATH: str | None = None
+FEATURE_EXTRACTION_RESOLVE_DNS: bool = False
+FEATURE_EXTRACTION_RESOLVER_MAX_WORKERS: int = 16
+## Resolved domains are cached, least recently used first out, for a day
+FEATURE_EXTRACTION_RESOLVER_CACHE_SIZE: int = 100_000
+FEATURE_EXTRACTION_RESOLVER_CACHE_TTL_SECONDS: float = 24 * 60 * 60
@@ -0,0 +1,191 @@
+import os
+import socket
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+## Facts a resolver may know about a domain. A fact it does not know is left out,
+## the feature built from it is then missing and imputed like any other NaN.
+##   dns_record         the domain has a DNS record (bool)
+##   age_days           days since the domain was registered
+##   registration_days  days until the registration expires
+##   traffic_rank       popularity rank of the site, 1 is the most visited and 0
+##                      means the site has no rank
+##   page_rank          PageRank of the site, between 0 and 1
+##   google_index       the site is in Google's index (bool)
+##   links_pointing     number of pages linking to the site
+##   reported           the domain or its IP is on a phishing report list (bool)
+DOMAIN_FACTS = (
+    "dns_record",
+    "age_days",
+    "registration_days",
+    "traffic_rank",
+    "page_rank",
+    "google_index",
+    "links_pointing",
+    "reported",
+)
+
+
+class DomainResolver(ABC):
+    """
+    Looks up facts about domains for the lookup based URL features. ``resolve``
+    takes a batch of domains and returns the known facts of each, see
+    DOMAIN_FACTS; domains it knows nothing about may be left out.
+    """
+
+    @abstractmethod
+    def resolve(self, domains: list) -> dict[str, dict]: ...
+
+
+class FileDomainResolver(DomainResolver):
+    """
+    Serves domain facts from a local csv file with a ``domain`` column and one
+    column per fact; empty cells are unknown. A stand-in for the online lookups
+    in offline runs and tests.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        try:
+            import pandas as pd
+
+            dataframe = pd.read_csv(file_path)
+            fact_columns = [name for name in DOMAIN_FACTS if name in dataframe.columns]
+            domains = dataframe["domain"].astype(str).str.strip().str.lower()
+            self.facts: dict[str, dict] = {}
+            for domain, row in zip(domains, dataframe[fact_columns].to_dict("records")):
+                self.facts[domain] = {
+                    name: value for name, value in row.items() if pd.notna(value)
+                }
+            logging.info(f"Loaded facts of {len(self.facts)} domains from {file_path}")
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def resolve(self, domains: list) -> dict[str, dict]:
+        return {
+            domain: self.facts[domain] for domain in domains if domain in self.facts
+        }
+
+
+class SocketDNSResolver(DomainResolver):
+    """
+    Resolves ``dns_record`` with the system resolver, ``max_workers`` lookups at
+    a time. A domain that does not resolve has no record; other socket errors
+    leave the fact unknown.
+    """
+
+    def __init__(self, max_workers: int = 16) -> None:
+        self.max_workers = max_workers
+
+    @staticmethod
+    def has_dns_record(domain: str) -> bool | None:
+        try:
+            socket.getaddrinfo(domain, None)
+            return True
+        except socket.gaierror:
+            return False
+        except (OSError, UnicodeError):
+            return None
+
+    def resolve(self, domains: list) -> dict[str, dict]:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            records = executor.map(self.has_dns_record, domains)
+            return {
+                domain: {"dns_record": record}
+                for domain, record in zip(domains, records)
+                if record is not None
+            }
+
+
+class CachedDomainResolver(DomainResolver):
+    """
+    Bounded LRU cache in front of another resolver. Entries expire
+    ``ttl_seconds`` after they were resolved; once ``max_size`` domains are
+    cached the least recently used one is dropped. Domains the resolver knows
+    nothing about are cached too, so they are not looked up again until they
+    expire. Only the misses of a batch reach the wrapped resolver.
+    """
+
+    def __init__(
+        self, resolver: DomainResolver, max_size: int, ttl_seconds: float
+    ) -> None:
+        self.resolver = resolver
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, domains: list) -> dict[str, dict]:
+        now = time.monotonic()
+        facts: dict[str, dict] = {}
+        missing = []
+        with self._lock:
+            for domain in domains:
+                entry = self._entries.get(domain)
+                if entry is not None and entry[0] > now:
+                    self._entries.move_to_end(domain)
+                    facts[domain] = entry[1]
+                else:
+                    missing.append(domain)
+            self.hits += len(facts)
+            self.misses += len(missing)
+        if not missing:
+            return facts
+
+        ## Looked up outside the lock, a slow resolver does not block cache hits
+        try:
+            resolved = self.resolver.resolve(missing)
+        except Exception as e:
+            logging.warning(
+                f"{type(self.resolver).__name__} failed for {len(missing)} "
+                f"domains, their facts are unknown: {e}"
+            )
+            return facts
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            for domain in missing:
+                facts[domain] = resolved.get(domain, {})
+                self._entries[domain] = (expires_at, facts[domain])
+                self._entries.move_to_end(domain)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return facts
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def get_domain_resolvers(
+    domain_facts_file_path: str | None,
+    resolve_dns: bool,
+    cache_max_size: int,
+    cache_ttl_seconds: float,
+    max_workers: int = 16,
+) -> list[CachedDomainResolver]:
+    """
+    Builds the configured resolvers, each behind its own cache.
+    """
+    resolvers: list[DomainResolver] = []
+    if domain_facts_file_path and os.path.exists(domain_facts_file_path):
+        resolvers.append(FileDomainResolver(domain_facts_file_path))
+    elif domain_facts_file_path:
+        logging.warning(f"Domain facts file {domain_facts_file_path} not found")
+    if resolve_dns:
+        resolvers.append(SocketDNSResolver(max_workers))
+    return [
+        CachedDomainResolver(resolver, cache_max_size, cache_ttl_seconds)
+        for resolver in resolvers
+    ]
@@ -0,0 +1,110 @@
+import os
+import sys
+import threading
+
+from dotenv import load_dotenv
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+load_dotenv()
+
+MONGO_DB_URL = os.getenv("MONGO_DB_URL")
+
+## Client settings, each overridable through the environment
+MONGO_DB_MAX_POOL_SIZE: int = int(os.getenv("MONGO_DB_MAX_POOL_SIZE", "50"))
+MONGO_DB_MIN_POOL_SIZE: int = int(os.getenv("MONGO_DB_MIN_POOL_SIZE", "0"))
+MONGO_DB_SERVER_SELECTION_TIMEOUT_MS: int = int(
+    os.getenv("MONGO_DB_SERVER_SELECTION_TIMEOUT_MS", "30000")
+)
+MONGO_DB_CONNECT_TIMEOUT_MS: int = int(
+    os.getenv("MONGO_DB_CONNECT_TIMEOUT_MS", "20000")
+)
+MONGO_DB_SOCKET_TIMEOUT_MS: int | None = (
+    int(os.environ["MONGO_DB_SOCKET_TIMEOUT_MS"])
+    if os.getenv("MONGO_DB_SOCKET_TIMEOUT_MS")
+    else None
+)
+MONGO_DB_READ_PREFERENCE: str = os.getenv("MONGO_DB_READ_PREFERENCE", "primary")
+## Wire compression, e.g. "zstd,zlib"; off unless set, the server must support it
+MONGO_DB_COMPRESSORS: str | None = os.getenv("MONGO_DB_COMPRESSORS") or None
+
+## One client per connection string, built by and for the process _clients_pid
+_clients: dict = {}
+_clients_pid = None
+_client_lock = threading.Lock()
+
+
+def get_mongo_client_options(mongo_db_url: str | None) -> dict:
+    """
+    Returns the keyword arguments used to build the shared client.
+    """
+    options = {
+        "maxPoolSize": MONGO_DB_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_DB_MIN_POOL_SIZE,
+        "serverSelectionTimeoutMS": MONGO_DB_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": MONGO_DB_CONNECT_TIMEOUT_MS,
+        "socketTimeoutMS": MONGO_DB_SOCKET_TIMEOUT_MS,
+        "readPreference": MONGO_DB_READ_PREFERENCE,
+    }
+    if MONGO_DB_COMPRESSORS:
+        options["compressors"] = MONGO_DB_COMPRESSORS
+    ## Atlas (mongodb+srv) connections use TLS, verify them against certifi's bundle
+    if mongo_db_url and mongo_db_url.startswith("mongodb+srv://"):
+        import certifi
+
+        options["tlsCAFile"] = certifi.where()
+    return options
+
+
+def get_mongo_client(mongo_db_url: str | None = None) -> "pymongo.MongoClient":
+    """
+    Returns the process-wide MongoClient for ``mongo_db_url`` (MONGO_DB_URL by
+    default), creating it on first use.
+
+    A client owns a connection pool and is thread safe, so every caller in the
+    process asking for the same URL shares it; another URL gets its own client. A
+    client must not be used across fork, so a child process (e.g. a process-pool
+    worker) transparently builds its own on first use.
+    """
+    global _clients, _clients_pid
+    try:
+        mongo_db_url = mongo_db_url or MONGO_DB_URL
+        if _clients_pid == os.getpid() and mongo_db_url in _clients:
+            return _clients[mongo_db_url]
+        with _client_lock:
+            if _clients_pid != os.getpid():
+                _clients, _clients_pid = {}, os.getpid()
+            if mongo_db_url not in _clients:
+                import pymongo
+
+                _clients[mongo_db_url] = pymongo.MongoClient(
+                    mongo_db_url, **get_mongo_client_options(mongo_db_url)
+                )
+                logging.info(f"Created MongoClient for process {_clients_pid}")
+            return _clients[mongo_db_url]
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)  # type: ignore
+
+
+def close_mongo_client() -> None:
+    """
+    Closes the shared clients of this process, e.g. at the end of a long-running job.
+    """
+    global _clients, _clients_pid
+    with _client_lock:
+        if _clients_pid == os.getpid():
+            for client in _clients.values():
+                client.close()
+        _clients, _clients_pid = {}, None
+
+
+def _forget_client_after_fork() -> None:
+    ## The parent's sockets belong to the parent: drop the reference without closing
+    global _clients, _clients_pid, _client_lock
+    _clients, _clients_pid = {}, None
+    _client_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_client_after_fork)
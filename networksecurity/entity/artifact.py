@@ -1,30 +1,70 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Any
+
 
 @dataclass
 class DataIngestionArtifact:
     """
     Data Ingestion Artifact class to hold the artifacts related to data ingestion.
+    The optional DataFrames let the next stage skip re-reading the files.
     """
+
     train_file_path: str
     test_file_path: str
+    train_dataframe: Any = field(default=None, repr=False, compare=False)
+    test_dataframe: Any = field(default=None, repr=False, compare=False)
+
 
 @dataclass
 class DataValidationArtifact:
     """
     Data Validation Artifact class to hold the artifacts related to data validation.
+    The optional DataFrames let the next stage skip re-reading the files.
     """
+
     validation_status: bool
     valid_train_file_path: str
     valid_test_file_path: str
     invalid_train_file_path: str | None
     invalid_test_file_path: str | None
     drift_report_file_path: str
+    drift_baseline_file_path: str | None = None
+    valid_train_dataframe: Any = field(default=None, repr=False, compare=False)
+    valid_test_dataframe: Any = field(default=None, repr=False, compare=False)
+
 
 @dataclass
 class DataTransformationArtifact:
     """
     Data Transformation Artifact class to hold the artifacts related to data transformation.
+    The optional arrays hold the transformed data in memory. When the training rows
+    were deduplicated each transformed train row has its count in the weights.
     """
+
     transformed_train_file_path: str
     transformed_test_file_path: str
     transformed_object_file_path: str
+    transformed_train_weights_file_path: str | None = None
+    transformed_train_array: Any = field(default=None, repr=False, compare=False)
+    transformed_test_array: Any = field(default=None, repr=False, compare=False)
+    transformed_train_weights: Any = field(default=None, repr=False, compare=False)
+
+
+@dataclass
+class BatchPredictionArtifact:
+    """
+    Batch Prediction Artifact class to hold the artifacts related to batch prediction.
+    """
+
+    output_file_path: str
+    n_rows: int
+
+
+@dataclass
+class FeatureExtractionArtifact:
+    """
+    Feature Extraction Artifact class to hold the artifacts related to feature extraction.
+    """
+
+    feature_file_path: str
+    n_rows: int
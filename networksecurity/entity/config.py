@@ -3,6 +3,13 @@ import os
 from networksecurity.constants import training_pipeline
 
 
+def get_artifact_file_name(file_name: str) -> str:
+    """
+    Swaps the extension of a DataFrame artifact for the configured artifact format.
+    """
+    return f"{os.path.splitext(file_name)[0]}.{training_pipeline.DATA_ARTIFACT_FORMAT}"
+
+
 class TrainingPipelineConfig:
     def __init__(self, timestamp=datetime.now()) -> None:
         timestamp = timestamp.strftime("%m_%d_%Y_%H_%M_%S")
@@ -12,6 +19,44 @@ class TrainingPipelineConfig:
         self.timestamp: str = timestamp
 
 
+class StageCacheConfig:
+    def __init__(self, training_pipeline_config: TrainingPipelineConfig) -> None:
+        self.cache_dir: str = os.path.join(
+            training_pipeline_config.artifact_name,
+            training_pipeline.STAGE_CACHE_DIR_NAME,
+        )
+        self.max_bytes: int = training_pipeline.STAGE_CACHE_MAX_BYTES
+
+
+class PipelineCheckpointConfig:
+    def __init__(self, training_pipeline_config: TrainingPipelineConfig) -> None:
+        self.checkpoint_file_path: str = os.path.join(
+            training_pipeline_config.artifact_name,
+            training_pipeline.PIPELINE_CHECKPOINT_DIR_NAME,
+            training_pipeline.PIPELINE_CHECKPOINT_FILE_NAME,
+        )
+        self.max_workers: int = training_pipeline.PIPELINE_MAX_WORKERS
+
+
+class MetricsConfig:
+    def __init__(self, training_pipeline_config: TrainingPipelineConfig) -> None:
+        self.metrics_dir: str = os.path.join(
+            training_pipeline_config.artifact_dir,
+            training_pipeline.METRICS_DIR_NAME,
+        )
+        self.metrics_file_path: str = os.path.join(
+            self.metrics_dir, training_pipeline.METRICS_FILE_NAME
+        )
+        self.prometheus_file_path: str = os.path.join(
+            self.metrics_dir, training_pipeline.METRICS_PROMETHEUS_FILE_NAME
+        )
+        self.profile_dir: str = os.path.join(
+            self.metrics_dir, training_pipeline.METRICS_PROFILE_DIR_NAME
+        )
+        self.profile_stage: str | None = training_pipeline.METRICS_PROFILE_STAGE
+        self.profile_mode: str = training_pipeline.METRICS_PROFILE_MODE
+
+
 class DataIngestionConfig:
     def __init__(self, training_pipeline_config: TrainingPipelineConfig) -> None:
         self.data_ingestion_dir: str = os.path.join(
@@ -21,23 +66,55 @@ class DataIngestionConfig:
         self.feature_store_file_path: str = os.path.join(
             self.data_ingestion_dir,
             training_pipeline.DATA_INGESTION_FEATURE_STORE_DIR,
-            training_pipeline.FILE_NAME,
+            get_artifact_file_name(training_pipeline.FILE_NAME),
         )
         self.training_file_path: str = os.path.join(
             self.data_ingestion_dir,
             training_pipeline.DATA_INGESTION_INGESTED_DIR,
-            training_pipeline.TRAIN_FILE_NAME,
+            get_artifact_file_name(training_pipeline.TRAIN_FILE_NAME),
         )
         self.testing_file_path: str = os.path.join(
             self.data_ingestion_dir,
             training_pipeline.DATA_INGESTION_INGESTED_DIR,
-            training_pipeline.TEST_FILE_NAME,
+            get_artifact_file_name(training_pipeline.TEST_FILE_NAME),
         )
         self.train_test_split_ratio: float = (
             training_pipeline.DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO
         )
+        self.split_strategy: str = training_pipeline.DATA_INGESTION_SPLIT_STRATEGY
+        self.split_stratify: bool = training_pipeline.DATA_INGESTION_SPLIT_STRATIFY
         self.collection_name: str = training_pipeline.DATA_INGESTION_COLLECTION_NAME
         self.database_name: str = training_pipeline.DATA_INGESTION_DATABASE_NAME
+        self.export_mode: str = training_pipeline.DATA_INGESTION_EXPORT_MODE
+        self.export_batch_size: int = training_pipeline.DATA_INGESTION_EXPORT_BATCH_SIZE
+        self.export_num_shards: int = training_pipeline.DATA_INGESTION_EXPORT_NUM_SHARDS
+        self.export_max_workers: int = (
+            training_pipeline.DATA_INGESTION_EXPORT_MAX_WORKERS
+        )
+        self.incremental: bool = training_pipeline.DATA_INGESTION_INCREMENTAL
+        self.incremental_dir: str = os.path.join(
+            training_pipeline_config.artifact_name,
+            training_pipeline.DATA_INGESTION_INCREMENTAL_DIR_NAME,
+        )
+        self.incremental_feature_store_file_path: str = os.path.join(
+            self.incremental_dir,
+            training_pipeline.DATA_INGESTION_FEATURE_STORE_DIR,
+            training_pipeline.FILE_NAME,
+        )
+        self.incremental_training_file_path: str = os.path.join(
+            self.incremental_dir,
+            training_pipeline.DATA_INGESTION_INGESTED_DIR,
+            training_pipeline.TRAIN_FILE_NAME,
+        )
+        self.incremental_testing_file_path: str = os.path.join(
+            self.incremental_dir,
+            training_pipeline.DATA_INGESTION_INGESTED_DIR,
+            training_pipeline.TEST_FILE_NAME,
+        )
+        self.watermark_file_path: str = os.path.join(
+            self.incremental_dir,
+            training_pipeline.DATA_INGESTION_WATERMARK_FILE_NAME,
+        )
 
 
 class DataValidationConfig:
@@ -56,25 +133,30 @@ class DataValidationConfig:
         )
         self.valid_train_file_path: str = os.path.join(
             self.valid_data_dir,
-            training_pipeline.TRAIN_FILE_NAME,
+            get_artifact_file_name(training_pipeline.TRAIN_FILE_NAME),
         )
         self.valid_test_file_path: str = os.path.join(
             self.valid_data_dir,
-            training_pipeline.TEST_FILE_NAME,
+            get_artifact_file_name(training_pipeline.TEST_FILE_NAME),
         )
         self.invalid_train_file_path: str = os.path.join(
             self.invalid_data_dir,
-            training_pipeline.TRAIN_FILE_NAME,
+            get_artifact_file_name(training_pipeline.TRAIN_FILE_NAME),
         )
         self.invalid_test_file_path: str = os.path.join(
             self.invalid_data_dir,
-            training_pipeline.TEST_FILE_NAME,
+            get_artifact_file_name(training_pipeline.TEST_FILE_NAME),
         )
         self.drift_report_file_path: str = os.path.join(
             self.data_validation_dir,
             training_pipeline.DATA_VALIDATION_DRIFT_REPORT_DIR,
             training_pipeline.DATA_VALIDATION_DRIFT_REPORT_FILE_NAME,
         )
+        self.drift_baseline_file_path: str = os.path.join(
+            self.data_validation_dir,
+            training_pipeline.DATA_VALIDATION_DRIFT_REPORT_DIR,
+            training_pipeline.DATA_VALIDATION_DRIFT_BASELINE_FILE_NAME,
+        )
 
 
 class DataTransformationConfig:
@@ -98,3 +180,74 @@ class DataTransformationConfig:
             training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_OBJECT_DIR,
             training_pipeline.PREPROCESSING_OBJECT_FILE_NAME,
         )
+        self.transformed_train_weights_file_path: str = os.path.join(
+            self.data_transformation_dir,
+            training_pipeline.DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
+            training_pipeline.DATA_TRANSFORMATION_TRAIN_WEIGHTS_FILE_NAME,
+        )
+        self.n_jobs: int = training_pipeline.DATA_TRANSFORMATION_N_JOBS
+        self.chunk_size: int = training_pipeline.DATA_TRANSFORMATION_CHUNK_SIZE
+        self.deduplicate: bool = training_pipeline.DATA_TRANSFORMATION_DEDUPLICATE
+
+
+class BatchPredictionConfig:
+    def __init__(self, training_pipeline_config: TrainingPipelineConfig) -> None:
+        self.preprocessor_file_path: str = DataTransformationConfig(
+            training_pipeline_config
+        ).transformed_object_file_path
+        ## No stage trains a model yet: the transformed features are written
+        ## unless a model file is given
+        self.model_file_path: str | None = None
+        self.prediction_dir: str = training_pipeline.BATCH_PREDICTION_DIR_NAME
+        self.output_file_path: str = os.path.join(
+            self.prediction_dir, training_pipeline.BATCH_PREDICTION_OUTPUT_FILE_NAME
+        )
+        self.prediction_column: str = (
+            training_pipeline.BATCH_PREDICTION_PREDICTION_COLUMN
+        )
+        self.chunk_size: int = training_pipeline.BATCH_PREDICTION_CHUNK_SIZE
+        self.n_jobs: int = training_pipeline.BATCH_PREDICTION_N_JOBS
+
+
+class ScoringServiceConfig:
+    def __init__(self, training_pipeline_config: TrainingPipelineConfig) -> None:
+        self.preprocessor_file_path: str = DataTransformationConfig(
+            training_pipeline_config
+        ).transformed_object_file_path
+        ## No stage trains a model yet: the transformed features are served
+        ## unless a model file is given
+        self.model_file_path: str | None = None
+        self.host: str = training_pipeline.SCORING_SERVICE_HOST
+        self.port: int = training_pipeline.SCORING_SERVICE_PORT
+        self.max_batch_size: int = training_pipeline.SCORING_SERVICE_MAX_BATCH_SIZE
+        self.max_wait_ms: float = training_pipeline.SCORING_SERVICE_MAX_WAIT_MS
+        self.latency_window: int = training_pipeline.SCORING_SERVICE_LATENCY_WINDOW
+        self.max_body_bytes: int = training_pipeline.SCORING_SERVICE_MAX_BODY_BYTES
+        self.cache_max_size: int = training_pipeline.SCORING_SERVICE_CACHE_MAX_SIZE
+
+
+class FeatureExtractionConfig:
+    def __init__(self, training_pipeline_config: TrainingPipelineConfig) -> None:
+        self.feature_extraction_dir: str = os.path.join(
+            training_pipeline_config.artifact_dir,
+            training_pipeline.FEATURE_EXTRACTION_DIR_NAME,
+        )
+        self.feature_file_path: str = os.path.join(
+            self.feature_extraction_dir, training_pipeline.FEATURE_EXTRACTION_FILE_NAME
+        )
+        self.url_column: str = training_pipeline.FEATURE_EXTRACTION_URL_COLUMN
+        self.html_column: str = training_pipeline.FEATURE_EXTRACTION_HTML_COLUMN
+        self.chunk_size: int = training_pipeline.FEATURE_EXTRACTION_CHUNK_SIZE
+        self.domain_facts_file_path: str | None = (
+            training_pipeline.FEATURE_EXTRACTION_DOMAIN_FACTS_FILE_PATH
+        )
+        self.resolve_dns: bool = training_pipeline.FEATURE_EXTRACTION_RESOLVE_DNS
+        self.resolver_max_workers: int = (
+            training_pipeline.FEATURE_EXTRACTION_RESOLVER_MAX_WORKERS
+        )
+        self.resolver_cache_size: int = (
+            training_pipeline.FEATURE_EXTRACTION_RESOLVER_CACHE_SIZE
+        )
+        self.resolver_cache_ttl_seconds: float = (
+            training_pipeline.FEATURE_EXTRACTION_RESOLVER_CACHE_TTL_SECONDS
+        )
@@ -1,17 +1,212 @@
-import os
+import atexit
+import json
 import logging
-from datetime import datetime
+import logging.handlers
+import multiprocessing
+import os
+import queue
+import threading
+from datetime import datetime, timezone
 
 LOG_FILE = f"{datetime.now().strftime('%m_%d_%y_%H_%M_%S')}.log"
 
-logs_path = os.path.join(os.getcwd(), "logs", LOG_FILE)
-os.makedirs(logs_path, exist_ok=True)
+logs_dir = os.path.join(os.getcwd(), "logs")
+
+LOG_FILE_PATH = os.path.join(logs_dir, LOG_FILE)
+
+## Root level and per-logger levels, overridable with NETWORKSECURITY_LOG_LEVEL and
+## NETWORKSECURITY_LOG_LEVELS="pymongo=WARNING,networksecurity=DEBUG"
+DEFAULT_LOG_LEVEL = "INFO"
+DEFAULT_LOGGER_LEVELS = {
+    "pymongo": "WARNING",
+    "urllib3": "WARNING",
+    "asyncio": "WARNING",
+}
+
+## Attributes every LogRecord has, anything else was passed with ``extra=``
+STANDARD_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {
+    "message",
+    "asctime",
+    "taskName",
+}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats a record as one JSON object per line, including ``extra`` fields.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "lineno": record.lineno,
+            "process": record.process,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in STANDARD_RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class LogFileHandler(logging.FileHandler):
+    """
+    FileHandler that creates the logs directory with the file, on the first
+    emitted record, so importing the package leaves the working directory as is.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        super().__init__(file_path, delay=True)
+        self.setFormatter(JsonFormatter())
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Puts records on an in-process queue as they are, so message formatting and
+    file I/O happen on the listener thread instead of the caller's.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def parse_logger_levels(value: str | None) -> dict[str, str]:
+    levels = {}
+    for item in (value or "").split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+class LoggingBackend:
+    """
+    Queue based logging: callers only enqueue records, a QueueListener thread
+    formats them as JSON and appends them to LOG_FILE_PATH. Worker processes send
+    their records over ``get_worker_queue`` to the same file.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.file_handler: logging.Handler | None = None
+        self.listener: logging.handlers.QueueListener | None = None
+        self.worker_queue = None
+        self.worker_listener: logging.handlers.QueueListener | None = None
+
+    def start(self) -> None:
+        with self._lock:
+            if self.listener is not None:
+                return
+            self.file_handler = LogFileHandler(LOG_FILE_PATH)
+            record_queue: queue.SimpleQueue = queue.SimpleQueue()
+            self.listener = logging.handlers.QueueListener(
+                record_queue, self.file_handler, respect_handler_level=True
+            )
+            self.listener.start()
+            root = logging.getLogger()
+            root.addHandler(DeferredQueueHandler(record_queue))
+            apply_log_levels()
+            atexit.register(self.stop)
+
+    def get_worker_queue(self):
+        """
+        Returns a multiprocessing queue that worker processes log into, see
+        configure_worker_logging.
+        """
+        with self._lock:
+            if self.worker_queue is None:
+                self.worker_queue = multiprocessing.get_context("spawn").Queue()
+                handlers = [self.file_handler] if self.file_handler else []
+                self.worker_listener = logging.handlers.QueueListener(
+                    self.worker_queue, *handlers, respect_handler_level=True
+                )
+                self.worker_listener.start()
+            return self.worker_queue
+
+    def stop(self) -> None:
+        """
+        Drains the queues and closes the log file.
+        """
+        with self._lock:
+            for listener in (self.worker_listener, self.listener):
+                if listener is not None:
+                    listener.stop()
+            self.listener = self.worker_listener = None
+            if self.file_handler is not None:
+                self.file_handler.close()
+
+    def after_fork_in_child(self) -> None:
+        """
+        A forked child has no listener thread, so it logs through the worker queue
+        when one exists and otherwise appends to the log file directly.
+        """
+        self._lock = threading.Lock()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if isinstance(handler, DeferredQueueHandler):
+                root.removeHandler(handler)
+        if self.worker_queue is not None:
+            root.addHandler(logging.handlers.QueueHandler(self.worker_queue))
+        elif self.file_handler is not None:
+            root.addHandler(LogFileHandler(LOG_FILE_PATH))
+        self.listener = self.worker_listener = None
+
+
+def apply_log_levels() -> None:
+    """
+    Sets the root level and the per-logger levels. Disabled levels are rejected
+    by the logger's cached level check before a record is created.
+    """
+    logging.getLogger().setLevel(
+        os.getenv("NETWORKSECURITY_LOG_LEVEL", DEFAULT_LOG_LEVEL).upper()
+    )
+    levels = {
+        **DEFAULT_LOGGER_LEVELS,
+        **parse_logger_levels(os.getenv("NETWORKSECURITY_LOG_LEVELS")),
+    }
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level)
+
+
+def configure_worker_logging(worker_queue) -> None:
+    """
+    Initializer for worker processes: sends their records to the parent's log file
+    through the queue returned by get_worker_log_queue.
+    """
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    ## The plain QueueHandler formats the message in the worker, so records pickle
+    root.addHandler(logging.handlers.QueueHandler(worker_queue))
+    apply_log_levels()
+
+
+backend = LoggingBackend()
+
 
-LOG_FILE_PATH = os.path.join(logs_path, LOG_FILE)
+def get_worker_log_queue():
+    return backend.get_worker_queue()
 
-logging.basicConfig(
-    filename=LOG_FILE_PATH,
-    level=logging.INFO,
-    format="[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s",
-)
 
+## Spawned worker processes (named e.g. "SpawnProcess-1" while they import modules)
+## are configured by their initializer instead
+if multiprocessing.current_process().name == "MainProcess":
+    backend.start()
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=backend.after_fork_in_child)
@@ -0,0 +1,340 @@
+import contextvars
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+## Stage the current thread is working for, I/O is attributed to it
+_current_stage: contextvars.ContextVar = contextvars.ContextVar(
+    "metrics_stage", default=None
+)
+## Set while an instrumented I/O helper runs, so nested helpers are not counted twice
+_inside_io: contextvars.ContextVar = contextvars.ContextVar(
+    "metrics_inside_io", default=False
+)
+
+PROMETHEUS_PREFIX = "networksecurity"
+PROFILE_TOP_ENTRIES = 40
+
+
+def get_rss_bytes() -> int:
+    """
+    Current resident set size of the process, 0 when it cannot be read.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def get_peak_rss_bytes() -> int:
+    """
+    Highest resident set size the process reached so far, 0 when unknown.
+    """
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    ## Linux reports KiB, macOS bytes
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+@dataclass
+class StageMetrics:
+    name: str
+    calls: int = 0
+    duration_seconds: float = 0.0
+    rows: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    rss_delta_bytes: int = 0
+    peak_rss_bytes: int = 0
+    traced_peak_bytes: int | None = None
+
+
+@dataclass
+class IOMetrics:
+    name: str
+    calls: int = 0
+    duration_seconds: float = 0.0
+    rows: int = 0
+    bytes: int = 0
+
+
+class MetricsRegistry:
+    """
+    Process wide, thread safe store of per-stage and per-I/O-helper metrics.
+
+    Stages are timed with ``track`` (or the ``track_stage`` decorator) and the
+    instrumented I/O helpers add the rows and bytes they move to the stage the
+    calling context works for. ``peak_rss_bytes`` is the process high-water mark
+    when the stage finished. One stage can be profiled with cProfile or
+    tracemalloc, see ``configure``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.stages: dict[str, StageMetrics] = {}
+        self.io: dict[str, IOMetrics] = {}
+        self.profile_stage: str | None = None
+        self.profile_mode: str = "cprofile"
+        self.profile_dir: str | None = None
+
+    def configure(
+        self,
+        profile_stage: str | None = None,
+        profile_mode: str = "cprofile",
+        profile_dir: str | None = None,
+    ) -> None:
+        """
+        Profiles ``profile_stage`` with "cprofile" or "tracemalloc" and writes the
+        results to ``profile_dir``. cProfile only sees the thread running the
+        stage.
+        """
+        if profile_mode not in ("cprofile", "tracemalloc"):
+            raise ValueError(f"Unsupported profile mode: {profile_mode}")
+        self.profile_stage = profile_stage
+        self.profile_mode = profile_mode
+        self.profile_dir = profile_dir
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stages = {}
+            self.io = {}
+
+    def add_to_stage(self, name: str, **amounts) -> None:
+        with self._lock:
+            stage = self.stages.setdefault(name, StageMetrics(name=name))
+            for key, value in amounts.items():
+                setattr(stage, key, getattr(stage, key) + value)
+
+    def record_rows(self, rows: int) -> None:
+        """
+        Adds rows processed to the stage the calling context works for.
+        """
+        stage_name = _current_stage.get()
+        if stage_name is not None:
+            self.add_to_stage(stage_name, rows=int(rows))
+
+    def record_io(
+        self, name: str, direction: str, duration: float, n_bytes: int, rows: int
+    ) -> None:
+        with self._lock:
+            helper = self.io.setdefault(name, IOMetrics(name=name))
+            helper.calls += 1
+            helper.duration_seconds += duration
+            helper.bytes += n_bytes
+            helper.rows += rows
+        stage_name = _current_stage.get()
+        if stage_name is not None:
+            self.add_to_stage(stage_name, **{f"bytes_{direction}": n_bytes})
+
+    @contextmanager
+    def track(self, name: str):
+        """
+        Times the enclosed block as stage ``name`` and attributes the I/O done
+        inside it, including work handed to context-propagating pools, to it.
+        """
+        token = _current_stage.set(name)
+        profile_mode = self.profile_mode if name == self.profile_stage else None
+        profiler = None
+        if profile_mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+        elif profile_mode == "tracemalloc":
+            tracemalloc.start()
+        rss_before = get_rss_bytes()
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - started_at
+            traced_peak = None
+            if profiler is not None:
+                profiler.disable()
+                self.save_cprofile(name, profiler)
+            elif profile_mode == "tracemalloc":
+                traced_peak = tracemalloc.get_traced_memory()[1]
+                self.save_tracemalloc(name, tracemalloc.take_snapshot())
+                tracemalloc.stop()
+            _current_stage.reset(token)
+            self.add_to_stage(
+                name,
+                calls=1,
+                duration_seconds=duration,
+                rss_delta_bytes=get_rss_bytes() - rss_before,
+            )
+            with self._lock:
+                stage = self.stages[name]
+                stage.peak_rss_bytes = max(stage.peak_rss_bytes, get_peak_rss_bytes())
+                if traced_peak is not None:
+                    stage.traced_peak_bytes = traced_peak
+
+    def get_profile_file_path(self, name: str, extension: str) -> str | None:
+        if self.profile_dir is None:
+            return None
+        os.makedirs(self.profile_dir, exist_ok=True)
+        return os.path.join(self.profile_dir, f"{name}.{extension}")
+
+    def save_cprofile(self, name: str, profiler: cProfile.Profile) -> None:
+        stats_file_path = self.get_profile_file_path(name, "prof")
+        if stats_file_path is None:
+            return
+        profiler.dump_stats(stats_file_path)
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(
+            PROFILE_TOP_ENTRIES
+        )
+        with open(stats_file_path[: -len("prof")] + "txt", "w") as file_obj:
+            file_obj.write(summary.getvalue())
+
+    def save_tracemalloc(self, name: str, snapshot: tracemalloc.Snapshot) -> None:
+        summary_file_path = self.get_profile_file_path(name, "tracemalloc.txt")
+        if summary_file_path is None:
+            return
+        with open(summary_file_path, "w") as file_obj:
+            for statistic in snapshot.statistics("lineno")[:PROFILE_TOP_ENTRIES]:
+                file_obj.write(f"{statistic}\n")
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "stages": {name: asdict(stage) for name, stage in self.stages.items()},
+                "io": {name: asdict(helper) for name, helper in self.io.items()},
+            }
+
+    def to_prometheus(self) -> str:
+        """
+        Renders the metrics in the Prometheus text exposition format.
+        """
+        content = self.to_dict()
+        lines = []
+        for group, label, fields in (
+            (
+                "stage",
+                "stage",
+                [
+                    ("calls", "calls_total", "counter"),
+                    ("duration_seconds", "duration_seconds", "gauge"),
+                    ("rows", "rows_total", "counter"),
+                    ("bytes_read", "bytes_read_total", "counter"),
+                    ("bytes_written", "bytes_written_total", "counter"),
+                    ("rss_delta_bytes", "rss_delta_bytes", "gauge"),
+                    ("peak_rss_bytes", "peak_rss_bytes", "gauge"),
+                    ("traced_peak_bytes", "traced_peak_bytes", "gauge"),
+                ],
+            ),
+            (
+                "io",
+                "helper",
+                [
+                    ("calls", "calls_total", "counter"),
+                    ("duration_seconds", "duration_seconds", "gauge"),
+                    ("rows", "rows_total", "counter"),
+                    ("bytes", "bytes_total", "counter"),
+                ],
+            ),
+        ):
+            records = content["stages" if group == "stage" else "io"]
+            for field_name, metric_suffix, metric_type in fields:
+                metric_name = f"{PROMETHEUS_PREFIX}_{group}_{metric_suffix}"
+                samples = [
+                    f'{metric_name}{{{label}="{name}"}} {record[field_name]}'
+                    for name, record in records.items()
+                    if record[field_name] is not None
+                ]
+                if samples:
+                    lines.append(f"# TYPE {metric_name} {metric_type}")
+                    lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    def export(self, json_file_path: str, prometheus_file_path: str | None = None):
+        """
+        Writes the metrics as JSON and, optionally, in Prometheus text format.
+        """
+        os.makedirs(os.path.dirname(json_file_path), exist_ok=True)
+        with open(json_file_path, "w") as file_obj:
+            json.dump(self.to_dict(), file_obj, indent=2)
+        if prometheus_file_path is not None:
+            with open(prometheus_file_path, "w") as file_obj:
+                file_obj.write(self.to_prometheus())
+
+
+metrics = MetricsRegistry()
+
+
+def track_stage(name: str):
+    """
+    Decorator timing every call of the function as stage ``name``.
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with metrics.track(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def count_rows(data) -> int:
+    shape = getattr(data, "shape", None)
+    return int(shape[0]) if shape else 0
+
+
+def track_io(direction: str):
+    """
+    Decorator for I/O helpers taking ``file_path`` first. Records the call time,
+    the file size and the rows of the DataFrame or array written (second
+    argument) or read (return value).
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _inside_io.get():
+                return function(*args, **kwargs)
+            token = _inside_io.set(True)
+            started_at = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                _inside_io.reset(token)
+            duration = time.perf_counter() - started_at
+            file_path = kwargs.get("file_path", args[0] if args else None)
+            try:
+                n_bytes = os.path.getsize(file_path) if file_path else 0
+            except OSError:
+                n_bytes = 0
+            if direction == "written":
+                data = (
+                    args[1]
+                    if len(args) > 1
+                    else next(
+                        (value for key, value in kwargs.items() if key != "file_path"),
+                        None,
+                    )
+                )
+                rows = count_rows(data)
+            else:
+                rows = count_rows(result)
+            metrics.record_io(function.__name__, direction, duration, n_bytes, rows)
+            return result
+
+        return wrapper
+
+    return decorator
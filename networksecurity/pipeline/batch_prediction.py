@@ -0,0 +1,398 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.constants.training_pipeline import (
+    BATCH_PREDICTION_DIR_NAME,
+    DATA_TRANSFORMATION_DIR_NAME,
+    TARGET_COLUMN,
+)
+from networksecurity.entity.artifact import BatchPredictionArtifact
+from networksecurity.entity.config import (
+    BatchPredictionConfig,
+    DataTransformationConfig,
+    PipelineCheckpointConfig,
+    TrainingPipelineConfig,
+)
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import (
+    configure_worker_logging,
+    get_worker_log_queue,
+    logging,
+)
+from networksecurity.logging.metrics import metrics, track_stage
+from networksecurity.pipeline.dag_executor import DAGExecutor
+from networksecurity.utils.main_utils.utils import load_object
+
+## Per worker process state, set up once by init_prediction_worker
+_worker_state: dict = {}
+
+
+def get_latest_preprocessor_file_path(
+    training_pipeline_config: TrainingPipelineConfig,
+) -> str | None:
+    """
+    Returns the preprocessor of the last training run when its checkpoint says
+    it succeeded, otherwise the one of the most recent timestamped run directory
+    that holds one, or None when no run has fitted a preprocessor yet.
+    """
+    checkpoint = DAGExecutor.read_checkpoint(
+        PipelineCheckpointConfig(training_pipeline_config).checkpoint_file_path
+    )
+    if checkpoint and checkpoint.get("status") == "succeeded":
+        fields = checkpoint.get("nodes", {}).get(DATA_TRANSFORMATION_DIR_NAME, {})
+        file_path = fields.get("transformed_object_file_path")
+        if file_path and os.path.exists(file_path):
+            return file_path
+
+    artifact_name = training_pipeline_config.artifact_name
+    runs = []
+    for name in os.listdir(artifact_name) if os.path.isdir(artifact_name) else []:
+        try:
+            runs.append((datetime.strptime(name, "%m_%d_%Y_%H_%M_%S"), name))
+        except ValueError:
+            continue
+    for _, name in sorted(runs, reverse=True):
+        run_config = TrainingPipelineConfig()
+        run_config.artifact_name = artifact_name
+        run_config.artifact_dir = os.path.join(artifact_name, name)
+        file_path = DataTransformationConfig(run_config).transformed_object_file_path
+        if os.path.exists(file_path):
+            return file_path
+    return None
+
+
+def get_preprocessor_file_path(
+    training_pipeline_config: TrainingPipelineConfig,
+    artifact_dir: str | None = None,
+    preprocessor_file_path: str | None = None,
+) -> str:
+    """
+    The preprocessor to score with: ``preprocessor_file_path``, the one of the
+    training run in ``artifact_dir``, or the latest one. Raises
+    FileNotFoundError when no training run has fitted a preprocessor yet.
+    """
+    if preprocessor_file_path:
+        return preprocessor_file_path
+    if artifact_dir:
+        training_pipeline_config.artifact_dir = artifact_dir
+        return DataTransformationConfig(
+            training_pipeline_config
+        ).transformed_object_file_path
+    file_path = get_latest_preprocessor_file_path(training_pipeline_config)
+    if file_path is None:
+        raise FileNotFoundError(
+            f"No training run under {training_pipeline_config.artifact_name} has "
+            f"fitted a preprocessor: run the training pipeline first or pass "
+            f"--preprocessor-file-path"
+        )
+    return file_path
+
+
+def score_features(preprocessor, model, features: pd.DataFrame) -> np.ndarray:
+    """
+    Transforms a batch of feature rows and returns the model's predictions, or the
+    transformed features when there is no model.
+    """
+    transformed = preprocessor.transform(features)
+    if model is None:
+        return np.asarray(transformed)
+    return np.asarray(model.predict(transformed))
+
+
+def init_prediction_worker(
+    preprocessor_file_path: str, model_file_path: str | None, log_queue
+) -> None:
+    """
+    Loads the preprocessor and the model once per worker process.
+    """
+    configure_worker_logging(log_queue)
+    _worker_state["preprocessor"] = load_object(preprocessor_file_path)
+    _worker_state["model"] = (
+        load_object(model_file_path) if model_file_path is not None else None
+    )
+
+
+def predict_chunk(features: pd.DataFrame) -> np.ndarray:
+    return score_features(
+        _worker_state["preprocessor"], _worker_state["model"], features
+    )
+
+
+class ChunkedOutputWriter:
+    """
+    Appends DataFrame chunks to a csv or parquet file. The chunks go to a
+    ``.partial`` file that replaces the output only once every chunk is written.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        self.file_format = os.path.splitext(file_path)[1].lstrip(".").lower()
+        if self.file_format not in ("csv", "parquet"):
+            raise ValueError(f"Unsupported prediction output format: {file_path}")
+        self.partial_file_path = f"{file_path}.partial"
+        self.parquet_writer = None
+        self.n_rows = 0
+
+    def write(self, dataframe: pd.DataFrame) -> None:
+        if self.n_rows == 0:
+            os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+        if self.file_format == "csv":
+            dataframe.to_csv(
+                self.partial_file_path,
+                mode="w" if self.n_rows == 0 else "a",
+                header=self.n_rows == 0,
+                index=False,
+            )
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(dataframe, preserve_index=False)
+            if self.parquet_writer is None:
+                self.parquet_writer = pq.ParquetWriter(
+                    self.partial_file_path, table.schema
+                )
+            else:
+                table = table.cast(self.parquet_writer.schema)
+            self.parquet_writer.write_table(table)
+        self.n_rows += len(dataframe)
+
+    def close(self, commit: bool = True) -> None:
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
+            self.parquet_writer = None
+        if not os.path.exists(self.partial_file_path):
+            return
+        if commit:
+            os.replace(self.partial_file_path, self.file_path)
+        else:
+            os.remove(self.partial_file_path)
+
+
+class BatchPrediction:
+    """
+    Scores a csv or parquet file of feature rows with the preprocessor of the
+    latest training run (see get_latest_preprocessor_file_path) and, when one is
+    configured, a model.
+
+    The input is read in chunks of ``chunk_size`` rows and every chunk is
+    transformed and predicted as one vectorized batch. With ``n_jobs`` above 1 the
+    batches are scored by a pool of spawned processes that load the preprocessor
+    and model once each; at most two batches per process are in flight, and the
+    results are appended to the output in input order as they complete, so memory
+    use does not grow with the size of the input.
+    """
+
+    def __init__(
+        self, batch_prediction_config: BatchPredictionConfig | None = None
+    ) -> None:
+        try:
+            if batch_prediction_config is None:
+                training_pipeline_config = TrainingPipelineConfig()
+                batch_prediction_config = BatchPredictionConfig(
+                    training_pipeline_config
+                )
+                batch_prediction_config.preprocessor_file_path = (
+                    get_preprocessor_file_path(training_pipeline_config)
+                )
+            self.batch_prediction_config = batch_prediction_config
+            n_jobs = self.batch_prediction_config.n_jobs
+            self.n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else max(1, n_jobs)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @staticmethod
+    def iter_input_chunks(file_path: str, chunk_size: int):
+        """
+        Yields the rows of a csv or parquet file as DataFrames of at most
+        ``chunk_size`` rows.
+        """
+        try:
+            file_format = os.path.splitext(file_path)[1].lstrip(".").lower()
+            if file_format == "csv":
+                yield from pd.read_csv(file_path, chunksize=chunk_size)
+            elif file_format == "parquet":
+                import pyarrow.parquet as pq
+
+                parquet_file = pq.ParquetFile(file_path)
+                for record_batch in parquet_file.iter_batches(batch_size=chunk_size):
+                    yield record_batch.to_pandas()
+            else:
+                raise ValueError(f"Unsupported prediction input format: {file_path}")
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @staticmethod
+    def get_feature_columns(preprocessor, columns) -> list:
+        """
+        Returns the columns the preprocessor was fitted on, or every input column
+        but the target when it does not record them.
+        """
+        feature_names = getattr(preprocessor, "feature_names_in_", None)
+        if feature_names is not None:
+            return list(feature_names)
+        return [column for column in columns if column != TARGET_COLUMN]
+
+    def build_output_chunk(
+        self, chunk: pd.DataFrame, scores: np.ndarray, feature_columns: list
+    ) -> pd.DataFrame:
+        """
+        Adds the predictions to the input rows; without a model the transformed
+        features are the output.
+        """
+        if scores.ndim == 1:
+            chunk[self.batch_prediction_config.prediction_column] = scores
+            return chunk
+        if scores.shape[1] != len(feature_columns):
+            feature_columns = [f"feature_{index}" for index in range(scores.shape[1])]
+        return pd.DataFrame(scores, columns=feature_columns)
+
+    def score_in_process(
+        self, chunks, writer: ChunkedOutputWriter, preprocessor, model
+    ) -> None:
+        feature_columns = None
+        for chunk in chunks:
+            if feature_columns is None:
+                feature_columns = self.get_feature_columns(preprocessor, chunk.columns)
+            scores = score_features(preprocessor, model, chunk[feature_columns])
+            writer.write(self.build_output_chunk(chunk, scores, feature_columns))
+
+    def score_in_workers(self, chunks, writer: ChunkedOutputWriter, preprocessor):
+        config = self.batch_prediction_config
+        pending: deque = deque()
+        feature_columns = None
+        ## Spawned workers do not inherit the locks held by the logging threads
+        with ProcessPoolExecutor(
+            max_workers=self.n_jobs,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_prediction_worker,
+            initargs=(
+                config.preprocessor_file_path,
+                config.model_file_path,
+                get_worker_log_queue(),
+            ),
+        ) as executor:
+            for chunk in chunks:
+                if feature_columns is None:
+                    feature_columns = self.get_feature_columns(
+                        preprocessor, chunk.columns
+                    )
+                if len(pending) >= 2 * self.n_jobs:
+                    done_chunk, future = pending.popleft()
+                    writer.write(
+                        self.build_output_chunk(
+                            done_chunk, future.result(), feature_columns
+                        )
+                    )
+                ## Only the feature columns are sent, the rows stay in this process
+                pending.append(
+                    (chunk, executor.submit(predict_chunk, chunk[feature_columns]))
+                )
+            while pending:
+                done_chunk, future = pending.popleft()
+                writer.write(
+                    self.build_output_chunk(
+                        done_chunk, future.result(), feature_columns
+                    )
+                )
+
+    @track_stage(BATCH_PREDICTION_DIR_NAME)
+    def initiate_batch_prediction(
+        self, input_file_path: str, output_file_path: str | None = None
+    ) -> BatchPredictionArtifact:
+        """
+        Scores ``input_file_path`` and writes the rows with their prediction to
+        ``output_file_path`` (by default the configured output file).
+        """
+        try:
+            config = self.batch_prediction_config
+            output_file_path = output_file_path or config.output_file_path
+            preprocessor = load_object(config.preprocessor_file_path)
+            model = (
+                load_object(config.model_file_path)
+                if config.model_file_path is not None
+                else None
+            )
+            if model is None:
+                logging.info("No model configured, writing the transformed features")
+
+            started_at = time.perf_counter()
+            chunks = self.iter_input_chunks(input_file_path, config.chunk_size)
+            writer = ChunkedOutputWriter(output_file_path)
+            try:
+                if self.n_jobs == 1:
+                    self.score_in_process(chunks, writer, preprocessor, model)
+                else:
+                    self.score_in_workers(chunks, writer, preprocessor)
+            except BaseException:
+                writer.close(commit=False)
+                raise
+            writer.close()
+
+            elapsed = time.perf_counter() - started_at
+            metrics.record_rows(writer.n_rows)
+            logging.info(
+                "Scored %d rows of %s in %.3fs on %d processes",
+                writer.n_rows,
+                input_file_path,
+                elapsed,
+                self.n_jobs,
+            )
+            return BatchPredictionArtifact(
+                output_file_path=output_file_path, n_rows=writer.n_rows
+            )
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+
+def get_batch_prediction_config(argv=None) -> tuple[BatchPredictionConfig, str]:
+    """
+    Parses the command line into the configuration and the input file path.
+    """
+    parser = argparse.ArgumentParser(description="Batch prediction")
+    parser.add_argument("input_file_path", help="csv or parquet file of features")
+    parser.add_argument("--output-file-path", default=None)
+    parser.add_argument(
+        "--artifact-dir",
+        default=None,
+        help="training run whose preprocessor is used, defaults to the latest",
+    )
+    parser.add_argument("--preprocessor-file-path", default=None)
+    parser.add_argument(
+        "--model-file-path",
+        default=None,
+        help="without a model the transformed features are written",
+    )
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--n-jobs", type=int, default=None)
+    arguments = parser.parse_args(argv)
+
+    training_pipeline_config = TrainingPipelineConfig()
+    config = BatchPredictionConfig(training_pipeline_config)
+    config.preprocessor_file_path = get_preprocessor_file_path(
+        training_pipeline_config,
+        artifact_dir=arguments.artifact_dir,
+        preprocessor_file_path=arguments.preprocessor_file_path,
+    )
+    for name in ("output_file_path", "model_file_path", "chunk_size", "n_jobs"):
+        if getattr(arguments, name) is not None:
+            setattr(config, name, getattr(arguments, name))
+    return config, arguments.input_file_path
+
+
+if __name__ == "__main__":
+    try:
+        config, input_file_path = get_batch_prediction_config()
+        artifact = BatchPrediction(config).initiate_batch_prediction(input_file_path)
+        print(artifact)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)  # type: ignore
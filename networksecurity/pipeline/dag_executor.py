@@ -0,0 +1,239 @@
+import contextvars
+import dataclasses
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.utils import read_yaml_file, write_yaml_file
+
+
+@dataclass
+class PipelineNode:
+    """
+    One unit of work of a DAGExecutor. ``run`` is called with the results of
+    ``dependencies`` in order. Nodes with an ``artifact_class`` are checkpointed.
+    """
+
+    name: str
+    run: Callable[..., Any]
+    dependencies: list[str] = field(default_factory=list)
+    artifact_class: type | None = None
+
+
+class DAGExecutor:
+    """
+    Runs PipelineNodes in dependency order, submitting every node whose
+    dependencies are done to a thread pool. The nodes share the pipeline's
+    in-memory artifacts and ArtifactWriter, so they are not run in processes.
+
+    With a ``checkpoint_file_path`` the artifact of every finished node is
+    recorded along with ``run_id``. A later executor with the same ``run_id``
+    restores those artifacts instead of running the nodes again, as long as their
+    files still exist and every node they depend on was restored as well. Fields
+    of the artifacts declared with ``repr=False`` (in-memory data) are not
+    checkpointed. ``after_writes`` defers each checkpoint update until the files
+    written so far are on disk (see ArtifactWriter.call_when_done) without
+    holding up the next node.
+    """
+
+    def __init__(
+        self,
+        nodes: list[PipelineNode],
+        max_workers: int = 2,
+        checkpoint_file_path: str | None = None,
+        run_id: str | None = None,
+        after_writes: Callable[[Callable[[], None]], None] | None = None,
+    ) -> None:
+        try:
+            self.nodes = {node.name: node for node in nodes}
+            if len(self.nodes) != len(nodes):
+                raise ValueError("Pipeline node names must be unique")
+            self.order = self.topological_order(self.nodes)
+            self.max_workers = max_workers
+            self.checkpoint_file_path = checkpoint_file_path
+            self.run_id = run_id
+            self.after_writes = after_writes
+            self.state: dict = {"run_id": run_id, "status": "running", "nodes": {}}
+            ## Deferred checkpoint updates run on the writer's threads
+            self._state_lock = threading.Lock()
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @staticmethod
+    def topological_order(nodes: dict[str, PipelineNode]) -> list[str]:
+        """
+        Returns the node names in an order where dependencies come first, and
+        rejects unknown dependencies and cycles.
+        """
+        for node in nodes.values():
+            unknown = [name for name in node.dependencies if name not in nodes]
+            if unknown:
+                raise ValueError(f"Node {node.name} depends on unknown nodes {unknown}")
+        order: list[str] = []
+        remaining = {name: set(node.dependencies) for name, node in nodes.items()}
+        while remaining:
+            ready = [
+                name for name, dependencies in remaining.items() if not dependencies
+            ]
+            if not ready:
+                raise ValueError(f"Pipeline nodes form a cycle: {sorted(remaining)}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for dependencies in remaining.values():
+                dependencies.difference_update(ready)
+        return order
+
+    @staticmethod
+    def read_checkpoint(checkpoint_file_path: str | None) -> dict | None:
+        try:
+            if checkpoint_file_path is None or not os.path.exists(checkpoint_file_path):
+                return None
+            return read_yaml_file(checkpoint_file_path)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def save_checkpoint(self) -> None:
+        if self.checkpoint_file_path is None:
+            return
+        with self._state_lock:
+            write_yaml_file(self.checkpoint_file_path, self.state, replace=True)
+
+    def update_checkpoint(
+        self, nodes: dict | None = None, status: str | None = None
+    ) -> None:
+        """
+        Records finished nodes or the run status once the artifact files written
+        so far are on disk.
+        """
+
+        def save() -> None:
+            with self._state_lock:
+                self.state["nodes"].update(nodes or {})
+                if status is not None:
+                    self.state["status"] = status
+            self.save_checkpoint()
+
+        if self.after_writes is None:
+            save()
+        else:
+            self.after_writes(save)
+
+    @staticmethod
+    def artifact_to_fields(artifact) -> dict:
+        return {
+            item.name: getattr(artifact, item.name)
+            for item in dataclasses.fields(artifact)
+            if item.repr
+        }
+
+    @staticmethod
+    def artifact_files_exist(fields: dict) -> bool:
+        return all(
+            os.path.exists(value)
+            for name, value in fields.items()
+            if name.endswith("_file_path") and isinstance(value, str)
+        )
+
+    def restore_checkpoint(self) -> dict[str, Any]:
+        """
+        Returns the artifacts of the nodes finished by an earlier attempt of the
+        same run that can be reused.
+        """
+        checkpoint = self.read_checkpoint(self.checkpoint_file_path)
+        if not checkpoint or checkpoint.get("run_id") != self.run_id:
+            return {}
+        if checkpoint.get("status") == "succeeded":
+            return {}
+        restored: dict[str, Any] = {}
+        for name in self.order:
+            node = self.nodes[name]
+            fields = checkpoint.get("nodes", {}).get(name)
+            if (
+                fields is None
+                or node.artifact_class is None
+                or not all(dependency in restored for dependency in node.dependencies)
+                or not self.artifact_files_exist(fields)
+            ):
+                continue
+            restored[name] = node.artifact_class(**fields)
+            self.state["nodes"][name] = fields
+            logging.info(f"Resuming pipeline node {name} from its checkpoint")
+        return restored
+
+    def create_pool(self):
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="pipeline-node"
+        )
+
+    def complete_node(self, name: str, result: Any) -> None:
+        node = self.nodes[name]
+        if node.artifact_class is None or self.checkpoint_file_path is None:
+            return
+        self.update_checkpoint(nodes={name: self.artifact_to_fields(result)})
+
+    def run(self) -> dict[str, Any]:
+        """
+        Runs every node that is not restored from a checkpoint and returns the
+        results of all nodes by name.
+        """
+        try:
+            results = self.restore_checkpoint()
+            self.save_checkpoint()
+            pending = [name for name in self.order if name not in results]
+            running: dict[Future, str] = {}
+            started_at: dict[str, float] = {}
+            try:
+                with self.create_pool() as executor:
+                    while pending or running:
+                        for name in list(pending):
+                            node = self.nodes[name]
+                            if all(dep in results for dep in node.dependencies):
+                                arguments = [results[dep] for dep in node.dependencies]
+                                started_at[name] = time.perf_counter()
+                                ## Keep the caller's context, e.g. the metrics stage
+                                future = executor.submit(
+                                    contextvars.copy_context().run,
+                                    node.run,
+                                    *arguments,
+                                )
+                                running[future] = name
+                                pending.remove(name)
+                        done, _ = wait(running, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            name = running.pop(future)
+                            results[name] = future.result()
+                            logging.info(
+                                f"Pipeline node {name} finished in "
+                                f"{time.perf_counter() - started_at[name]:.3f}s"
+                            )
+                            self.complete_node(name, results[name])
+            except BaseException:
+                for future in running:
+                    future.cancel()
+                with self._state_lock:
+                    self.state["status"] = "failed"
+                self.save_checkpoint()
+                raise
+            ## Scheduled after the node updates, so it is recorded last
+            self.update_checkpoint(status="succeeded")
+            return results
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+
+def run_concurrently(tasks: dict[str, Callable[[], Any]], max_workers: int = 2) -> dict:
+    """
+    Runs independent callables, such as the train and test halves of a stage, on
+    a thread pool and returns their results by name.
+    """
+    if len(tasks) <= 1 or max_workers <= 1:
+        return {name: task() for name, task in tasks.items()}
+    nodes = [PipelineNode(name=name, run=task) for name, task in tasks.items()]
+    return DAGExecutor(nodes, max_workers=min(max_workers, len(nodes))).run()
@@ -0,0 +1,478 @@
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.entity.config import ScoringServiceConfig, TrainingPipelineConfig
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.pipeline.batch_prediction import (
+    BatchPrediction,
+    get_preprocessor_file_path,
+    score_features,
+)
+from networksecurity.utils.main_utils.utils import load_object
+from networksecurity.utils.ml_utils.prediction_cache import (
+    PredictionCache,
+    get_artifact_digest,
+)
+
+
+class ScoringModel:
+    """
+    The fitted preprocessor and, optionally, the model, loaded once, with a cache
+    of the predictions of recently scored feature vectors.
+    """
+
+    def __init__(
+        self,
+        preprocessor_file_path: str,
+        model_file_path: str | None,
+        cache_max_size: int = 0,
+    ):
+        self.preprocessor_file_path = preprocessor_file_path
+        self.model_file_path = model_file_path
+        self.prediction_cache = PredictionCache(cache_max_size)
+        self.load()
+
+    def load(self) -> None:
+        """
+        (Re)loads the preprocessor and the model. The prediction cache is kept
+        when their files are unchanged and emptied otherwise.
+        """
+        try:
+            ## Hashed before loading: if the files change in between, the next
+            ## load sees a new digest and drops what the newer artifacts scored
+            artifact_digest = get_artifact_digest(
+                [self.preprocessor_file_path, self.model_file_path]
+            )
+            preprocessor = load_object(self.preprocessor_file_path)
+            model = (
+                load_object(self.model_file_path)
+                if self.model_file_path is not None
+                else None
+            )
+            feature_columns: list = BatchPrediction.get_feature_columns(
+                preprocessor, []
+            )
+            if not feature_columns:
+                raise ValueError(
+                    "The preprocessor does not record the feature columns it was fitted on"
+                )
+            self.preprocessor, self.model = preprocessor, model
+            self.feature_columns = feature_columns
+            self.prediction_cache.validate(artifact_digest)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def to_rows(self, instances: list) -> np.ndarray:
+        """
+        Converts request instances, objects keyed by feature name or lists in
+        feature order, to a float array. Missing and null values become NaN.
+        """
+        if not isinstance(instances, list) or not instances:
+            raise ValueError("'instances' must be a non-empty list")
+        n_features = len(self.feature_columns)
+        rows = np.full((len(instances), n_features), np.nan)
+        for index, instance in enumerate(instances):
+            if isinstance(instance, dict):
+                values = [instance.get(column) for column in self.feature_columns]
+            elif isinstance(instance, list) and len(instance) == n_features:
+                values = instance
+            else:
+                raise ValueError(
+                    f"Instance {index} must be an object or a list of {n_features} values"
+                )
+            rows[index] = [np.nan if value is None else value for value in values]
+        return rows
+
+    def score(self, rows: np.ndarray) -> np.ndarray:
+        return self.prediction_cache.score(rows, self.score_uncached)
+
+    def score_uncached(self, rows: np.ndarray) -> np.ndarray:
+        features = pd.DataFrame(rows, columns=self.feature_columns, copy=False)
+        return score_features(self.preprocessor, self.model, features)
+
+
+class LatencyRecorder:
+    """
+    Request latencies over a sliding window, plus request, row and batch counters
+    since the service started.
+    """
+
+    def __init__(self, window: int) -> None:
+        self.latencies: deque = deque(maxlen=window)
+        self.started_at = time.perf_counter()
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.batched_rows = 0
+        self.errors = 0
+
+    def record_request(self, seconds: float, n_rows: int) -> None:
+        self.latencies.append(seconds)
+        self.requests += 1
+        self.rows += n_rows
+
+    def record_batch(self, n_rows: int) -> None:
+        self.batches += 1
+        self.batched_rows += n_rows
+
+    def snapshot(self) -> dict:
+        elapsed = time.perf_counter() - self.started_at
+        latencies_ms = np.asarray(self.latencies) * 1000.0
+        p50, p99 = (
+            np.percentile(latencies_ms, [50, 99]).tolist()
+            if len(latencies_ms)
+            else (None, None)
+        )
+        return {
+            "requests": self.requests,
+            "rows": self.rows,
+            "errors": self.errors,
+            "batches": self.batches,
+            "mean_batch_rows": (
+                self.batched_rows / self.batches if self.batches else None
+            ),
+            "latency_p50_ms": p50,
+            "latency_p99_ms": p99,
+            "requests_per_second": self.requests / elapsed if elapsed else None,
+            "rows_per_second": self.rows / elapsed if elapsed else None,
+            "uptime_seconds": elapsed,
+        }
+
+
+class MicroBatcher:
+    """
+    Gathers the rows of concurrent requests into one batch for ``score_function``.
+
+    A batch is closed when it holds ``max_batch_size`` rows or when its oldest
+    request has waited ``max_wait_ms``. Batches are scored one at a time on a
+    worker thread, so the event loop keeps accepting requests, which queue up for
+    the next batch, while the model runs.
+    """
+
+    def __init__(
+        self,
+        score_function,
+        max_batch_size: int,
+        max_wait_ms: float,
+        latency_recorder: LatencyRecorder,
+    ) -> None:
+        self.score_function = score_function
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.latency_recorder = latency_recorder
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.item_added = asyncio.Event()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scoring")
+        self.task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+        self.executor.shutdown(wait=True)
+
+    async def submit(self, rows: np.ndarray) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        await self.queue.put((loop.time(), rows, future))
+        self.item_added.set()
+        return await future
+
+    async def collect_batch(self) -> list:
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        n_rows = len(batch[0][1])
+        deadline = batch[0][0] + self.max_wait
+        while n_rows < self.max_batch_size:
+            if self.queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                ## Waits on an event rather than on queue.get, so a timeout never
+                ## drops a request that arrives as it expires
+                self.item_added.clear()
+                try:
+                    await asyncio.wait_for(self.item_added.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            item = self.queue.get_nowait()
+            batch.append(item)
+            n_rows += len(item[1])
+        return batch
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self.collect_batch()
+            sizes = [len(rows) for _, rows, _ in batch]
+            try:
+                scores = await loop.run_in_executor(
+                    self.executor,
+                    self.score_function,
+                    np.concatenate([rows for _, rows, _ in batch]),
+                )
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.latency_recorder.record_batch(sum(sizes))
+            offsets = np.cumsum([0] + sizes)
+            for (_, _, future), start, end in zip(batch, offsets[:-1], offsets[1:]):
+                if not future.done():
+                    future.set_result(scores[start:end])
+
+
+class ScoringService:
+    """
+    Minimal HTTP/1.1 JSON service on asyncio streams, with keep-alive.
+
+    ``POST /predict`` takes ``{"instances": [...]}`` and returns
+    ``{"predictions": [...]}``; ``GET /metrics`` returns the latency percentiles,
+    the throughput and the prediction cache counters, ``GET /health`` the service
+    status. ``POST /reload`` reloads the preprocessor and the model from disk.
+    """
+
+    def __init__(self, scoring_service_config: ScoringServiceConfig) -> None:
+        try:
+            self.scoring_service_config = scoring_service_config
+            self.scoring_model = ScoringModel(
+                scoring_service_config.preprocessor_file_path,
+                scoring_service_config.model_file_path,
+                scoring_service_config.cache_max_size,
+            )
+            self.latency_recorder = LatencyRecorder(
+                scoring_service_config.latency_window
+            )
+            self.batcher: MicroBatcher | None = None
+            self.server: asyncio.AbstractServer | None = None
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    async def predict(self, body: bytes) -> tuple[HTTPStatus, dict]:
+        started_at = time.perf_counter()
+        try:
+            rows = self.scoring_model.to_rows(json.loads(body)["instances"])
+        except (ValueError, KeyError, TypeError) as e:
+            self.latency_recorder.errors += 1
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        try:
+            scores = await self.batcher.submit(rows)  # type: ignore[union-attr]
+        except Exception as e:
+            self.latency_recorder.errors += 1
+            logging.exception("Scoring a batch failed")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+        self.latency_recorder.record_request(
+            time.perf_counter() - started_at, len(rows)
+        )
+        return HTTPStatus.OK, {"predictions": scores.tolist()}
+
+    async def reload(self) -> tuple[HTTPStatus, dict]:
+        ## On the scoring thread, so no batch is scored while the artifacts change
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(
+                self.batcher.executor, self.scoring_model.load  # type: ignore[union-attr]
+            )
+        except Exception as e:
+            logging.exception("Reloading the artifacts failed")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+        prediction_cache = self.scoring_model.prediction_cache
+        logging.info(f"Reloaded the artifacts {prediction_cache.artifact_digest}")
+        return HTTPStatus.OK, {"artifact_digest": prediction_cache.artifact_digest}
+
+    def get_metrics(self) -> dict:
+        return {
+            **self.latency_recorder.snapshot(),
+            "prediction_cache": self.scoring_model.prediction_cache.stats(),
+        }
+
+    async def route(
+        self, method: str, path: str, body: bytes
+    ) -> tuple[HTTPStatus, dict]:
+        if path == "/predict" and method == "POST":
+            return await self.predict(body)
+        if path == "/metrics" and method == "GET":
+            return HTTPStatus.OK, self.get_metrics()
+        if path == "/reload" and method == "POST":
+            return await self.reload()
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, {"status": "ok"}
+        return HTTPStatus.NOT_FOUND, {"error": f"No route for {method} {path}"}
+
+    @staticmethod
+    def encode_response(status: HTTPStatus, payload: dict, keep_alive: bool) -> bytes:
+        body = json.dumps(payload).encode()
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        return head.encode("latin-1") + body
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                    content_length = int(headers.get("content-length", 0))
+                except ValueError:
+                    writer.write(
+                        self.encode_response(
+                            HTTPStatus.BAD_REQUEST,
+                            {"error": "Malformed request"},
+                            False,
+                        )
+                    )
+                    break
+                if content_length > self.scoring_service_config.max_body_bytes:
+                    writer.write(
+                        self.encode_response(
+                            HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                            {"error": "Request body too large"},
+                            False,
+                        )
+                    )
+                    break
+                body = await reader.readexactly(content_length)
+                status, payload = await self.route(
+                    method, target.split("?", 1)[0], body
+                )
+                keep_alive = (
+                    version == "HTTP/1.1"
+                    and headers.get("connection", "").lower() != "close"
+                )
+                writer.write(self.encode_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> None:
+        config = self.scoring_service_config
+        self.batcher = MicroBatcher(
+            self.scoring_model.score,
+            config.max_batch_size,
+            config.max_wait_ms,
+            self.latency_recorder,
+        )
+        self.batcher.start()
+        self.server = await asyncio.start_server(
+            self.handle_connection, config.host, config.port
+        )
+        logging.info(
+            "Scoring service listening on %s:%d (max batch %d rows, max wait %.1fms)",
+            config.host,
+            config.port,
+            config.max_batch_size,
+            config.max_wait_ms,
+        )
+
+    async def stop(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.batcher is not None:
+            await self.batcher.stop()
+        logging.info("Scoring service stopped: %s", json.dumps(self.get_metrics()))
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signal_number, stop_event.set)
+            except NotImplementedError:  # Windows
+                pass
+        try:
+            await stop_event.wait()
+        finally:
+            await self.stop()
+
+
+def get_scoring_service_config(argv=None) -> ScoringServiceConfig:
+    parser = argparse.ArgumentParser(description="Online scoring service")
+    parser.add_argument(
+        "--artifact-dir",
+        default=None,
+        help="training run whose preprocessor is served, defaults to the latest",
+    )
+    parser.add_argument("--preprocessor-file-path", default=None)
+    parser.add_argument(
+        "--model-file-path",
+        default=None,
+        help="without a model the transformed features are returned",
+    )
+    parser.add_argument(
+        "--no-model",
+        action="store_true",
+        help="return the transformed features even when a model file is given",
+    )
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--max-batch-size", type=int, default=None)
+    parser.add_argument("--max-wait-ms", type=float, default=None)
+    parser.add_argument(
+        "--cache-max-size", type=int, default=None, help="0 disables the cache"
+    )
+    arguments = parser.parse_args(argv)
+
+    training_pipeline_config = TrainingPipelineConfig()
+    config = ScoringServiceConfig(training_pipeline_config)
+    config.preprocessor_file_path = get_preprocessor_file_path(
+        training_pipeline_config,
+        artifact_dir=arguments.artifact_dir,
+        preprocessor_file_path=arguments.preprocessor_file_path,
+    )
+    if arguments.model_file_path:
+        config.model_file_path = arguments.model_file_path
+    if arguments.no_model:
+        config.model_file_path = None
+    for name in ("host", "port", "max_batch_size", "max_wait_ms", "cache_max_size"):
+        if getattr(arguments, name) is not None:
+            setattr(config, name, getattr(arguments, name))
+    return config
+
+
+if __name__ == "__main__":
+    try:
+        service = ScoringService(get_scoring_service_config())
+        asyncio.run(service.serve_forever())
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)  # type: ignore
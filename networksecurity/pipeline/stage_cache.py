@@ -0,0 +1,247 @@
+import dataclasses
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.utils import (
+    get_object_array_dir,
+    read_yaml_file,
+    write_yaml_file,
+)
+
+
+class StageCache:
+    """
+    Content addressed cache of pipeline stage artifacts.
+
+    A stage's key is a hash of its parameters and of its input file digests or the
+    keys of the stages it depends on. On a miss the stage runs and its output files
+    are hard linked into ``cache_dir/<key>``; on a hit the stage is skipped and the
+    cached files are linked back to where the stage would have written them in the
+    run directory, so every run directory holds its complete artifacts. Entries are
+    evicted least recently used first once the cache grows past ``max_bytes``.
+    Eviction only deletes the files under ``cache_dir/<key>``: the run directories
+    keep their own links and are never touched.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int) -> None:
+        try:
+            self.cache_dir = cache_dir
+            self.max_bytes = max_bytes
+            self.index_file_path = os.path.join(cache_dir, "index.yaml")
+            self.index = {"entries": {}, "digests": {}}
+            if os.path.exists(self.index_file_path):
+                self.index = read_yaml_file(self.index_file_path) or self.index
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def save_index(self) -> None:
+        try:
+            write_yaml_file(self.index_file_path, self.index, replace=True)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def file_digest(self, file_path: str) -> str:
+        """
+        Returns the sha256 of a file, memoised on its path, size, inode and mtime so
+        unchanged files are not re-read on every run.
+        """
+        try:
+            stat = os.stat(file_path)
+            signature = f"{stat.st_size}:{stat.st_ino}:{stat.st_mtime_ns}"
+            memo = self.index["digests"].get(file_path)
+            if memo is not None and memo["signature"] == signature:
+                return memo["digest"]
+            digest = hashlib.sha256()
+            with open(file_path, "rb") as file_obj:
+                for block in iter(lambda: file_obj.read(1 << 20), b""):
+                    digest.update(block)
+            self.index["digests"][file_path] = {
+                "signature": signature,
+                "digest": digest.hexdigest(),
+            }
+            return digest.hexdigest()
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def compute_key(
+        self,
+        stage_name: str,
+        file_paths: list,
+        params: dict,
+        input_keys: list | None = None,
+    ) -> str:
+        """
+        Hashes a stage name, the digests of its input files, the cache keys of the
+        stages that produced its other inputs and its parameters.
+        """
+        try:
+            payload = {
+                "stage": stage_name,
+                "files": [self.file_digest(file_path) for file_path in file_paths],
+                "inputs": list(input_keys or []),
+                "params": params,
+            }
+            encoded = json.dumps(payload, sort_keys=True, default=repr).encode()
+            return hashlib.sha256(encoded).hexdigest()
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def lookup(self, key: str, artifact_class: type, run_dir: str | None = None):
+        """
+        Returns the cached artifact for ``key``, or None on a miss. With a
+        ``run_dir`` the cached files are linked into it and the artifact points at
+        them; entries stored without their run directory layout point at the cache.
+        """
+        try:
+            entry = self.index["entries"].get(key)
+            if entry is None:
+                return None
+            if not all(os.path.exists(path) for path in entry["files"].values()):
+                logging.info(f"Dropping incomplete stage cache entry {key}")
+                self.remove_entry(key)
+                self.save_index()
+                return None
+            entry["last_used"] = time.time()
+            fields = dict(entry["fields"])
+            relative_paths = entry.get("relative_paths", {})
+            for name, cached_path in entry["files"].items():
+                relative_path = relative_paths.get(name)
+                if run_dir is None or relative_path is None:
+                    fields[name] = cached_path
+                    continue
+                run_path = os.path.join(run_dir, relative_path)
+                for source_path, target_path in self.get_object_paths(
+                    cached_path, run_path
+                ):
+                    self.link_file(source_path, target_path)
+                fields[name] = run_path
+            self.save_index()
+            logging.info(f"Stage cache hit for {entry['stage']} ({key[:12]})")
+            return artifact_class(**fields)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def store(
+        self,
+        key: str,
+        stage_name: str,
+        artifact,
+        run_dir: str | None = None,
+        protected_keys: list | None = None,
+    ) -> None:
+        """
+        Links the artifact's output files into the cache and records the entry,
+        with the paths of the files inside ``run_dir`` for lookup to link them
+        back. Fields holding in-memory data are not cached. ``protected_keys``
+        are other entries the current run still uses, which are not evicted.
+        """
+        try:
+            entry_dir = os.path.join(self.cache_dir, key)
+            os.makedirs(entry_dir, exist_ok=True)
+            files, fields, relative_paths, size = {}, {}, {}, 0
+            for field in dataclasses.fields(artifact):
+                if not field.repr:
+                    continue
+                value = getattr(artifact, field.name)
+                if isinstance(value, str) and os.path.isfile(value):
+                    cached_path = os.path.join(
+                        entry_dir, field.name, os.path.basename(value)
+                    )
+                    for source_path, target_path in self.get_object_paths(
+                        value, cached_path
+                    ):
+                        size += self.link_file(source_path, target_path)
+                    files[field.name] = cached_path
+                    if run_dir is not None and self.is_inside(value, run_dir):
+                        relative_paths[field.name] = os.path.relpath(value, run_dir)
+                else:
+                    fields[field.name] = value
+            self.index["entries"][key] = {
+                "stage": stage_name,
+                "files": files,
+                "fields": fields,
+                "relative_paths": relative_paths,
+                "size": size,
+                "last_used": time.time(),
+            }
+            self.evict(protected_keys=[key] + list(protected_keys or []))
+            self.save_index()
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @staticmethod
+    def get_object_paths(source_path: str, target_path: str) -> list:
+        """
+        Pairs a file with where it is linked to, followed by the arrays that
+        objects saved by save_object keep alongside.
+        """
+        array_dir = get_object_array_dir(source_path)
+        names = sorted(os.listdir(array_dir)) if os.path.isdir(array_dir) else []
+        return [(source_path, target_path)] + [
+            (
+                os.path.join(array_dir, name),
+                os.path.join(get_object_array_dir(target_path), name),
+            )
+            for name in names
+        ]
+
+    @staticmethod
+    def link_file(source_path: str, target_path: str) -> int:
+        """
+        Hard links (or copies) a file and returns its size.
+        """
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+        if os.path.exists(target_path):
+            os.remove(target_path)
+        try:
+            os.link(source_path, target_path)
+        except OSError:
+            shutil.copy2(source_path, target_path)
+        return os.path.getsize(target_path)
+
+    def remove_entry(self, key: str) -> None:
+        """
+        Deletes a cache entry and its files under ``cache_dir``. Run directories
+        hold their own links to those files and keep them.
+        """
+        try:
+            self.index["entries"].pop(key)
+            shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @staticmethod
+    def is_inside(file_path: str, directory: str) -> bool:
+        directory = os.path.abspath(directory) + os.sep
+        return os.path.abspath(file_path).startswith(directory)
+
+    def evict(self, protected_keys: list | None = None) -> None:
+        """
+        Evicts least recently used entries until the cache fits in ``max_bytes``.
+        The entries in ``protected_keys`` are never evicted, since the current run
+        may still read their files from the cache.
+        """
+        try:
+            entries = self.index["entries"]
+            total = sum(entry["size"] for entry in entries.values())
+            for key in sorted(entries, key=lambda key: entries[key]["last_used"]):
+                if total <= self.max_bytes:
+                    break
+                if key in (protected_keys or []):
+                    continue
+                logging.info(f"Evicting stage cache entry {key[:12]}")
+                total -= entries[key]["size"]
+                self.remove_entry(key)
+            self.index["digests"] = {
+                path: memo
+                for path, memo in self.index["digests"].items()
+                if os.path.exists(path)
+            }
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
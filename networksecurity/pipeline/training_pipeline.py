@@ -0,0 +1,326 @@
+import os
+import sys
+from datetime import datetime
+
+from networksecurity.components.data_ingestion import DataIngestion
+from networksecurity.components.data_transformation import DataTransformation
+from networksecurity.components.data_validation import DataValidation
+from networksecurity.constants import training_pipeline
+from networksecurity.entity.artifact import (
+    DataIngestionArtifact,
+    DataTransformationArtifact,
+    DataValidationArtifact,
+)
+from networksecurity.entity.config import (
+    DataIngestionConfig,
+    DataTransformationConfig,
+    DataValidationConfig,
+    MetricsConfig,
+    PipelineCheckpointConfig,
+    StageCacheConfig,
+    TrainingPipelineConfig,
+)
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.logging.metrics import metrics
+from networksecurity.pipeline.dag_executor import DAGExecutor, PipelineNode
+from networksecurity.pipeline.stage_cache import StageCache
+from networksecurity.utils.main_utils.artifact_writer import ArtifactWriter
+
+
+class TrainingPipeline:
+    """
+    Runs ingestion, validation and transformation in one process.
+
+    The DataFrames and arrays produced by each stage travel to the next stage inside
+    its artifact, so the dataset is parsed once. Files are written by a shared
+    ArtifactWriter: in the background by default, or not at all when ``persist`` is
+    False.
+
+    With ``use_cache`` every stage first looks its inputs up in the StageCache and
+    is skipped when an earlier run already produced its artifact, whose files are
+    linked into this run's directory. A stage's key builds on the keys of the
+    stages before it, so the lookups do not wait for their files to be written;
+    new artifacts are stored in the cache once the writer is closed. Caching needs
+    the files on disk, so it is disabled when ``persist`` is False.
+
+    The stages run as nodes of a DAGExecutor which checkpoints every finished
+    artifact. With ``resume`` (off by default, ``python main.py --resume``) a run
+    that failed picks up its artifact directory and skips the stages that already
+    finished, so MongoDB is not queried again; otherwise every run starts afresh
+    in its own directory.
+    """
+
+    def __init__(
+        self,
+        persist: bool = True,
+        asynchronous_writes: bool = True,
+        training_pipeline_config: TrainingPipelineConfig | None = None,
+        use_cache: bool = True,
+        resume: bool = False,
+    ) -> None:
+        try:
+            self.training_pipeline_config = (
+                training_pipeline_config
+                or TrainingPipelineConfig(timestamp=datetime.now())
+            )
+            self.artifact_writer = ArtifactWriter(
+                persist=persist, asynchronous=asynchronous_writes
+            )
+            self.stage_cache = None
+            ## Cache keys of the stages run or looked up so far, and the artifacts
+            ## to store once their files are written
+            self.stage_keys: dict[str, str] = {}
+            self.pending_cache_entries: list = []
+            if use_cache and persist:
+                stage_cache_config = StageCacheConfig(self.training_pipeline_config)
+                self.stage_cache = StageCache(
+                    cache_dir=stage_cache_config.cache_dir,
+                    max_bytes=stage_cache_config.max_bytes,
+                )
+            self.checkpoint_config = PipelineCheckpointConfig(
+                self.training_pipeline_config
+            )
+            self.checkpoint_file_path = (
+                self.checkpoint_config.checkpoint_file_path if persist else None
+            )
+            if resume:
+                self.resume_failed_run()
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def resume_failed_run(self) -> None:
+        """
+        Points the pipeline at the artifact directory of the last run when that
+        run did not succeed.
+        """
+        try:
+            checkpoint = DAGExecutor.read_checkpoint(self.checkpoint_file_path)
+            if not checkpoint or checkpoint.get("status") == "succeeded":
+                return
+            artifact_dir = checkpoint.get("run_id")
+            if artifact_dir and os.path.isdir(artifact_dir):
+                logging.info(f"Resuming unfinished pipeline run in {artifact_dir}")
+                self.training_pipeline_config.artifact_dir = artifact_dir
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def run_cached_stage(
+        self,
+        stage_name: str,
+        artifact_class: type,
+        run_stage,
+        input_file_paths,
+        params,
+        input_stages=(),
+    ):
+        """
+        Returns the cached artifact of a stage when its inputs are unchanged,
+        otherwise runs the stage and queues its artifact for the cache. The inputs
+        are identified by the keys of ``input_stages``, or by the digests of
+        ``input_file_paths`` when one of those stages was not cached.
+        """
+        try:
+            if self.stage_cache is None:
+                return run_stage()
+            input_keys = [self.stage_keys.get(name) for name in input_stages]
+            if None in input_keys:
+                ## The files have to be on disk before they can be hashed
+                self.artifact_writer.wait()
+                file_paths, input_keys = list(input_file_paths), []
+            else:
+                file_paths = []
+            key = self.stage_cache.compute_key(
+                stage_name,
+                file_paths=file_paths + [training_pipeline.SCHEMA_FILE_PATH],
+                params=params,
+                input_keys=input_keys,
+            )
+            self.stage_keys[stage_name] = key
+            artifact = self.stage_cache.lookup(
+                key, artifact_class, run_dir=self.training_pipeline_config.artifact_dir
+            )
+            if artifact is not None:
+                return artifact
+            artifact = run_stage()
+            self.pending_cache_entries.append((key, stage_name, artifact))
+            return artifact
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def store_cached_stages(self) -> None:
+        """
+        Links the artifacts of the stages that ran into the cache; their files
+        must be written.
+        """
+        try:
+            entries, self.pending_cache_entries = self.pending_cache_entries, []
+            for key, stage_name, artifact in entries:
+                self.stage_cache.store(  # type: ignore[union-attr]
+                    key,
+                    stage_name,
+                    artifact,
+                    run_dir=self.training_pipeline_config.artifact_dir,
+                    protected_keys=list(self.stage_keys.values()),
+                )
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def start_data_ingestion(self) -> DataIngestionArtifact:
+        try:
+            data_ingestion_config = DataIngestionConfig(
+                training_pipeline_config=self.training_pipeline_config
+            )
+            logging.info("Initiate data ingestion...")
+            data_ingestion = DataIngestion(
+                data_ingestion_config=data_ingestion_config,
+                artifact_writer=self.artifact_writer,
+            )
+            if data_ingestion_config.incremental:
+                ## Incremental ingestion keeps its own watermark state
+                data_ingestion_artifact = data_ingestion.initiate_data_ingestion()
+            else:
+                data_ingestion_artifact = self.run_cached_stage(
+                    training_pipeline.DATA_INGESTION_DIR_NAME,
+                    DataIngestionArtifact,
+                    data_ingestion.initiate_data_ingestion,
+                    input_file_paths=[],
+                    params={
+                        "collection": (
+                            data_ingestion.get_collection_fingerprint()
+                            if self.stage_cache is not None
+                            else None
+                        ),
+                        "export_mode": data_ingestion_config.export_mode,
+                        "split_ratio": data_ingestion_config.train_test_split_ratio,
+                        "split_strategy": data_ingestion_config.split_strategy,
+                        "split_stratify": data_ingestion_config.split_stratify,
+                        "artifact_format": training_pipeline.DATA_ARTIFACT_FORMAT,
+                    },
+                )
+            logging.info(f"Data ingestion completed: {data_ingestion_artifact}")
+            return data_ingestion_artifact
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def start_data_validation(
+        self, data_ingestion_artifact: DataIngestionArtifact
+    ) -> DataValidationArtifact:
+        try:
+            data_validation_config = DataValidationConfig(
+                training_pipeline_config=self.training_pipeline_config
+            )
+            logging.info("Initiating data validation...")
+            data_validation = DataValidation(
+                data_ingestion_artifact=data_ingestion_artifact,
+                data_validation_config=data_validation_config,
+                artifact_writer=self.artifact_writer,
+            )
+            data_validation_artifact = self.run_cached_stage(
+                training_pipeline.DATA_VALIDATION_DIR_NAME,
+                DataValidationArtifact,
+                data_validation.initiate_data_validation,
+                input_file_paths=[
+                    data_ingestion_artifact.train_file_path,
+                    data_ingestion_artifact.test_file_path,
+                ],
+                params={"artifact_format": training_pipeline.DATA_ARTIFACT_FORMAT},
+                input_stages=[training_pipeline.DATA_INGESTION_DIR_NAME],
+            )
+            logging.info(f"Data validation completed: {data_validation_artifact}")
+            return data_validation_artifact
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def start_data_transformation(
+        self, data_validation_artifact: DataValidationArtifact
+    ) -> DataTransformationArtifact:
+        try:
+            data_transformation_config = DataTransformationConfig(
+                training_pipeline_config=self.training_pipeline_config
+            )
+            logging.info("Initiate data transformation...")
+            data_transformation = DataTransformation(
+                data_validation_artifact=data_validation_artifact,
+                data_transformation_config=data_transformation_config,
+                artifact_writer=self.artifact_writer,
+            )
+            data_transformation_artifact = self.run_cached_stage(
+                training_pipeline.DATA_TRANSFORMATION_DIR_NAME,
+                DataTransformationArtifact,
+                data_transformation.initiate_data_transformation,
+                input_file_paths=[
+                    data_validation_artifact.valid_train_file_path,
+                    data_validation_artifact.valid_test_file_path,
+                ],
+                params={
+                    "target_column": training_pipeline.TARGET_COLUMN,
+                    "imputer": training_pipeline.DATA_TRANSFORMATION_IMPUTER,
+                    "imputer_params": training_pipeline.DATA_TRANSFORMATION_IMPUTER_PARAMS,
+                    "deduplicate": data_transformation_config.deduplicate,
+                },
+                input_stages=[training_pipeline.DATA_VALIDATION_DIR_NAME],
+            )
+            logging.info(
+                f"Data transformation completed: {data_transformation_artifact}"
+            )
+            return data_transformation_artifact
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def run_pipeline(self) -> DataTransformationArtifact:
+        try:
+            nodes = [
+                PipelineNode(
+                    name=training_pipeline.DATA_INGESTION_DIR_NAME,
+                    run=self.start_data_ingestion,
+                    artifact_class=DataIngestionArtifact,
+                ),
+                PipelineNode(
+                    name=training_pipeline.DATA_VALIDATION_DIR_NAME,
+                    run=self.start_data_validation,
+                    dependencies=[training_pipeline.DATA_INGESTION_DIR_NAME],
+                    artifact_class=DataValidationArtifact,
+                ),
+                PipelineNode(
+                    name=training_pipeline.DATA_TRANSFORMATION_DIR_NAME,
+                    run=self.start_data_transformation,
+                    dependencies=[training_pipeline.DATA_VALIDATION_DIR_NAME],
+                    artifact_class=DataTransformationArtifact,
+                ),
+            ]
+            executor = DAGExecutor(
+                nodes,
+                max_workers=self.checkpoint_config.max_workers,
+                checkpoint_file_path=self.checkpoint_file_path,
+                run_id=self.training_pipeline_config.artifact_dir,
+                after_writes=self.artifact_writer.call_when_done,
+            )
+            metrics_config = MetricsConfig(self.training_pipeline_config)
+            metrics.reset()
+            metrics.configure(
+                profile_stage=metrics_config.profile_stage,
+                profile_mode=metrics_config.profile_mode,
+                profile_dir=(
+                    metrics_config.profile_dir if self.artifact_writer.persist else None
+                ),
+            )
+            try:
+                with metrics.track(training_pipeline.PIPELINE_NAME):
+                    results = executor.run()
+            finally:
+                ## Flush the background writes even when a stage failed
+                self.artifact_writer.close()
+                if self.stage_cache is not None:
+                    self.store_cached_stages()
+                if self.artifact_writer.persist:
+                    metrics.export(
+                        metrics_config.metrics_file_path,
+                        metrics_config.prometheus_file_path,
+                    )
+                    logging.info(
+                        f"Pipeline metrics written to {metrics_config.metrics_file_path}"
+                    )
+            return results[training_pipeline.DATA_TRANSFORMATION_DIR_NAME]
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
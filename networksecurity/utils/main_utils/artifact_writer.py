@@ -0,0 +1,113 @@
+import contextvars
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+
+
+class ArtifactWriter:
+    """
+    Writes stage artifacts to disk on behalf of the pipeline components.
+
+    With ``persist=False`` nothing is written and stages hand their data over in
+    memory only. With ``asynchronous=True`` writes run on a background thread pool
+    so the next stage can start while the previous stage's files are flushed; call
+    ``wait`` before relying on the files, or ``call_when_done`` to act on them
+    without blocking. Submitted objects must not be mutated
+    after submission.
+    """
+
+    def __init__(
+        self, persist: bool = True, asynchronous: bool = False, max_workers: int = 2
+    ) -> None:
+        try:
+            self.persist = persist
+            self.asynchronous = asynchronous
+            self._executor = (
+                ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="artifact-writer"
+                )
+                if persist and asynchronous
+                else None
+            )
+            self._futures: List[Future] = []
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def submit(self, write_function: Callable, *args, **kwargs) -> None:
+        """
+        Runs ``write_function(*args, **kwargs)`` now, in the background, or not at
+        all, depending on how the writer was configured.
+        """
+        try:
+            if not self.persist:
+                return
+            if self._executor is None:
+                write_function(*args, **kwargs)
+                return
+            ## Run in the caller's context so the write is attributed to its stage
+            context = contextvars.copy_context()
+            self._futures.append(
+                self._executor.submit(context.run, write_function, *args, **kwargs)
+            )
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def call_when_done(self, callback: Callable[[], None]) -> None:
+        """
+        Calls ``callback`` once every write submitted so far has finished, right
+        away when none is pending. It is skipped when one of those writes failed,
+        and ``wait`` re-raises its failure as well as the callback's own.
+        """
+        try:
+            futures = list(self._futures)
+            if not futures:
+                callback()
+                return
+            done = Future()
+            self._futures.append(done)
+            remaining = [len(futures)]
+            lock = threading.Lock()
+
+            def on_write_done(_: Future) -> None:
+                with lock:
+                    remaining[0] -= 1
+                    if remaining[0]:
+                        return
+                try:
+                    if all(future.exception() is None for future in futures):
+                        callback()
+                    done.set_result(None)
+                except BaseException as error:
+                    done.set_exception(error)
+
+            for future in futures:
+                future.add_done_callback(on_write_done)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def wait(self) -> None:
+        """
+        Blocks until every submitted write has finished and re-raises the first
+        failure.
+        """
+        futures, self._futures = self._futures, []
+        errors = [future.exception() for future in futures]
+        errors = [error for error in errors if error is not None]
+        if errors:
+            logging.error(f"{len(errors)} artifact writes failed")
+            raise errors[0]
+
+    def close(self) -> None:
+        """
+        Waits for pending writes and shuts the background pool down.
+        """
+        try:
+            self.wait()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
@@ -0,0 +1,136 @@
+import numpy as np
+
+## Every value takes 2 bits of a row's uint64 key: -1, 0 and 1 are stored as
+## 0, 1 and 2, a missing value as 3. The 30 features and the label fit in 62 bits.
+PACKED_BITS_PER_VALUE = 2
+PACKED_MAX_COLUMNS = 64 // PACKED_BITS_PER_VALUE
+PACKED_MISSING_CODE = 3
+PACKED_VALUES = (-1, 0, 1)
+
+
+def get_2d_rows(values: np.ndarray) -> np.ndarray:
+    if values.ndim != 2:
+        raise ValueError(f"Expected a 2-D array of rows, got {values.ndim} dimensions")
+    return values
+
+
+def get_columns(values) -> list[np.ndarray]:
+    """
+    The columns of a DataFrame or of a 2-D array, without copying the data.
+    """
+    if hasattr(values, "columns"):
+        return [values[name].to_numpy() for name in values.columns]
+    values = get_2d_rows(np.asarray(values))
+    return [values[:, index] for index in range(values.shape[1])]
+
+
+def can_pack(values) -> bool:
+    """
+    Whether the rows have at most PACKED_MAX_COLUMNS columns holding only -1, 0,
+    1 and missing values.
+    """
+    if not hasattr(values, "columns"):
+        values = np.asarray(values)
+        if values.dtype.kind not in "iuf":
+            return False
+        return bool(get_packable_rows(get_2d_rows(values)).all())
+    columns = get_columns(values)
+    if len(columns) > PACKED_MAX_COLUMNS:
+        return False
+    for column in columns:
+        if column.dtype.kind not in "iuf":
+            return False
+        present = column[~np.isnan(column)] if column.dtype.kind == "f" else column
+        if not np.isin(present, PACKED_VALUES).all():
+            return False
+    return True
+
+
+def get_packable_rows(values: np.ndarray) -> np.ndarray:
+    """
+    Boolean mask of the rows of a 2-D float array that hold only -1, 0, 1 and
+    missing values; all False when there are too many columns to pack.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.shape[1] > PACKED_MAX_COLUMNS:
+        return np.zeros(len(values), dtype=bool)
+    return (np.isnan(values) | np.isin(values, PACKED_VALUES)).all(axis=1)
+
+
+def pack_rows(values) -> np.ndarray:
+    """
+    Encodes every row of ternary values as one uint64, the first column in the
+    lowest bits. Raises ValueError for rows that do not fit, see can_pack.
+    Arrays are encoded in one pass, DataFrames column by column so that they are
+    not copied into one array first.
+    """
+    if not can_pack(values):
+        raise ValueError(
+            f"Only rows of at most {PACKED_MAX_COLUMNS} columns of -1, 0, 1 or "
+            f"missing values can be packed"
+        )
+    if not hasattr(values, "columns"):
+        values = np.asarray(values)
+        codes = np.where(np.isnan(values), PACKED_MISSING_CODE, values + 1).astype(
+            np.uint64
+        )
+        codes <<= np.arange(values.shape[1], dtype=np.uint64) * np.uint64(
+            PACKED_BITS_PER_VALUE
+        )
+        return np.bitwise_or.reduce(codes, axis=1)
+    columns = get_columns(values)
+    keys = np.zeros(len(columns[0]) if columns else 0, dtype=np.uint64)
+    for index, column in enumerate(columns):
+        codes = np.empty(len(column), dtype=np.uint64)
+        if column.dtype.kind == "f":
+            missing = np.isnan(column)
+            codes[~missing] = column[~missing] + 1
+            codes[missing] = PACKED_MISSING_CODE
+        else:
+            codes[:] = column + 1
+        codes <<= np.uint64(index * PACKED_BITS_PER_VALUE)
+        keys |= codes
+    return keys
+
+
+def unpack_columns(keys: np.ndarray, n_columns: int) -> list[np.ndarray]:
+    """
+    Decodes packed rows into their columns: int8 for a column without missing
+    values, float32 with NaN for one with.
+    """
+    keys = np.asarray(keys, dtype=np.uint64)
+    columns = []
+    for index in range(n_columns):
+        codes = (keys >> np.uint64(index * PACKED_BITS_PER_VALUE)) & np.uint64(
+            PACKED_MISSING_CODE
+        )
+        values = codes.astype(np.int8) - np.int8(1)
+        missing = codes == PACKED_MISSING_CODE
+        if missing.any():
+            values = values.astype(np.float32)
+            values[missing] = np.nan
+        columns.append(values)
+    return columns
+
+
+def unpack_rows(keys: np.ndarray, n_columns: int) -> np.ndarray:
+    """
+    Decodes packed rows into a float64 array with NaN for missing values.
+    """
+    return np.column_stack(
+        [column.astype(np.float64) for column in unpack_columns(keys, n_columns)]
+    ).reshape(len(keys), n_columns)
+
+
+def deduplicate_rows(values) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Collapses identical rows, missing values included. Returns the index of the
+    first occurrence of every distinct row, the position of every row among
+    them and how often each occurs, so ``values[first][inverse]`` rebuilds the
+    rows and the counts serve as sample weights.
+    """
+    keys = pack_rows(values)
+    _, first, inverse, counts = np.unique(
+        keys, return_index=True, return_inverse=True, return_counts=True
+    )
+    return first, inverse.reshape(-1), counts
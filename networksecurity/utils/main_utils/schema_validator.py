@@ -0,0 +1,177 @@
+import sys
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.utils.main_utils.utils import read_yaml_file
+
+## dtype kinds accepted for each schema dtype kind. Integer columns holding
+## missing values are read back as floats, their values are checked by the domain
+COMPATIBLE_DTYPE_KINDS = {
+    "i": "iuf",
+    "u": "iuf",
+    "f": "iuf",
+    "b": "b",
+    "O": "OSU",
+}
+
+
+@dataclass
+class SchemaValidationReport:
+    """
+    Outcome of SchemaValidator.validate. ``structure_errors`` (columns, order,
+    dtypes) and ``value_errors`` (null rates) are dataset level problems,
+    ``invalid_row_mask`` marks the rows that break a row level rule.
+    """
+
+    structure_errors: list[str]
+    value_errors: list[str]
+    invalid_row_mask: np.ndarray = field(repr=False)
+    null_rates: dict[str, float]
+    invalid_value_counts: dict[str, int]
+
+    @property
+    def errors(self) -> list[str]:
+        return self.structure_errors + self.value_errors
+
+    @property
+    def status(self) -> bool:
+        return not self.errors
+
+    @property
+    def n_invalid_rows(self) -> int:
+        return int(self.invalid_row_mask.sum())
+
+
+class SchemaValidator:
+    """
+    Validates DataFrames against data_schema/schema.yaml.
+
+    The schema is compiled once into the expected column order, dtypes, the
+    sorted domain of allowed values, the null-rate limit and the not-null
+    columns. ``validate`` then checks every column with whole-column numpy
+    operations, so the cost grows with the number of columns rather than rows.
+    """
+
+    def __init__(self, schema: dict) -> None:
+        try:
+            self.columns: list[str] = []
+            self.dtypes: dict[str, np.dtype] = {}
+            for column in schema["columns"]:
+                (name, dtype), *_ = column.items()
+                self.columns.append(name)
+                self.dtypes[name] = np.dtype(dtype)
+            self.numerical_columns: list[str] = list(
+                schema.get("numerical_columns", [])
+            )
+            allowed_values = schema.get("allowed_values")
+            self.allowed_values = (
+                None
+                if allowed_values is None
+                else np.unique(np.asarray(allowed_values, dtype=np.float64))
+            )
+            self.max_null_rate: float | None = schema.get("max_null_rate")
+            self.not_null_columns: list[str] = list(schema.get("not_null_columns", []))
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @classmethod
+    def from_file(cls, schema_file_path: str) -> "SchemaValidator":
+        return cls(read_yaml_file(schema_file_path))
+
+    def check_columns(self, dataframe: pd.DataFrame) -> list[str]:
+        """
+        Returns errors for missing, unexpected or reordered columns.
+        """
+        actual_columns = [str(column) for column in dataframe.columns]
+        errors = []
+        missing = [column for column in self.columns if column not in actual_columns]
+        unexpected = [column for column in actual_columns if column not in self.dtypes]
+        if missing:
+            errors.append(f"Missing columns: {missing}")
+        if unexpected:
+            errors.append(f"Unexpected columns: {unexpected}")
+        if not missing and not unexpected and actual_columns != self.columns:
+            errors.append(f"Columns are not in schema order: {actual_columns}")
+        return errors
+
+    def check_dtypes(self, dataframe: pd.DataFrame) -> list[str]:
+        """
+        Returns errors for columns whose dtype cannot hold the schema dtype, and
+        for schema numerical columns that are not numeric.
+        """
+        errors = []
+        for column, expected_dtype in self.dtypes.items():
+            if column not in dataframe.columns:
+                continue
+            actual_dtype = dataframe[column].dtype
+            compatible = COMPATIBLE_DTYPE_KINDS.get(
+                expected_dtype.kind, expected_dtype.kind
+            )
+            if getattr(actual_dtype, "kind", "O") not in compatible:
+                errors.append(
+                    f"Column {column} has dtype {actual_dtype}, expected {expected_dtype}"
+                )
+        for column in self.numerical_columns:
+            if column in dataframe.columns and not pd.api.types.is_numeric_dtype(
+                dataframe[column]
+            ):
+                errors.append(f"Numerical column {column} is not numeric")
+        return errors
+
+    def check_values(
+        self, dataframe: pd.DataFrame
+    ) -> tuple[np.ndarray, dict[str, float], dict[str, int]]:
+        """
+        One pass over the numeric schema columns. Returns the invalid row mask, the
+        null rate of every column and the number of out-of-domain values per column.
+        """
+        invalid_row_mask = np.zeros(len(dataframe), dtype=bool)
+        null_rates: dict[str, float] = {}
+        invalid_value_counts: dict[str, int] = {}
+        for column in self.columns:
+            if column not in dataframe.columns:
+                continue
+            series = dataframe[column]
+            if not pd.api.types.is_numeric_dtype(series):
+                continue
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            null_mask = np.isnan(values)
+            null_rates[column] = float(null_mask.mean()) if len(values) else 0.0
+            if column in self.not_null_columns:
+                invalid_row_mask |= null_mask
+            if self.allowed_values is not None:
+                out_of_domain = ~np.isin(values, self.allowed_values) & ~null_mask
+                n_invalid = int(out_of_domain.sum())
+                if n_invalid:
+                    invalid_value_counts[column] = n_invalid
+                    invalid_row_mask |= out_of_domain
+        return invalid_row_mask, null_rates, invalid_value_counts
+
+    def validate(self, dataframe: pd.DataFrame) -> SchemaValidationReport:
+        try:
+            structure_errors = self.check_columns(dataframe) + self.check_dtypes(
+                dataframe
+            )
+            invalid_row_mask, null_rates, invalid_value_counts = self.check_values(
+                dataframe
+            )
+            value_errors = []
+            if self.max_null_rate is not None:
+                for column, null_rate in null_rates.items():
+                    if null_rate > self.max_null_rate:
+                        value_errors.append(
+                            f"Column {column} has null rate {null_rate:.4f}, "
+                            f"above {self.max_null_rate}"
+                        )
+            return SchemaValidationReport(
+                structure_errors=structure_errors,
+                value_errors=value_errors,
+                invalid_row_mask=invalid_row_mask,
+                null_rates=null_rates,
+                invalid_value_counts=invalid_value_counts,
+            )
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
@@ -1,12 +1,27 @@
 import yaml
 from networksecurity.exception.exception import NetworkSecurityException
 from networksecurity.logging.logger import logging
+from networksecurity.logging.metrics import track_io
 import os, sys
+import time
+import uuid
 import numpy as np
-import dill
+import pandas as pd
 import pickle
+from networksecurity.utils.main_utils.packed_rows import (
+    can_pack,
+    pack_rows,
+    unpack_columns,
+)
 
+DATAFRAME_FILE_FORMATS = ("csv", "parquet", "feather", "npy", "packed")
+## Arrays of objects at least this large are stored as separate memory-mappable files
+OBJECT_ARRAY_MIN_BYTES = 1 << 16
+## Times load_object starts over when newer saves removed the arrays it was reading
+OBJECT_LOAD_ATTEMPTS = 5
 
+
+@track_io("read")
 def read_yaml_file(file_path: str) -> dict:
     """
     Reads a YAML file and returns its content as a dictionary.
@@ -18,6 +33,7 @@ def read_yaml_file(file_path: str) -> dict:
         raise NetworkSecurityException(e, sys)  # type: ignore
 
 
+@track_io("written")
 def write_yaml_file(file_path: str, content: object, replace: bool = False) -> None:
     """
     Writes content to a YAML file. If replace is True, it overwrites the file.
@@ -33,6 +49,7 @@ def write_yaml_file(file_path: str, content: object, replace: bool = False) -> N
         raise NetworkSecurityException(e, sys)  # type: ignore
 
 
+@track_io("written")
 def save_numpy_array_data(file_path: str, array: np.ndarray) -> None:
     """
     Saves a NumPy array to a file.
@@ -44,13 +61,288 @@ def save_numpy_array_data(file_path: str, array: np.ndarray) -> None:
     except Exception as e:
         raise NetworkSecurityException(e, sys)  # type: ignore
 
-def save_object(file_path: str, obj: object) -> None:
+
+@track_io("read")
+def load_numpy_array_data(file_path: str, mmap_mode: str | None = None) -> np.ndarray:
+    """
+    Loads a NumPy array saved by save_numpy_array_data. With mmap_mode ("r", "r+"
+    or "c") the array is memory-mapped instead of read into memory.
+    """
+    try:
+        return np.load(file_path, mmap_mode=mmap_mode, allow_pickle=False)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)  # type: ignore
+
+
+def get_dataframe_file_format(file_path: str) -> str:
+    """
+    Returns the artifact format of a DataFrame file from its extension.
+    """
+    file_format = os.path.splitext(file_path)[1].lstrip(".").lower()
+    if file_format not in DATAFRAME_FILE_FORMATS:
+        raise ValueError(f"Unsupported DataFrame file format: {file_path}")
+    return file_format
+
+
+def compact_dataframe_dtypes(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """
+    Narrows small integer valued columns for the binary artifact formats: int8
+    when a column has no missing values, float32 when it does. Both are exact for
+    the ternary feature values.
+    """
+    columns = {}
+    for name in dataframe.columns:
+        values = dataframe[name].to_numpy()
+        if values.dtype.kind in "iuf" and len(values) > 0:
+            finite = values[~np.isnan(values)] if values.dtype.kind == "f" else values
+            is_small_integer = len(finite) == 0 or (
+                np.array_equal(finite, np.round(finite))
+                and finite.min() >= np.iinfo(np.int8).min
+                and finite.max() <= np.iinfo(np.int8).max
+            )
+            if is_small_integer:
+                if len(finite) == len(values):
+                    values = values.astype(np.int8)
+                else:
+                    values = values.astype(np.float32)
+        columns[name] = values
+    return pd.DataFrame(columns, columns=dataframe.columns)
+
+
+def save_packed_dataframe(file_path: str, dataframe: pd.DataFrame) -> None:
+    """
+    Saves a DataFrame of ternary values as one uint64 key per row plus the column
+    names, in an uncompressed npz. Frames with other values (rows routed to the
+    invalid files) are kept as a structured array in the same container.
+    """
+    arrays = {"columns": np.asarray(dataframe.columns, dtype=str)}
+    if can_pack(dataframe):
+        arrays["keys"] = pack_rows(dataframe)
+    else:
+        arrays["records"] = dataframe.to_records(index=False).view(np.ndarray)
+    with open(file_path, "wb") as file_obj:
+        np.savez(file_obj, **arrays)
+
+
+def load_packed_dataframe(file_path: str) -> pd.DataFrame:
+    with np.load(file_path, allow_pickle=False) as arrays:
+        columns = arrays["columns"].tolist()
+        if "records" in arrays:
+            records = arrays["records"]
+            return pd.DataFrame({name: records[name] for name in columns})
+        values = unpack_columns(arrays["keys"], len(columns))
+    return pd.DataFrame(dict(zip(columns, values)), columns=columns, copy=False)
+
+
+@track_io("written")
+def save_dataframe(file_path: str, dataframe: pd.DataFrame) -> None:
     """
-    Saves an object to a file using dill.
+    Saves a DataFrame in the format given by the file extension: csv, parquet,
+    feather, npy or packed. The npy format is a structured array with one field per
+    column, the packed format 2 bits per value, see save_packed_dataframe.
     """
     try:
+        file_format = get_dataframe_file_format(file_path)
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, "wb") as file_obj:
-            pickle.dump(obj, file_obj)
+        if file_format == "csv":
+            dataframe.to_csv(file_path, index=False, header=True)
+            return
+        dataframe = compact_dataframe_dtypes(dataframe)
+        if file_format == "parquet":
+            dataframe.to_parquet(file_path, index=False)
+        elif file_format == "feather":
+            ## Uncompressed so the file can be memory-mapped on read
+            dataframe.reset_index(drop=True).to_feather(
+                file_path, compression="uncompressed"
+            )
+        elif file_format == "packed":
+            save_packed_dataframe(file_path, dataframe)
+        else:
+            save_numpy_array_data(
+                file_path, dataframe.to_records(index=False).view(np.ndarray)
+            )
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)  # type: ignore
+
+
+@track_io("read")
+def load_dataframe(file_path: str, mmap: bool = False) -> pd.DataFrame:
+    """
+    Loads a DataFrame saved by save_dataframe. With mmap the binary formats are
+    memory-mapped; for npy the columns of the returned frame are views on the map.
+    """
+    try:
+        file_format = get_dataframe_file_format(file_path)
+        if file_format == "csv":
+            return pd.read_csv(file_path)
+        if file_format == "parquet":
+            return pd.read_parquet(file_path, memory_map=mmap)
+        if file_format == "feather":
+            from pyarrow import feather
+
+            return feather.read_table(file_path, memory_map=mmap).to_pandas()
+        if file_format == "packed":
+            return load_packed_dataframe(file_path)
+        records = load_numpy_array_data(file_path, mmap_mode="r" if mmap else None)
+        return pd.DataFrame(
+            {name: records[name] for name in records.dtype.names},
+            columns=list(records.dtype.names),
+            copy=False,
+        )
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)  # type: ignore
+
+
+def get_object_array_dir(file_path: str) -> str:
+    """
+    Directory holding the arrays save_object stores next to an object file.
+    """
+    return f"{file_path}.arrays"
+
+
+class ArrayPickler(pickle.Pickler):
+    """
+    Pickler that writes every NumPy array of at least ``min_bytes`` to its own
+    uncompressed ``.npy`` file in ``array_dir``, named after ``generation``, and
+    pickles a reference instead. Every file appears complete or not at all.
+    """
+
+    def __init__(
+        self, file_obj, array_dir: str, min_bytes: int, generation: str = ""
+    ) -> None:
+        super().__init__(file_obj, protocol=pickle.HIGHEST_PROTOCOL)
+        self.array_dir = array_dir
+        self.min_bytes = min_bytes
+        self.generation = generation
+        ## id -> (file name, array), the array is kept so its id stays unique
+        self.array_files: dict[int, tuple[str, np.ndarray]] = {}
+
+    def persistent_id(self, obj):
+        if (
+            not isinstance(obj, np.ndarray)
+            or obj.dtype.hasobject
+            or obj.nbytes < self.min_bytes
+        ):
+            return None
+        if id(obj) not in self.array_files:
+            file_name = f"{self.generation}-{len(self.array_files)}.npy"
+            file_path = os.path.join(self.array_dir, file_name)
+            os.makedirs(self.array_dir, exist_ok=True)
+            with open(f"{file_path}.tmp", "wb") as array_file:
+                np.save(array_file, obj, allow_pickle=False)
+            os.replace(f"{file_path}.tmp", file_path)
+            self.array_files[id(obj)] = (file_name, obj)
+        return ("ndarray", self.array_files[id(obj)][0])
+
+
+class ArrayUnpickler(pickle.Unpickler):
+    """
+    Unpickler for ArrayPickler files, loading the referenced arrays memory-mapped
+    read-only when ``mmap`` is set.
+    """
+
+    def __init__(self, file_obj, array_dir: str, mmap: bool) -> None:
+        super().__init__(file_obj)
+        self.array_dir = array_dir
+        self.mmap_mode = "r" if mmap else None
+
+    def persistent_load(self, pid):
+        kind, file_name = pid
+        if kind != "ndarray":
+            raise pickle.UnpicklingError(f"Unsupported persistent id: {pid}")
+        return np.load(
+            os.path.join(self.array_dir, file_name),
+            mmap_mode=self.mmap_mode,
+            allow_pickle=False,
+        )
+
+
+def get_array_generation(file_name: str) -> str:
+    """
+    The save an array file of get_object_array_dir belongs to; "" for files
+    written before saves had generations.
+    """
+    return file_name.rpartition("-")[0]
+
+
+def remove_old_object_arrays(array_dir: str, generation: str) -> None:
+    """
+    Removes the arrays of the saves before the one preceding ``generation``.
+    The preceding save's arrays stay for readers that opened its pickle.
+    """
+    if not os.path.isdir(array_dir):
+        return
+    names = os.listdir(array_dir)
+    older = sorted(
+        {get_array_generation(name) for name in names} - {generation}, reverse=True
+    )
+    for name in names:
+        if get_array_generation(name) in older[1:]:
+            os.remove(os.path.join(array_dir, name))
+    if not os.listdir(array_dir):
+        os.rmdir(array_dir)
+
+
+@track_io("written")
+def save_object(
+    file_path: str, obj: object, array_min_bytes: int | None = OBJECT_ARRAY_MIN_BYTES
+) -> None:
+    """
+    Pickles an object. NumPy arrays of at least ``array_min_bytes``, such as the
+    training matrix a fitted KNN imputer keeps, are written as ``.npy`` files to
+    get_object_array_dir(file_path) so load_object can memory-map them; with None
+    everything goes into the pickle.
+
+    The arrays of every save are named after a new generation and the pickle
+    replaces ``file_path`` only once it is complete, so a concurrent load_object
+    sees the whole old or the whole new object.
+    """
+    try:
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+        array_dir = get_object_array_dir(file_path)
+        ## Time ordered, so the arrays of older saves can be told apart
+        generation = f"{time.time_ns():020d}.{uuid.uuid4().hex[:8]}"
+        temp_file_path = f"{file_path}.{generation}.tmp"
+        try:
+            with open(temp_file_path, "wb") as file_obj:
+                if array_min_bytes is None:
+                    pickle.dump(obj, file_obj, protocol=pickle.HIGHEST_PROTOCOL)
+                else:
+                    pickler = ArrayPickler(
+                        file_obj, array_dir, array_min_bytes, generation
+                    )
+                    pickler.dump(obj)
+            os.replace(temp_file_path, file_path)
+        finally:
+            if os.path.exists(temp_file_path):
+                os.remove(temp_file_path)
+        remove_old_object_arrays(array_dir, generation)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)  # type: ignore
+
+
+@track_io("read")
+def load_object(file_path: str, mmap: bool = True) -> object:
+    """
+    Loads an object saved by save_object. Its separately stored arrays are
+    memory-mapped read-only, so processes loading the same file share one copy of
+    them in the page cache; with mmap=False they are read into memory.
+
+    An array can only be missing when newer saves replaced the object while it
+    was being read, in which case the load starts over from the new pickle.
+    """
+    try:
+        if not os.path.exists(file_path):
+            raise Exception(f"The file: {file_path} does not exist")
+        for attempt in range(OBJECT_LOAD_ATTEMPTS):
+            try:
+                with open(file_path, "rb") as file_obj:
+                    return ArrayUnpickler(
+                        file_obj, get_object_array_dir(file_path), mmap
+                    ).load()
+            except FileNotFoundError:
+                if attempt == OBJECT_LOAD_ATTEMPTS - 1:
+                    raise
+                logging.info(f"{file_path} was saved again while loading, retrying")
     except Exception as e:
         raise NetworkSecurityException(e, sys)  # type: ignore
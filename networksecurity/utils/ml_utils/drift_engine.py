@@ -0,0 +1,233 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from math import gcd
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import NetworkSecurityException
+
+## scipy's ks_2samp computes exact p-values up to this sample size
+KS_MAX_EXACT_N = 10000
+## Integer valued data spanning at most this many values is binned without sorting
+MAX_DENSE_VALUE_RANGE = 4096
+PSI_EPSILON = 1e-6
+## Cells per block when binning, bounds the size of the temporary code array
+HISTOGRAM_BLOCK_CELLS = 1 << 22
+
+
+@lru_cache(maxsize=4096)
+def exact_ks_pvalue(n1: int, n2: int, statistic: float) -> float:
+    """
+    Exact two-sided two-sample KS p-value. It only depends on the sample sizes and
+    the statistic, so it is shared by every column with the same statistic.
+    """
+    from scipy.stats import kstwo
+
+    try:
+        from scipy.stats._stats_py import _attempt_exact_2kssamp
+    except ImportError:
+        ## Private in scipy; without it use the same asymptotic formula as 'asymp'
+        m, n = max(n1, n2), min(n1, n2)
+        return float(np.clip(kstwo.sf(statistic, np.round(m * n / (m + n))), 0, 1))
+    success, _, pvalue = _attempt_exact_2kssamp(
+        n1, n2, gcd(n1, n2), statistic, "two-sided"
+    )
+    if not success:
+        m, n = max(n1, n2), min(n1, n2)
+        pvalue = kstwo.sf(statistic, np.round(m * n / (m + n)))
+    return float(np.clip(pvalue, 0, 1))
+
+
+class DriftEngine:
+    """
+    Bulk drift statistics for features that take a few discrete values.
+
+    Both frames are reduced to per-column value-count histograms in one vectorized
+    pass (a searchsorted plus a single bincount over all columns), and the KS,
+    chi-square and PSI statistics of every column are then computed from the
+    histograms at once. KS p-values match scipy.stats.ks_2samp, including its
+    exact mode for small samples and NaN propagation.
+    """
+
+    def __init__(self, threshold: float = 0.05, n_jobs: int = 1) -> None:
+        self.threshold = threshold
+        self.n_jobs = n_jobs
+
+    @staticmethod
+    def get_histogram_values(*arrays: np.ndarray) -> np.ndarray:
+        """
+        Returns the sorted grid of distinct finite values found in the arrays.
+        Small integer ranges are returned as a dense range without sorting the data.
+        """
+        try:
+            finite = [array[~np.isnan(array)] for array in arrays]
+            finite = [array for array in finite if array.size]
+            if not finite:
+                return np.empty(0, dtype=np.float64)
+            low = min(float(array.min()) for array in finite)
+            high = max(float(array.max()) for array in finite)
+            is_integral = all(
+                np.array_equal(array, np.floor(array)) for array in finite
+            )
+            if is_integral and high - low < MAX_DENSE_VALUE_RANGE:
+                return np.arange(low, high + 1, dtype=np.float64)
+            return np.unique(np.concatenate([np.unique(array) for array in finite]))
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @staticmethod
+    def value_histograms(data: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """
+        Returns ``counts`` of shape (n_columns, len(values) + 1) where
+        ``counts[c, k]`` is how often column ``c`` equals ``values[k]``; the last
+        slot counts NaN. Every finite value must be present in ``values``.
+        """
+        try:
+            n_rows, n_columns = data.shape
+            n_slots = len(values) + 1
+            offsets = np.arange(n_columns) * n_slots
+            counts = np.zeros(n_columns * n_slots, dtype=np.int64)
+            block_rows = max(1, HISTOGRAM_BLOCK_CELLS // max(n_columns, 1))
+            for start in range(0, n_rows, block_rows):
+                ## NaN sorts after every value, so it lands in the last slot
+                codes = np.searchsorted(values, data[start : start + block_rows])
+                codes += offsets
+                counts += np.bincount(codes.ravel(), minlength=len(counts))
+            return counts.reshape(n_columns, n_slots)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def compute_histograms(self, data: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """
+        value_histograms, spread over ``n_jobs`` threads by row blocks.
+        """
+        try:
+            if self.n_jobs <= 1 or len(data) < 2 * self.n_jobs:
+                return DriftEngine.value_histograms(data, values)
+            bounds = np.linspace(0, len(data), self.n_jobs + 1).astype(int)
+            with ThreadPoolExecutor(max_workers=self.n_jobs) as executor:
+                results = executor.map(
+                    lambda bound: DriftEngine.value_histograms(
+                        data[bound[0] : bound[1]], values
+                    ),
+                    zip(bounds[:-1], bounds[1:]),
+                )
+                return sum(results)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @staticmethod
+    def compare_histograms(
+        base_counts: np.ndarray, current_counts: np.ndarray, propagate_nan: bool = True
+    ) -> dict:
+        """
+        Computes per-column KS, chi-square and PSI statistics from two histograms
+        laid out as returned by value_histograms. Returns a dict of arrays.
+        Without ``propagate_nan`` missing values are ignored instead of turning
+        the statistics of their column into NaN.
+        """
+        try:
+            from scipy.stats import chi2, kstwo
+
+            has_nan = (base_counts[:, -1] > 0) | (current_counts[:, -1] > 0)
+            has_nan &= propagate_nan
+            base = base_counts[:, :-1].astype(np.float64)
+            current = current_counts[:, :-1].astype(np.float64)
+            n_base = base.sum(axis=1)
+            n_current = current.sum(axis=1)
+
+            ## Kolmogorov-Smirnov on the empirical CDFs over the value grid
+            base_cdf = np.cumsum(base, axis=1) / n_base[:, None]
+            current_cdf = np.cumsum(current, axis=1) / n_current[:, None]
+            ks_statistic = np.abs(base_cdf - current_cdf).max(axis=1, initial=0.0)
+            ks_pvalue = np.empty(len(ks_statistic))
+            for column, statistic in enumerate(ks_statistic):
+                n1, n2 = int(n_base[column]), int(n_current[column])
+                if max(n1, n2) <= KS_MAX_EXACT_N:
+                    ks_pvalue[column] = exact_ks_pvalue(n1, n2, float(statistic))
+                else:
+                    m, n = max(n1, n2), min(n1, n2)
+                    ks_pvalue[column] = np.clip(
+                        kstwo.sf(statistic, np.round(m * n / (m + n))), 0, 1
+                    )
+
+            ## Chi-square test of homogeneity on the 2 x k contingency tables
+            totals = base + current
+            observed_values = totals > 0
+            n_total = (n_base + n_current)[:, None]
+            expected_base = totals * n_base[:, None] / n_total
+            expected_current = totals * n_current[:, None] / n_total
+            with np.errstate(divide="ignore", invalid="ignore"):
+                chi2_terms = np.where(
+                    observed_values,
+                    (base - expected_base) ** 2 / expected_base
+                    + (current - expected_current) ** 2 / expected_current,
+                    0.0,
+                )
+            chi2_statistic = chi2_terms.sum(axis=1)
+            degrees_of_freedom = np.maximum(observed_values.sum(axis=1) - 1, 1)
+            chi2_pvalue = chi2.sf(chi2_statistic, degrees_of_freedom)
+
+            ## Population stability index
+            base_share = np.clip(base / n_base[:, None], PSI_EPSILON, None)
+            current_share = np.clip(current / n_current[:, None], PSI_EPSILON, None)
+            psi = (
+                (current_share - base_share) * np.log(current_share / base_share)
+            ).sum(axis=1)
+
+            ## Like ks_2samp's default nan_policy, NaN propagates to the statistics
+            for statistics in (
+                ks_statistic,
+                ks_pvalue,
+                chi2_statistic,
+                chi2_pvalue,
+                psi,
+            ):
+                statistics[has_nan] = np.nan
+            return {
+                "ks_statistic": ks_statistic,
+                "p_value": ks_pvalue,
+                "chi2_statistic": chi2_statistic,
+                "chi2_p_value": chi2_pvalue,
+                "psi": psi,
+            }
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def detect(
+        self, base_dataframe: pd.DataFrame, current_dataframe: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Returns one row of drift statistics per column of ``base_dataframe``. A
+        column drifts when its KS p-value is below the threshold (or is NaN).
+        """
+        try:
+            columns = list(base_dataframe.columns)
+            base = base_dataframe[columns].to_numpy(dtype=np.float64)
+            current = current_dataframe[columns].to_numpy(dtype=np.float64)
+            values = DriftEngine.get_histogram_values(base, current)
+            statistics = DriftEngine.compare_histograms(
+                self.compute_histograms(base, values),
+                self.compute_histograms(current, values),
+            )
+            result = pd.DataFrame(statistics, index=columns)
+            result["drift_detected"] = ~(self.threshold <= result["p_value"])
+            return result
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @staticmethod
+    def to_report(result: pd.DataFrame) -> dict:
+        """
+        Converts detect() output to the report.yaml structure written by
+        DataValidation.
+        """
+        return {
+            column: {
+                "p_value": float(row["p_value"]),
+                "drift_detected": bool(row["drift_detected"]),
+            }
+            for column, row in result.iterrows()
+        }
@@ -0,0 +1,169 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import logging
+from networksecurity.utils.main_utils.utils import read_yaml_file, write_yaml_file
+from networksecurity.utils.ml_utils.drift_engine import DriftEngine
+
+## A sketch is meant for discrete features: refuse to grow past this many values
+MAX_SKETCH_VALUES = 1024
+
+
+class DriftSketch:
+    """
+    Compact per-column value histogram of a dataset: the sorted value grid and one
+    count per (column, value), plus the NaN count, in the layout used by
+    DriftEngine. Its size depends on the number of distinct values, not on the
+    number of rows, and it can be updated one chunk at a time.
+    """
+
+    def __init__(self, columns: list, values: np.ndarray, counts: np.ndarray) -> None:
+        self.columns = list(columns)
+        self.values = np.asarray(values, dtype=np.float64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+
+    @classmethod
+    def empty(cls, columns: list, values=()) -> "DriftSketch":
+        values = np.asarray(values, dtype=np.float64)
+        return cls(columns, values, np.zeros((len(columns), len(values) + 1)))
+
+    @classmethod
+    def from_dataframe(cls, dataframe: pd.DataFrame) -> "DriftSketch":
+        try:
+            sketch = cls.empty(list(dataframe.columns))
+            sketch.update(dataframe)
+            return sketch
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @property
+    def n_rows(self) -> int:
+        return int(self.counts[0].sum()) if len(self.columns) else 0
+
+    def extend_values(self, new_values: np.ndarray) -> None:
+        """
+        Adds values to the grid, moving the existing counts to their new slots.
+        """
+        values = np.union1d(self.values, new_values)
+        if len(values) > MAX_SKETCH_VALUES:
+            raise ValueError(
+                f"Drift sketch would exceed {MAX_SKETCH_VALUES} distinct values; "
+                "the columns do not look discrete"
+            )
+        counts = np.zeros((len(self.columns), len(values) + 1), dtype=np.int64)
+        counts[:, np.searchsorted(values, self.values)] = self.counts[:, :-1]
+        counts[:, -1] = self.counts[:, -1]
+        self.values, self.counts = values, counts
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Adds the rows of a chunk to the histograms.
+        """
+        try:
+            data = chunk[self.columns].to_numpy(dtype=np.float64)
+            finite = data[~np.isnan(data)]
+            known = np.isin(finite, self.values)
+            if not known.all():
+                self.extend_values(np.unique(finite[~known]))
+            self.counts += DriftEngine.value_histograms(data, self.values)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def aligned_counts(self, values: np.ndarray) -> np.ndarray:
+        """
+        Returns the counts laid out on a (larger) value grid.
+        """
+        counts = np.zeros((len(self.columns), len(values) + 1), dtype=np.int64)
+        counts[:, np.searchsorted(values, self.values)] = self.counts[:, :-1]
+        counts[:, -1] = self.counts[:, -1]
+        return counts
+
+    def save(self, file_path: str) -> None:
+        try:
+            write_yaml_file(
+                file_path,
+                {
+                    "columns": self.columns,
+                    "values": self.values.tolist(),
+                    "counts": self.counts.tolist(),
+                },
+                replace=True,
+            )
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    @classmethod
+    def load(cls, file_path: str) -> "DriftSketch":
+        try:
+            content = read_yaml_file(file_path)
+            return cls(content["columns"], content["values"], content["counts"])
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+
+class DriftMonitor:
+    """
+    Checks new data for drift against a persisted baseline sketch.
+
+    Batches are folded into a running sketch one chunk at a time, so peak memory is
+    one chunk plus two sketches regardless of how much data is checked, and the
+    training set never has to be reloaded.
+    """
+
+    def __init__(self, baseline: DriftSketch, threshold: float = 0.05) -> None:
+        self.baseline = baseline
+        self.threshold = threshold
+        self.current = DriftSketch.empty(baseline.columns, baseline.values)
+
+    @classmethod
+    def from_baseline_file(cls, file_path: str, threshold: float = 0.05):
+        return cls(DriftSketch.load(file_path), threshold=threshold)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        self.current.update(chunk)
+
+    def update_from_file(self, file_path: str, chunksize: int = 100_000) -> None:
+        """
+        Streams a CSV file into the running sketch.
+        """
+        try:
+            for chunk in pd.read_csv(file_path, chunksize=chunksize):
+                self.update(chunk)
+            logging.debug("Drift monitor has seen %d rows", self.current.n_rows)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def result(self) -> pd.DataFrame:
+        """
+        Returns per-column drift statistics of everything seen so far against the
+        baseline, in the same layout as DriftEngine.detect.
+        """
+        try:
+            values = np.union1d(self.baseline.values, self.current.values)
+            baseline_counts = self.baseline.aligned_counts(values)
+            current_counts = self.current.aligned_counts(values)
+            ## Missing values are reported as a rate instead of voiding the tests
+            statistics = DriftEngine.compare_histograms(
+                baseline_counts, current_counts, propagate_nan=False
+            )
+            result = pd.DataFrame(statistics, index=self.baseline.columns)
+            result["baseline_nan_rate"] = baseline_counts[:, -1] / max(
+                self.baseline.n_rows, 1
+            )
+            result["nan_rate"] = current_counts[:, -1] / max(self.current.n_rows, 1)
+            result["drift_detected"] = ~(self.threshold <= result["p_value"])
+            return result
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def report(self) -> dict:
+        """
+        Returns the drift report in the report.yaml structure.
+        """
+        return DriftEngine.to_report(self.result())
+
+    def reset(self) -> None:
+        self.current = DriftSketch.empty(self.baseline.columns, self.baseline.values)
@@ -0,0 +1,279 @@
+import sys
+
+import numpy as np
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.utils.validation import check_is_fitted
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.utils.main_utils.packed_rows import can_pack, deduplicate_rows
+
+## Bytes held per training row for every row of a distance block at its peak:
+## the float64 distances, the receiver/donor subset of a column and its copy
+## without the unmatched receivers (8 each), the int64 argpartition indices (8)
+## and a boolean mask (1). The temporaries of nan_euclidean_distances (matrix
+## products, the float64 cast and present_count) peak at or below this.
+DISTANCE_BLOCK_BYTES_PER_DONOR = 4 * 8 + 1
+
+
+class TernaryKNNImputer(TransformerMixin, BaseEstimator):
+    """
+    KNN imputer for small integer valued features such as the {-1, 0, 1} phishing
+    features, producing the same values as sklearn's KNNImputer.
+
+    Compared to KNNImputer it only computes distances for the rows that contain a
+    missing value, computes the nan-euclidean distances with float32 matrix
+    products (exact for small integers), and bounds the distance blocks by
+    ``working_memory`` MiB. ``strategy="mode"`` skips the neighbour search and
+    fills every gap with the most frequent training value of its column, and
+    ``fallback`` picks the value used for rows that share no observed feature
+    with any donor ("mean" like KNNImputer, or "mode").
+
+    ``fit`` takes ``sample_weight`` as integer counts, for training rows that
+    were deduplicated: a donor then stands for as many neighbours as its count,
+    which gives the values of the expanded rows up to the choice between equally
+    distant donors. Identical rows to transform are imputed once.
+    """
+
+    def __init__(
+        self,
+        missing_values=np.nan,
+        n_neighbors: int = 5,
+        weights: str = "uniform",
+        strategy: str = "knn",
+        fallback: str = "mean",
+        working_memory: int = 256,
+    ) -> None:
+        self.missing_values = missing_values
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        self.strategy = strategy
+        self.fallback = fallback
+        self.working_memory = working_memory
+
+    def _to_array(self, X) -> np.ndarray:
+        X = np.array(X, dtype=np.float64)
+        if not (
+            isinstance(self.missing_values, float) and np.isnan(self.missing_values)
+        ):
+            X[X == self.missing_values] = np.nan
+        return X
+
+    def fit(self, X, y=None, sample_weight=None):
+        try:
+            if self.weights not in ("uniform", "distance"):
+                raise ValueError(f"Unsupported weights: {self.weights}")
+            if self.strategy not in ("knn", "mode"):
+                raise ValueError(f"Unsupported strategy: {self.strategy}")
+            if self.fallback not in ("mean", "mode"):
+                raise ValueError(f"Unsupported fallback: {self.fallback}")
+            if hasattr(X, "columns"):
+                self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+            X = self._to_array(X)
+            self.n_features_in_ = X.shape[1]
+            mask = np.isnan(X)
+            self.valid_mask_ = ~mask.all(axis=0)
+
+            finite = X[~mask]
+            is_small_integer = finite.size == 0 or (
+                np.array_equal(finite, np.round(finite)) and np.abs(finite).max() < 2**7
+            )
+            ## float32 products are exact for small integers and halve the memory
+            self.fit_X_ = X.astype(np.float32 if is_small_integer else np.float64)
+            ## Fitted attributes rather than a per-process cache, so that they are
+            ## shared with transform workers and memory-mapped on load like fit_X_
+            present = ~mask
+            self.fit_filled_ = np.where(present, self.fit_X_, 0).astype(
+                self.fit_X_.dtype
+            )
+            self.fit_squared_ = self.fit_filled_ * self.fit_filled_
+            self.fit_present_ = present.astype(self.fit_X_.dtype)
+
+            self.fit_weights_ = None
+            if sample_weight is not None:
+                sample_weight = np.asarray(sample_weight, dtype=np.float64)
+                if sample_weight.shape != (len(X),):
+                    raise ValueError("sample_weight must hold one count per row")
+                if not (
+                    np.array_equal(sample_weight, np.round(sample_weight))
+                    and (sample_weight >= 1).all()
+                ):
+                    raise ValueError("sample_weight must be counts of at least 1")
+                self.fit_weights_ = sample_weight
+
+            self.column_mean_ = np.zeros(X.shape[1])
+            self.column_mode_ = np.zeros(X.shape[1])
+            for column in np.flatnonzero(self.valid_mask_):
+                present = ~mask[:, column]
+                values = X[present, column]
+                weights = None if sample_weight is None else sample_weight[present]
+                self.column_mean_[column] = np.average(values, weights=weights)
+                uniques, inverse = np.unique(values, return_inverse=True)
+                counts = np.bincount(inverse, weights=weights)
+                self.column_mode_[column] = uniques[np.argmax(counts)]
+            return self
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_fit_cache", None)
+        return state
+
+    def _get_fit_cache(self) -> dict:
+        """
+        Zero-filled training matrix, its squares and presence mask. Imputers
+        pickled before these were fitted attributes build them once per process.
+        """
+        if getattr(self, "fit_present_", None) is not None:
+            return {
+                "filled": self.fit_filled_,
+                "squared": self.fit_squared_,
+                "present": self.fit_present_,
+            }
+        cache = getattr(self, "_fit_cache", None)
+        if cache is None or cache["fit_X"] is not self.fit_X_:
+            present = ~np.isnan(self.fit_X_)
+            filled = np.where(present, self.fit_X_, 0).astype(self.fit_X_.dtype)
+            cache = {
+                "fit_X": self.fit_X_,
+                "filled": filled,
+                "squared": filled * filled,
+                "present": present.astype(self.fit_X_.dtype),
+            }
+            self._fit_cache = cache
+        return cache
+
+    def nan_euclidean_distances(self, X: np.ndarray) -> np.ndarray:
+        """
+        Distances from the rows of X to the training rows, identical to
+        sklearn's nan_euclidean_distances for small integer data.
+        """
+        cache = self._get_fit_cache()
+        present = ~np.isnan(X)
+        filled = np.where(present, X, 0).astype(self.fit_X_.dtype)
+        present = present.astype(self.fit_X_.dtype)
+        distances = (filled * filled) @ cache["present"].T
+        distances += present @ cache["squared"].T
+        distances -= 2 * (filled @ cache["filled"].T)
+        distances = distances.astype(np.float64)
+        np.clip(distances, 0, None, out=distances)
+        present_count = (present @ cache["present"].T).astype(np.float64)
+        distances[present_count == 0] = np.nan
+        np.maximum(1, present_count, out=present_count)
+        distances /= present_count
+        distances *= X.shape[1]
+        return np.sqrt(distances, out=distances)
+
+    def _impute_values(
+        self,
+        distances: np.ndarray,
+        donor_values: np.ndarray,
+        donor_counts: np.ndarray | None = None,
+    ):
+        n_neighbors = min(self.n_neighbors, distances.shape[1])
+        donors_idx = np.argpartition(distances, n_neighbors - 1, axis=1)[
+            :, :n_neighbors
+        ]
+        donors_dist = np.take_along_axis(distances, donors_idx, axis=1)
+        if self.weights == "uniform":
+            weight_matrix = np.ones_like(donors_dist)
+        else:
+            with np.errstate(divide="ignore"):
+                weight_matrix = 1.0 / donors_dist
+            zero_distance = donors_dist == 0
+            exact_rows = zero_distance.any(axis=1)
+            weight_matrix[exact_rows] = zero_distance[exact_rows]
+        weight_matrix[np.isnan(donors_dist)] = 0.0
+        if donor_counts is not None:
+            weight_matrix *= self._get_neighbour_counts(
+                donors_idx, donors_dist, donor_counts
+            )
+        donors = donor_values.take(donors_idx)
+        return (donors * weight_matrix).sum(axis=1) / weight_matrix.sum(axis=1)
+
+    def _get_neighbour_counts(
+        self, donors_idx: np.ndarray, donors_dist: np.ndarray, donor_counts: np.ndarray
+    ) -> np.ndarray:
+        """
+        How many of the ``n_neighbors`` nearest expanded rows each of the nearest
+        donors stands for: nearer donors are counted in full, the farthest
+        counted one only up to ``n_neighbors``.
+        """
+        order = np.argsort(np.where(np.isnan(donors_dist), np.inf, donors_dist), axis=1)
+        counts = donor_counts.take(np.take_along_axis(donors_idx, order, axis=1))
+        counted_before = np.cumsum(counts, axis=1) - counts
+        counted = np.clip(self.n_neighbors - counted_before, 0, counts)
+        neighbour_counts = np.empty_like(counted)
+        np.put_along_axis(neighbour_counts, order, counted, axis=1)
+        return neighbour_counts
+
+    def transform(self, X):
+        try:
+            check_is_fitted(self, "fit_X_")
+            X = self._to_array(X)
+            mask = np.isnan(X)
+            valid_mask = self.valid_mask_
+            row_missing_idx = np.flatnonzero(mask[:, valid_mask].any(axis=1))
+            if row_missing_idx.size == 0:
+                return X[:, valid_mask]
+
+            if self.strategy == "mode":
+                X[mask] = np.take(self.column_mode_, np.nonzero(mask)[1])
+                return X[:, valid_mask]
+
+            ## Identical rows get identical values: impute each distinct row once
+            receivers = X[row_missing_idx]
+            inverse = None
+            if can_pack(receivers):
+                first, inverse, _ = deduplicate_rows(receivers)
+                receivers = receivers[first]
+            imputed = self._impute_rows(receivers)
+            X[row_missing_idx] = imputed if inverse is None else imputed[inverse]
+            return X[:, valid_mask]
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def _impute_rows(self, X: np.ndarray) -> np.ndarray:
+        """
+        Returns a copy of X, rows with missing values only, with the gaps of the
+        valid columns filled from the nearest training rows.
+        """
+        mask = np.isnan(X)
+        fill_values = (
+            self.column_mean_ if self.fallback == "mean" else self.column_mode_
+        )
+        cache = self._get_fit_cache()
+        ## Imputers pickled before sample weights were supported have none
+        fit_weights = getattr(self, "fit_weights_", None)
+        n_fit = len(self.fit_X_)
+        block_rows = max(
+            1,
+            (self.working_memory << 20)
+            // max(n_fit * DISTANCE_BLOCK_BYTES_PER_DONOR, 1),
+        )
+        imputed = X.copy()
+        for start in range(0, len(X), block_rows):
+            block_idx = np.arange(start, min(start + block_rows, len(X)))
+            distances = self.nan_euclidean_distances(X[block_idx])
+            for column in np.flatnonzero(self.valid_mask_):
+                col_mask = mask[block_idx, column]
+                if not col_mask.any():
+                    continue
+                receivers = np.flatnonzero(col_mask)
+                donors_idx = np.flatnonzero(cache["present"][:, column])
+                dist_subset = distances[np.ix_(receivers, donors_idx)]
+
+                ## Receivers that share no feature with any donor
+                all_nan = np.isnan(dist_subset).all(axis=1)
+                if all_nan.any():
+                    imputed[block_idx[receivers[all_nan]], column] = fill_values[column]
+                    receivers = receivers[~all_nan]
+                    dist_subset = dist_subset[~all_nan]
+                    if receivers.size == 0:
+                        continue
+                imputed[block_idx[receivers], column] = self._impute_values(
+                    dist_subset,
+                    self.fit_X_[donors_idx, column].astype(np.float64),
+                    None if fit_weights is None else fit_weights[donors_idx],
+                )
+        return imputed
@@ -0,0 +1,268 @@
+import copy
+import multiprocessing
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.logging.logger import (
+    configure_worker_logging,
+    get_worker_log_queue,
+    logging,
+)
+from networksecurity.logging.metrics import metrics
+
+## Fitted arrays at least this large are shared with the workers instead of pickled
+SHARED_ARRAY_MIN_BYTES = 1 << 20
+
+## Per worker process state, set up once by init_transform_worker
+_worker_state: dict = {}
+
+
+def get_estimator_steps(estimator) -> list:
+    """
+    Returns the estimator followed by the steps of a sklearn Pipeline.
+    """
+    steps = [estimator]
+    for _, step in getattr(estimator, "steps", []):
+        steps.append(step)
+    return steps
+
+
+def attach_shared_memory(name: str) -> SharedMemory:
+    """
+    Attaches to a block created by the parent. The parent owns the block and
+    unlinks it; spawned workers share the parent's resource tracker, where
+    attaching on Python < 3.13 only repeats the parent's registration.
+    """
+    try:
+        return SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    except TypeError:
+        return SharedMemory(name=name)
+
+
+def init_transform_worker(
+    estimator_bytes: bytes, shared_arrays: list, output_file_path: str, log_queue
+) -> None:
+    """
+    Rebuilds the fitted estimator with its large arrays viewed from shared memory
+    and opens the output file once per worker.
+    """
+    configure_worker_logging(log_queue)
+    estimator = pickle.loads(estimator_bytes)
+    steps = get_estimator_steps(estimator)
+    handles = []
+    for step_index, attribute, name, shape, dtype in shared_arrays:
+        shared_memory = attach_shared_memory(name)
+        handles.append(shared_memory)
+        array = np.ndarray(shape, dtype=dtype, buffer=shared_memory.buf)
+        array.flags.writeable = False
+        setattr(steps[step_index], attribute, array)
+    _worker_state["estimator"] = estimator
+    _worker_state["shared_memory"] = handles
+    _worker_state["output"] = np.lib.format.open_memmap(output_file_path, mode="r+")
+
+
+def transform_chunk(start: int, X_chunk) -> int:
+    """
+    Transforms one chunk of rows and writes it into the output rows it belongs to.
+    """
+    output = _worker_state["output"]
+    transformed = _worker_state["estimator"].transform(X_chunk)
+    output[start : start + len(transformed), : transformed.shape[1]] = transformed
+    output.flush()
+    return len(transformed)
+
+
+class ParallelTransformer:
+    """
+    Applies a fitted transformer to row chunks and writes the result, followed by
+    the target column, into one preallocated array.
+
+    With ``n_jobs=1`` chunks are transformed in process into an in-memory array or
+    the output file. With more jobs the fitted arrays of the estimator are placed
+    in shared memory once, a pool of spawned workers transforms the chunks and
+    each worker writes its rows straight into an ``np.lib.format.open_memmap``
+    ``.npy`` file that already holds the target, so no full-size intermediate
+    array is built.
+    """
+
+    def __init__(self, n_jobs: int = 1, chunk_size: int = 4096) -> None:
+        self.n_jobs = (os.cpu_count() or 1) if n_jobs == -1 else max(1, n_jobs)
+        self.chunk_size = max(1, chunk_size)
+
+    @staticmethod
+    def share_estimator(estimator) -> tuple[bytes, list, list]:
+        """
+        Copies the large ndarray attributes of the estimator and its pipeline steps
+        into shared memory. Returns the pickled estimator without those arrays, the
+        descriptions the workers need to view them, and the shared memory blocks.
+        """
+        ## Shallow copies, so clearing the shared attributes leaves the caller's estimator intact
+        estimator = copy.copy(estimator)
+        if hasattr(estimator, "steps"):
+            estimator.steps = [
+                (name, copy.copy(step)) for name, step in estimator.steps
+            ]
+        steps = get_estimator_steps(estimator)
+        shared_arrays, handles = [], []
+        try:
+            for step_index, step in enumerate(steps):
+                for attribute, value in list(vars(step).items()):
+                    if (
+                        not isinstance(value, np.ndarray)
+                        or value.dtype.hasobject
+                        or value.nbytes < SHARED_ARRAY_MIN_BYTES
+                    ):
+                        continue
+                    shared_memory = SharedMemory(create=True, size=value.nbytes)
+                    handles.append(shared_memory)
+                    np.ndarray(value.shape, value.dtype, buffer=shared_memory.buf)[
+                        ...
+                    ] = value
+                    shared_arrays.append(
+                        (
+                            step_index,
+                            attribute,
+                            shared_memory.name,
+                            value.shape,
+                            value.dtype.str,
+                        )
+                    )
+                    setattr(step, attribute, None)
+            return pickle.dumps(estimator), shared_arrays, handles
+        except Exception:
+            ParallelTransformer.release_shared_memory(handles)
+            raise
+
+    @staticmethod
+    def release_shared_memory(handles: list) -> None:
+        for shared_memory in handles:
+            shared_memory.close()
+            shared_memory.unlink()
+
+    def iter_chunks(self, X):
+        for start in range(0, len(X), self.chunk_size):
+            if isinstance(X, pd.DataFrame):
+                yield start, X.iloc[start : start + self.chunk_size]
+            else:
+                yield start, X[start : start + self.chunk_size]
+
+    def get_n_output_features(self, estimator, X) -> int:
+        X_row = X.iloc[:1] if isinstance(X, pd.DataFrame) else X[:1]
+        return estimator.transform(X_row).shape[1]
+
+    def transform(
+        self, estimator, X, target, output_file_path: str | None = None
+    ) -> np.ndarray:
+        """
+        Returns ``[estimator.transform(X), target]`` as one float64 array. When
+        ``output_file_path`` is given the array is written there as ``.npy`` and
+        returned memory-mapped read-only.
+        """
+        try:
+            started_at = time.perf_counter()
+            output = self.build_output(estimator, X, target, output_file_path)
+            if output_file_path is not None:
+                metrics.record_io(
+                    "parallel_transform",
+                    "written",
+                    time.perf_counter() - started_at,
+                    os.path.getsize(output_file_path),
+                    len(output),
+                )
+            return output
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def build_output(
+        self, estimator, X, target, output_file_path: str | None
+    ) -> np.ndarray:
+        try:
+            n_features = self.get_n_output_features(estimator, X)
+            shape = (len(X), n_features + 1)
+            if self.n_jobs == 1 or len(X) <= self.chunk_size:
+                return self.transform_in_process(
+                    estimator, X, target, shape, output_file_path
+                )
+
+            temporary_dir = None
+            if output_file_path is None:
+                temporary_dir = tempfile.mkdtemp(prefix="transform-")
+                target_file_path = os.path.join(temporary_dir, "output.npy")
+            else:
+                os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
+                target_file_path = output_file_path
+            try:
+                output = np.lib.format.open_memmap(
+                    target_file_path, mode="w+", dtype=np.float64, shape=shape
+                )
+                output[:, -1] = np.asarray(target, dtype=np.float64)
+                output.flush()
+                del output
+
+                self.transform_in_workers(estimator, X, target_file_path)
+                if temporary_dir is not None:
+                    return np.load(target_file_path)
+                return np.load(target_file_path, mmap_mode="r")
+            finally:
+                if temporary_dir is not None:
+                    shutil.rmtree(temporary_dir, ignore_errors=True)
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def transform_in_process(
+        self, estimator, X, target, shape: tuple, output_file_path: str | None
+    ) -> np.ndarray:
+        if output_file_path is None:
+            output = np.empty(shape, dtype=np.float64)
+        else:
+            os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
+            output = np.lib.format.open_memmap(
+                output_file_path, mode="w+", dtype=np.float64, shape=shape
+            )
+        output[:, -1] = np.asarray(target, dtype=np.float64)
+        for start, X_chunk in self.iter_chunks(X):
+            output[start : start + len(X_chunk), :-1] = estimator.transform(X_chunk)
+        if output_file_path is None:
+            return output
+        output.flush()
+        del output
+        return np.load(output_file_path, mmap_mode="r")
+
+    def transform_in_workers(self, estimator, X, output_file_path: str) -> None:
+        estimator_bytes, shared_arrays, handles = self.share_estimator(estimator)
+        try:
+            n_chunks = -(-len(X) // self.chunk_size)
+            n_workers = min(self.n_jobs, n_chunks)
+            logging.info(
+                f"Transforming {len(X)} rows in {n_chunks} chunks on {n_workers} processes"
+            )
+            ## Spawned workers do not inherit the locks held by the artifact writer threads
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_transform_worker,
+                initargs=(
+                    estimator_bytes,
+                    shared_arrays,
+                    output_file_path,
+                    get_worker_log_queue(),
+                ),
+            ) as executor:
+                futures = [
+                    executor.submit(transform_chunk, start, X_chunk)
+                    for start, X_chunk in self.iter_chunks(X)
+                ]
+                for future in futures:
+                    future.result()
+        finally:
+            self.release_shared_memory(handles)
@@ -0,0 +1,180 @@
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from networksecurity.exception.exception import NetworkSecurityException
+from networksecurity.utils.main_utils.packed_rows import get_packable_rows, pack_rows
+from networksecurity.utils.main_utils.utils import get_object_array_dir
+
+
+def get_artifact_digest(file_paths: list) -> str:
+    """
+    Returns the sha256 of object files saved by save_object, the arrays stored
+    next to them included. Paths that are None (no model) are skipped.
+    """
+    try:
+        digest = hashlib.sha256()
+        for file_path in file_paths:
+            if file_path is None:
+                continue
+            array_dir = get_object_array_dir(file_path)
+            members = [file_path]
+            if os.path.isdir(array_dir):
+                members += [
+                    os.path.join(array_dir, name)
+                    for name in sorted(os.listdir(array_dir))
+                ]
+            for member in members:
+                digest.update(os.path.basename(member).encode())
+                with open(member, "rb") as file_obj:
+                    for block in iter(lambda: file_obj.read(1 << 20), b""):
+                        digest.update(block)
+        return digest.hexdigest()
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)  # type: ignore
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of predictions keyed on the packed feature vector.
+
+    ``score`` looks a whole batch up at once: identical rows share one entry and
+    only the rows that are not cached reach ``score_function``. The entries
+    belong to the artifacts with digest ``artifact_digest``; ``validate`` with
+    another digest empties the cache. Rows with values other than -1, 0, 1 or
+    missing cannot be packed and are always scored, uncached. A ``max_size`` of
+    0 disables the cache.
+
+    Every packable row counts once in ``stats``: as a hit when its prediction
+    was cached, as a miss when it was scored, or as deduplicated when another
+    row of its batch with the same features was scored for it.
+    """
+
+    def __init__(self, max_size: int, artifact_digest: str | None = None) -> None:
+        self.max_size = max_size
+        self.artifact_digest = artifact_digest
+        self._entries: OrderedDict[int, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        ## Bumped on invalidation, so a batch scored by the previous artifacts
+        ## does not store its predictions
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.deduplicated = 0
+        self.uncacheable = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.batches = 0
+        self.scored_batches = 0
+        self.lookup_seconds = 0.0
+        self.score_seconds = 0.0
+
+    def validate(self, artifact_digest: str) -> None:
+        """
+        Empties the cache if its entries were scored by other artifacts.
+        """
+        with self._lock:
+            if artifact_digest == self.artifact_digest:
+                return
+            if self.artifact_digest is not None:
+                self.invalidations += 1
+            self._entries.clear()
+            self._generation += 1
+            self.artifact_digest = artifact_digest
+
+    def score(self, rows: np.ndarray, score_function) -> np.ndarray:
+        """
+        Returns ``score_function(rows)``, computed only for the rows not cached.
+        """
+        try:
+            if self.max_size <= 0 or len(rows) == 0:
+                return score_function(rows)
+            started_at = time.perf_counter()
+            packable = get_packable_rows(rows)
+            packable_idx = np.flatnonzero(packable)
+            other_idx = np.flatnonzero(~packable)
+            keys, first, inverse = np.unique(
+                pack_rows(rows[packable_idx]), return_index=True, return_inverse=True
+            )
+            inverse = inverse.reshape(-1)
+            with self._lock:
+                generation = self._generation
+                cached = []
+                for key in keys.tolist():
+                    value = self._entries.get(key)
+                    if value is not None:
+                        self._entries.move_to_end(key)
+                    cached.append(value)
+            missing = [index for index, value in enumerate(cached) if value is None]
+            looked_up_at = time.perf_counter()
+
+            ## One distinct row per missing key, then the rows that cannot be packed
+            to_score = np.concatenate([packable_idx[first[missing]], other_idx])
+            scored = (
+                np.asarray(score_function(rows[to_score])) if len(to_score) else None
+            )
+            scored_at = time.perf_counter()
+
+            template = np.asarray(scored[0] if scored is not None else cached[0])
+            unique_values = np.empty((len(keys),) + template.shape, template.dtype)
+            for index, value in enumerate(cached):
+                if value is not None:
+                    unique_values[index] = value
+            if missing:
+                unique_values[missing] = scored[: len(missing)]  # type: ignore[index]
+            predictions = np.empty((len(rows),) + template.shape, template.dtype)
+            predictions[packable_idx] = unique_values[inverse]
+            if len(other_idx):
+                predictions[other_idx] = scored[len(missing) :]  # type: ignore[index]
+
+            missed_rows = int(np.isin(inverse, missing).sum())
+            with self._lock:
+                if generation == self._generation:
+                    for index in missing:
+                        self._entries[int(keys[index])] = np.array(unique_values[index])
+                    while len(self._entries) > self.max_size:
+                        self._entries.popitem(last=False)
+                        self.evictions += 1
+                self.hits += len(packable_idx) - missed_rows
+                self.misses += len(missing)
+                self.deduplicated += missed_rows - len(missing)
+                self.uncacheable += len(other_idx)
+                self.batches += 1
+                self.lookup_seconds += looked_up_at - started_at
+                if scored is not None:
+                    self.scored_batches += 1
+                    self.score_seconds += scored_at - looked_up_at
+            return predictions
+        except Exception as e:
+            raise NetworkSecurityException(e, sys)  # type: ignore
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses + self.deduplicated
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "deduplicated_rows": self.deduplicated,
+                "uncacheable_rows": self.uncacheable,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "lookup_ms_mean": (
+                    self.lookup_seconds * 1000.0 / self.batches
+                    if self.batches
+                    else None
+                ),
+                "miss_score_ms_mean": (
+                    self.score_seconds * 1000.0 / self.scored_batches
+                    if self.scored_batches
+                    else None
+                ),
+                "artifact_digest": self.artifact_digest,
+            }
@@ -0,0 +1,327 @@
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+from networksecurity.exception.exception import NetworkSecurityException
+
+## Features read from the URL string alone
+LEXICAL_FEATURES = (
+    "having_IP_Address",
+    "URL_Length",
+    "Shortining_Service",
+    "having_At_Symbol",
+    "double_slash_redirecting",
+    "Prefix_Suffix",
+    "having_Sub_Domain",
+    "SSLfinal_State",
+    "port",
+    "HTTPS_token",
+    "Abnormal_URL",
+)
+## Features read from the page HTML, missing for rows without it
+PAGE_FEATURES = (
+    "Favicon",
+    "Request_URL",
+    "URL_of_Anchor",
+    "Links_in_tags",
+    "SFH",
+    "Submitting_to_email",
+    "Redirect",
+    "on_mouseover",
+    "RightClick",
+    "popUpWidnow",
+    "Iframe",
+)
+## Features built from the domain facts of the resolvers, see DOMAIN_FACTS
+LOOKUP_FEATURES = (
+    "Domain_registeration_length",
+    "age_of_domain",
+    "DNSRecord",
+    "web_traffic",
+    "Page_Rank",
+    "Google_Index",
+    "Links_pointing_to_page",
+    "Statistical_report",
+)
+
+SHORTENING_SERVICES = frozenset(
+    (
+        "bit.ly goo.gl shorte.st go2l.ink x.co ow.ly t.co tinyurl.com tr.im is.gd "
+        "cli.gs yfrog.com migre.me ff.im tiny.cc url4.eu twit.ac su.pr twurl.nl "
+        "snipurl.com short.to budurl.com ping.fm post.ly just.as bkite.com "
+        "snipr.com fic.kr loopt.us doiop.com short.ie kl.am wp.me rubyurl.com "
+        "om.ly to.ly bit.do lnkd.in db.tt qr.ae adf.ly bitly.com cur.lv ity.im "
+        "q.gs po.st bc.vc twitthis.com u.to j.mp buzurl.com cutt.us u.bb yourls.org "
+        "prettylinkpro.com scrnch.me filoops.info vzturl.com qr.net 1url.com "
+        "tweez.me v.gd link.zip.net rb.gy cutt.ly shorturl.at"
+    ).split()
+)
+
+## Thresholds of the phishing dataset's feature definitions
+URL_LENGTH_LEGITIMATE = 54
+URL_LENGTH_SUSPICIOUS = 75
+## Position past which a "//" in the URL is a redirect ("https://" ends at 7)
+DOUBLE_SLASH_MAX_POSITION = 7
+DOMAIN_MIN_AGE_DAYS = 180
+REGISTRATION_MIN_DAYS = 365
+TRAFFIC_RANK_LEGITIMATE = 100_000
+PAGE_RANK_MIN = 0.2
+
+## Regexes are written for both of pandas' string engines: no lookarounds or
+## backreferences, which pyarrow's RE2 does not support
+SCHEME_PATTERN = re.compile(r"^[a-z][a-z0-9+.-]*://")
+PATH_PATTERN = re.compile(r"[/?#].*$")
+USERINFO_PATTERN = re.compile(r"^.*@")
+PORT_PATTERN = re.compile(r":[0-9]*$")
+EXPLICIT_PORT_PATTERN = re.compile(r":[0-9]+$")
+DEFAULT_PORT_PATTERN = re.compile(r":(?:80|443)$")
+## Dotted decimal, octal or hex IPv4 (also as a single number) and bracketed IPv6
+IP_HOST_PATTERN = re.compile(
+    r"^(?:(?:0x[0-9a-f]+|[0-9]+)(?:\.(?:0x[0-9a-f]+|[0-9]+)){0,3}|\[[0-9a-f:.]+\])$"
+)
+WWW_PATTERN = re.compile(r"^www\.")
+ABSOLUTE_LINK_PATTERN = re.compile(r"^(?:[a-z][a-z0-9+.-]*:)?//")
+UNSAFE_ANCHOR_PATTERN = re.compile(r"^(?:#|javascript:|mailto:|$)")
+BLANK_FORM_ACTION_PATTERN = re.compile(r"^(?:about:blank)?$")
+
+## Attribute values of the tags each page feature looks at
+RESOURCE_LINK_PATTERN = re.compile(
+    r"<(?:img|video|audio|embed|source|iframe)\b[^>]*?\bsrc\s*=\s*[\"']?([^\"'\s>]*)"
+)
+ANCHOR_LINK_PATTERN = re.compile(r"<a\b[^>]*?\bhref\s*=\s*[\"']?([^\"'\s>]*)")
+TAG_LINK_PATTERN = re.compile(
+    r"<(?:link\b[^>]*?\bhref|script\b[^>]*?\bsrc|meta\b[^>]*?\bcontent)"
+    r"\s*=\s*[\"']?([^\"'\s>]*)"
+)
+FORM_ACTION_PATTERN = re.compile(r"<form\b[^>]*?\baction\s*=\s*[\"']?([^\"'\s>]*)")
+FAVICON_PATTERN = re.compile(
+    r"<link\b[^>]*?\brel\s*=\s*[\"']?[^\"'>]*icon[^>]*?\bhref\s*=\s*[\"']?([^\"'\s>]*)"
+)
+EMAIL_SUBMIT_PATTERN = re.compile(r"action\s*=\s*[\"']?mailto:|\bmail\s*\(")
+REDIRECT_PATTERN = re.compile(
+    r"http-equiv\s*=\s*[\"']?refresh|(?:window|document)\.location\s*=|location\.(?:href\s*=|replace\s*\()"
+)
+STATUS_BAR_PATTERN = re.compile(r"onmouseover\s*=[^>]*window\.status")
+RIGHT_CLICK_PATTERN = re.compile(r"event\.button\s*==\s*2")
+POPUP_PATTERN = re.compile(r"window\.open\s*\(|\bprompt\s*\(")
+HIDDEN_IFRAME_PATTERN = re.compile(
+    r"<iframe\b[^>]*?(?:frameborder\s*=\s*[\"']?0|visibility\s*:\s*hidden|display\s*:\s*none)"
+)
+
+
+def ternary(legitimate, phishing=None) -> np.ndarray:
+    """
+    1 where ``legitimate``, -1 where ``phishing`` and 0 elsewhere; without
+    ``phishing`` every row that is not legitimate is -1.
+    """
+    legitimate = np.asarray(legitimate, dtype=bool)
+    if phishing is None:
+        return np.where(legitimate, 1, -1).astype(np.int8)
+    phishing = np.asarray(phishing, dtype=bool)
+    return np.select([legitimate, phishing], [1, -1], 0).astype(np.int8)
+
+
+def get_hosts(urls: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """
+    Splits lower cased URLs into their host and their host with the port.
+    URLs without a scheme are read as starting with the host.
+    """
+    authority = (
+        urls.str.replace(SCHEME_PATTERN, "", regex=True)
+        .str.replace(PATH_PATTERN, "", regex=True)
+        .str.replace(USERINFO_PATTERN, "", regex=True)
+    )
+    return authority.str.replace(PORT_PATTERN, "", regex=True), authority
+
+
+def get_domains(hosts: pd.Series) -> pd.Series:
+    """
+    The name the resolvers look a host up by: the host without a ``www.`` prefix.
+    """
+    return hosts.str.replace(WWW_PATTERN, "", regex=True)
+
+
+def extract_lexical_features(urls: pd.Series) -> pd.DataFrame:
+    """
+    Computes the LEXICAL_FEATURES of a Series of URLs, one vectorized string
+    operation per feature over the whole batch.
+    """
+    try:
+        raw_urls = urls.fillna("").astype("str").str.strip()
+        urls = raw_urls.str.lower()
+        hosts, authority = get_hosts(urls)
+        domains = get_domains(hosts)
+        url_length = raw_urls.str.len().to_numpy()
+        subdomain_dots = domains.str.count(r"\.").to_numpy()
+        explicit_port = authority.str.contains(EXPLICIT_PORT_PATTERN) & ~(
+            authority.str.contains(DEFAULT_PORT_PATTERN)
+        )
+        features = {
+            "having_IP_Address": ternary(~hosts.str.contains(IP_HOST_PATTERN)),
+            "URL_Length": ternary(
+                url_length < URL_LENGTH_LEGITIMATE,
+                url_length > URL_LENGTH_SUSPICIOUS,
+            ),
+            "Shortining_Service": ternary(~domains.isin(SHORTENING_SERVICES)),
+            "having_At_Symbol": ternary(~urls.str.contains("@", regex=False)),
+            "double_slash_redirecting": ternary(
+                urls.str.rfind("//").to_numpy() < DOUBLE_SLASH_MAX_POSITION
+            ),
+            "Prefix_Suffix": ternary(~hosts.str.contains("-", regex=False)),
+            "having_Sub_Domain": ternary(subdomain_dots <= 1, subdomain_dots > 2),
+            ## The certificate is not checked, only whether the URL uses it
+            "SSLfinal_State": ternary(urls.str.startswith("https://")),
+            "port": ternary(~explicit_port),
+            "HTTPS_token": ternary(~hosts.str.contains("https", regex=False)),
+            "Abnormal_URL": ternary(hosts.str.len().to_numpy() > 0),
+        }
+        return pd.DataFrame(features, index=urls.index)
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)  # type: ignore
+
+
+def match_links(
+    pages: pd.Series, hosts: pd.Series, link_pattern: re.Pattern
+) -> tuple[pd.Series, np.ndarray]:
+    """
+    Returns every link matched by ``link_pattern``, indexed by the row of its
+    page, and whether it points to another host than its page.
+    """
+    ## An empty attribute value is captured as a missing value, not as ""
+    links = pages.str.extractall(link_pattern)[0].fillna("")
+    page_index = links.index.get_level_values(0)
+    links = pd.Series(links.to_numpy(), index=page_index, dtype="str")
+    link_hosts, _ = get_hosts(links)
+    external = links.str.contains(ABSOLUTE_LINK_PATTERN).to_numpy() & (
+        link_hosts.to_numpy() != hosts.reindex(page_index).to_numpy()
+    )
+    return links, external
+
+
+def get_page_share(links: pd.Series, flags: np.ndarray, index: pd.Index) -> np.ndarray:
+    """
+    Share of each page's links that are flagged, 0 for pages without links.
+    """
+    if len(links) == 0:
+        return np.zeros(len(index))
+    share = pd.Series(flags, index=links.index).groupby(level=0).mean()
+    return share.reindex(index, fill_value=0.0).to_numpy()
+
+
+def extract_page_features(urls: pd.Series, pages: pd.Series) -> pd.DataFrame:
+    """
+    Computes the PAGE_FEATURES from the HTML of each URL. Rows without HTML get
+    missing values.
+    """
+    try:
+        has_page = pages.notna().to_numpy()
+        features = pd.DataFrame(
+            np.nan, index=urls.index, columns=list(PAGE_FEATURES), dtype=np.float64
+        )
+        if not has_page.any():
+            return features
+        pages = pages[has_page].astype("str").str.lower()
+        hosts, _ = get_hosts(urls[has_page].fillna("").astype("str").str.lower())
+
+        def external_share(link_pattern: re.Pattern, unsafe=None) -> np.ndarray:
+            links, flags = match_links(pages, hosts, link_pattern)
+            if unsafe is not None:
+                flags |= links.str.contains(unsafe).to_numpy()
+            return get_page_share(links, flags, pages.index)
+
+        request_share = external_share(RESOURCE_LINK_PATTERN)
+        anchor_share = external_share(ANCHOR_LINK_PATTERN, UNSAFE_ANCHOR_PATTERN)
+        tag_share = external_share(TAG_LINK_PATTERN)
+        form_actions, external_forms = match_links(pages, hosts, FORM_ACTION_PATTERN)
+        blank_forms = form_actions.str.contains(BLANK_FORM_ACTION_PATTERN).to_numpy()
+        blank_form_share = get_page_share(form_actions, blank_forms, pages.index)
+        external_form_share = get_page_share(form_actions, external_forms, pages.index)
+        redirects = pages.str.count(REDIRECT_PATTERN).to_numpy()
+
+        page_features = {
+            "Favicon": ternary(external_share(FAVICON_PATTERN) == 0),
+            "Request_URL": ternary(request_share < 0.22, request_share > 0.61),
+            "URL_of_Anchor": ternary(anchor_share < 0.31, anchor_share > 0.67),
+            "Links_in_tags": ternary(tag_share < 0.17, tag_share > 0.81),
+            ## A blank form action is -1, one posting to another host 0
+            "SFH": ternary(
+                (blank_form_share == 0) & (external_form_share == 0),
+                blank_form_share > 0,
+            ),
+            "Submitting_to_email": ternary(~pages.str.contains(EMAIL_SUBMIT_PATTERN)),
+            ## The dataset encodes one redirect or none as 0 and more as 1
+            "Redirect": (redirects > 1).astype(np.int8),
+            "on_mouseover": ternary(~pages.str.contains(STATUS_BAR_PATTERN)),
+            "RightClick": ternary(~pages.str.contains(RIGHT_CLICK_PATTERN)),
+            "popUpWidnow": ternary(~pages.str.contains(POPUP_PATTERN)),
+            "Iframe": ternary(~pages.str.contains(HIDDEN_IFRAME_PATTERN)),
+        }
+        for name, values in page_features.items():
+            features.loc[has_page, name] = values
+        return features
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)  # type: ignore
+
+
+def extract_lookup_features(domains: pd.Series, resolvers: list) -> pd.DataFrame:
+    """
+    Computes the LOOKUP_FEATURES from the facts the resolvers return. Every
+    distinct domain of the batch is looked up once; a fact no resolver knows
+    leaves its feature missing, to be imputed like any other NaN.
+    """
+    try:
+        codes, unique_domains = pd.factorize(domains.fillna(""))
+        unique_domains = [str(domain) for domain in unique_domains]
+        unique_facts: list[dict] = [{} for _ in unique_domains]
+        ## Rows without a host have nothing to look up
+        lookup_domains = [domain for domain in unique_domains if domain]
+        for resolver in resolvers:
+            resolved = resolver.resolve(lookup_domains) if lookup_domains else {}
+            for position, domain in enumerate(unique_domains):
+                ## The first resolver that knows a fact wins
+                for name, value in resolved.get(domain, {}).items():
+                    unique_facts[position].setdefault(name, value)
+
+        def fact(name: str) -> np.ndarray:
+            return np.array(
+                [facts.get(name, np.nan) for facts in unique_facts], dtype=np.float64
+            )
+
+        def lookup(known: np.ndarray, legitimate, phishing=None) -> np.ndarray:
+            values = ternary(legitimate, phishing).astype(np.float64)
+            values[np.isnan(known)] = np.nan
+            return values[codes]
+
+        registration_days = fact("registration_days")
+        age_days = fact("age_days")
+        dns_record = fact("dns_record")
+        traffic_rank = fact("traffic_rank")
+        page_rank = fact("page_rank")
+        google_index = fact("google_index")
+        links_pointing = fact("links_pointing")
+        reported = fact("reported")
+        return pd.DataFrame(
+            {
+                "Domain_registeration_length": lookup(
+                    registration_days, registration_days > REGISTRATION_MIN_DAYS
+                ),
+                "age_of_domain": lookup(age_days, age_days >= DOMAIN_MIN_AGE_DAYS),
+                "DNSRecord": lookup(dns_record, dns_record == 1),
+                "web_traffic": lookup(
+                    traffic_rank,
+                    (traffic_rank > 0) & (traffic_rank < TRAFFIC_RANK_LEGITIMATE),
+                    traffic_rank <= 0,
+                ),
+                "Page_Rank": lookup(page_rank, page_rank >= PAGE_RANK_MIN),
+                "Google_Index": lookup(google_index, google_index == 1),
+                "Links_pointing_to_page": lookup(
+                    links_pointing, links_pointing > 2, links_pointing == 0
+                ),
+                "Statistical_report": lookup(reported, reported != 1),
+            },
+            index=domains.index,
+        )
+    except Exception as e:
+        raise NetworkSecurityException(e, sys)  # type: ignore